@@ -5,12 +5,31 @@ For the command line arguments run the script with "--help".
 """
 
 import glob
+import json
+import os
 from argparse import ArgumentParser
+from contextlib import ExitStack
 import time
 
+from diofant import sympify
+
+from mora.budget import set_budgets, reset_counts, exceeded, fallbacks
+from mora.cache import set_limits, store_sizes
+from mora.core import moments, reset_mora
+from mora.intern import pool_size as intern_pool_size, reset_counts as reset_intern_counts
+from mora.metrics import get_metrics, get_metrics_since
 from mora.input import InputParser, set_log_level, LOG_NOTHING
 from src import decide_termination
-from src.bounds import bounds
+from src.bounds import bounds, batch_bounds, read_expressions
+from src.memory import MemoryReport
+from src.phases import phase, add_listener, remove_listener, PhaseMemory, PARSE
+from src.profiling import PhaseProfiler
+from src.incremental import Session
+from src.certificates import CertificateStore
+from src.result_cache import ResultCache
+from src.server import Server, serve_stdio, serve_unix_socket
+from src.simulation import simulate
+from src.sweep import Sweep, get_assignments
 
 
 HEADER = """
@@ -26,9 +45,9 @@ parser = ArgumentParser(description="Run Amber on probabilistic programs stored
 parser.add_argument(
     "--benchmarks",
     dest="benchmarks",
-    required=True,
     type=str,
     nargs="+",
+    default=[],
     help="A list of benchmarks to run Amber on"
 )
 
@@ -40,38 +59,453 @@ parser.add_argument(
     help="This is just a development flag. If set, it calculates the asymptotic bounds of the given expression"
 )
 
+parser.add_argument(
+    "--profile",
+    dest="profile",
+    type=str,
+    default="",
+    help="If set, every phase of every program is profiled and the profiles are stored as .pstats in the given directory"
+)
 
-def main():
-    print(HEADER)
-    set_log_level(LOG_NOTHING)
+parser.add_argument(
+    "--server",
+    dest="server",
+    action="store_true",
+    help="Runs Amber as a server answering JSON-RPC requests (one per line) on stdin/stdout or on a unix socket"
+)
+
+parser.add_argument(
+    "--socket",
+    dest="socket",
+    type=str,
+    default="",
+    help="Path of the unix socket the server listens on. If not set, the server uses stdin/stdout"
+)
+
+parser.add_argument(
+    "--workers",
+    dest="workers",
+    type=int,
+    default=1,
+    help="Number of worker processes the server uses to analyze programs"
+)
+
+parser.add_argument(
+    "--cache-size",
+    dest="cache_size",
+    type=int,
+    default=1024,
+    help="Maximum number of results the server and each of its workers keep in their caches"
+)
+
+parser.add_argument(
+    "--simulate",
+    dest="simulate",
+    action="store_true",
+    help="If set, every program gets simulated before it is analyzed and the empirical statistics are printed"
+)
+
+parser.add_argument(
+    "--runs",
+    dest="runs",
+    type=int,
+    default=100000,
+    help="Number of runs the simulation performs"
+)
+
+parser.add_argument(
+    "--max-iterations",
+    dest="max_iterations",
+    type=int,
+    default=1000,
+    help="Maximum number of loop iterations of a single run in the simulation"
+)
+
+parser.add_argument(
+    "--seed",
+    dest="seed",
+    type=int,
+    default=None,
+    help="Seed for the random number generator of the simulation"
+)
+
+parser.add_argument(
+    "--parameters",
+    dest="parameters",
+    type=str,
+    nargs="+",
+    default=[],
+    help="Values of the symbolic constants for the simulation, given as name=value"
+)
+
+parser.add_argument(
+    "--moments",
+    dest="moments",
+    type=str,
+    nargs="*",
+    default=None,
+    help="If set, the closed forms of the moments of the given monomials (by default all variables) are computed "
+         "instead of deciding termination"
+)
+
+parser.add_argument(
+    "--max-power",
+    dest="max_power",
+    type=int,
+    default=1,
+    help="The moments of the monomials given by --moments are computed for all powers up to this one"
+)
+
+parser.add_argument(
+    "--processes",
+    dest="processes",
+    type=int,
+    default=1,
+    help="Number of processes used to compute the moments given by --moments or the bounds given by --bounds-file"
+)
+
+parser.add_argument(
+    "--cache",
+    dest="cache",
+    type=str,
+    default="",
+    help="Directory of a persistent result cache. Programs equal up to renaming and reordering are only analyzed once"
+)
+
+parser.add_argument(
+    "--watch",
+    dest="watch",
+    action="store_true",
+    default=False,
+    help="Re-analyze the benchmark whenever its file changes, reusing everything not affected by the change"
+)
+
+parser.add_argument(
+    "--watch-interval",
+    dest="watch_interval",
+    type=float,
+    default=0.5,
+    help="Seconds between two checks of the watched file for changes"
+)
+
+parser.add_argument(
+    "--max-store-entries",
+    dest="max_store_entries",
+    type=int,
+    default=None,
+    help="Maximum number of entries of every store (moments, recurrences, branches, bounds). Unbounded by default"
+)
+
+parser.add_argument(
+    "--max-store-bytes",
+    dest="max_store_bytes",
+    type=int,
+    default=None,
+    help="Maximum estimated number of bytes of every store. Unbounded by default"
+)
+
+parser.add_argument(
+    "--store-sizes",
+    dest="store_sizes",
+    action="store_true",
+    default=False,
+    help="Print the number of entries, the estimated bytes and the evictions of every store after each benchmark"
+)
+
+parser.add_argument(
+    "--metrics",
+    dest="metrics",
+    action="store_true",
+    default=False,
+    help="Print the hits, misses and compute time of every store and the calls and time of every symbolic primitive "
+         "after each benchmark"
+)
+
+parser.add_argument(
+    "--bounds-file",
+    dest="bounds_file",
+    type=str,
+    default="",
+    help="File with one expression per line whose asymptotic bounds get computed for every benchmark. "
+         "The placeholder {benchmark} gets replaced by the path of the benchmark, e.g. '{benchmark}.bounds'"
+)
+
+parser.add_argument(
+    "--bounds-output",
+    dest="bounds_output",
+    type=str,
+    default="",
+    help="File the bounds computed for --bounds-file get written to as JSON. By default they are printed"
+)
+
+parser.add_argument(
+    "--certificates",
+    dest="certificates",
+    type=str,
+    default="",
+    help="Directory in which the certificates (results and witnesses) of all analyzed programs get stored"
+)
+
+parser.add_argument(
+    "--revalidate",
+    dest="revalidate",
+    action="store_true",
+    default=False,
+    help="Only check the witnesses of stored certificates instead of analyzing the programs again. "
+         "Programs without certificate or whose witnesses do not hold anymore get analyzed fully"
+)
+
+parser.add_argument(
+    "--operation-timeout",
+    dest="operation_timeout",
+    type=float,
+    default=None,
+    help="Maximum seconds a single limit, summation or solve may take. If exceeded, Amber falls back to a sound but "
+         "less precise answer (e.g. trivial bounds or 'Maybe'). Unbounded by default"
+)
+
+parser.add_argument(
+    "--operation-max-size",
+    dest="operation_max_size",
+    type=int,
+    default=None,
+    help="Maximum number of operations of an expression a single limit, summation or solve gets applied to. "
+         "Larger expressions are treated like operations exceeding --operation-timeout. Unbounded by default"
+)
+
+parser.add_argument(
+    "--sweep",
+    dest="sweep",
+    type=str,
+    nargs="+",
+    default=[],
+    help="Values of the symbolic constants to analyze the program for, given as name=value1,value2,... "
+         "The program gets analyzed symbolically once and every combination of values reuses that analysis"
+)
+
+parser.add_argument(
+    "--memory",
+    dest="memory",
+    action="store_true",
+    default=False,
+    help="Report the peak memory per phase, the sizes of the stores and the sizes of the stored expressions. "
+         "The server includes the report in its results. Slows down the analysis"
+)
+
+
+def run_server(args):
+    server = Server(workers=args.workers, cache_size=args.cache_size, max_store_entries=args.max_store_entries,
+                    max_store_bytes=args.max_store_bytes, operation_seconds=args.operation_timeout,
+                    operation_max_size=args.operation_max_size, memory=args.memory)
+    try:
+        if args.socket:
+            serve_unix_socket(server, args.socket)
+        else:
+            serve_stdio(server)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+
+
+def print_moments(benchmark, args):
+    input_parser = InputParser()
+    input_parser.set_source(benchmark)
+    program = input_parser.parse_source()
+    reset_mora()
+    goals = None
+    if args.moments:
+        variables = {str(v): v for v in program.variables}
+        goals = [sympify(m, locals=variables) for m in args.moments]
+    start = time.time()
+    for monomial, solution in moments(program, goals, args.max_power, args.processes):
+        print(f"E[{monomial}] = {solution}")
+    print(f"Computation time: { round(time.time() - start, 4) }s")
 
+
+def watch(benchmark, args):
+    session = Session()
+    modified = None
+    try:
+        while True:
+            if os.path.getmtime(benchmark) == modified:
+                time.sleep(args.watch_interval)
+                continue
+            modified = os.path.getmtime(benchmark)
+            try:
+                input_parser = InputParser()
+                input_parser.set_source(benchmark)
+                program = input_parser.parse_source()
+                start = time.time()
+                result = session.analyze(program)
+                result.print()
+                print(f"Computation time: { round(time.time() - start, 4) }s")
+                print(f"Reused {session.reused} stored entries, recomputed {session.dropped}")
+            except Exception as e:
+                print("Something went wrong while analyzing the program.")
+                print(e)
+            print(f"Watching {benchmark} for changes ...")
+    except KeyboardInterrupt:
+        pass
+
+
+def print_batch_bounds(args):
+    jobs = [(b, read_expressions(args.bounds_file.replace("{benchmark}", b))) for b in args.benchmarks]
+    results = json.dumps(batch_bounds(jobs, args.processes), indent=2)
+    if args.bounds_output:
+        with open(args.bounds_output, "w") as file:
+            file.write(results)
+    else:
+        print(results)
+
+
+def print_sweep(benchmark, args):
+    input_parser = InputParser()
+    input_parser.set_source(benchmark)
+    program = input_parser.parse_source()
+    sweep = Sweep(program)
+    values = dict(s.split("=", 1) for s in args.sweep)
+    reset_counts()
+    start = time.time()
+    for assignment in get_assignments({name: v.split(",") for name, v in values.items()}):
+        instance_start = time.time()
+        result = sweep.analyze(assignment)
+        instance = ", ".join(f"{name}={value}" for name, value in assignment.items())
+        print(f"{instance}: PAST {result.PAST}, AST {result.AST} ({ round(time.time() - instance_start, 4) }s)")
+    print(f"Computation time: { round(time.time() - start, 4) }s")
+    print(f"Reused the symbolic analysis for {sweep.instantiated} instances, analyzed {sweep.reanalyzed} from scratch")
+    print_fallbacks()
+
+
+def print_store_sizes():
+    for name, sizes in store_sizes().items():
+        print(f"Store {name}: {sizes['entries']} entries, {sizes['bytes']} bytes, {sizes['evictions']} evictions")
+    print(f"Interned expressions: {intern_pool_size()}")
+
+
+def print_metrics(metrics):
+    for name, store in metrics["stores"].items():
+        seconds = f", computing {round(store['seconds'], 4)}s" if store["seconds"] is not None else ""
+        print(f"Store {name}: {store['hits']} hits, {store['misses']} misses{seconds}")
+    for name, primitive in metrics["primitives"].items():
+        print(f"Primitive {name}: {primitive['calls']} calls, {round(primitive['seconds'], 4)}s")
+
+
+def print_fallbacks():
+    if exceeded:
+        print(f"Budgets exceeded: {', '.join(f'{o} {c}x' for o, c in exceeded.items())}")
+    if fallbacks:
+        print(f"Fallbacks taken: {', '.join(f'{p} {c}x' for p, c in fallbacks.items())}")
+
+
+def main():
     args = parser.parse_args()
+    set_limits(args.max_store_entries, args.max_store_bytes)
+    set_budgets(args.operation_timeout, args.operation_max_size)
+    if args.server:
+        run_server(args)
+        return
+    if not args.benchmarks:
+        parser.error("the following arguments are required: --benchmarks")
+
+    set_log_level(LOG_NOTHING)
     args.benchmarks = [b for bs in map(glob.glob, args.benchmarks) for b in bs]
 
+    # The bounds are printed as JSON, hence nothing else may be printed
+    if args.bounds_file:
+        print_batch_bounds(args)
+        return
+
+    print(HEADER)
+
+    if args.watch:
+        if len(args.benchmarks) != 1:
+            parser.error("--watch requires exactly one benchmark")
+        watch(args.benchmarks[0], args)
+        return
+
+    if args.revalidate and not args.certificates:
+        parser.error("--revalidate requires --certificates")
+
+    result_cache = ResultCache(args.cache) if args.cache else None
+    certificates = CertificateStore(args.certificates) if args.certificates else None
     for benchmark in args.benchmarks:
         if args.bounds:
             bounds(benchmark, args.bounds)
+        elif args.moments is not None:
+            print_moments(benchmark, args)
+        elif args.sweep:
+            print_sweep(benchmark, args)
         else:
+            profiler = None
+            if args.profile:
+                profiler = PhaseProfiler()
+                add_listener(profiler)
+            memory_stack = ExitStack()
+            phase_memory = memory_stack.enter_context(PhaseMemory()) if args.memory else None
+
             program = None
             try:
-                input_parser = InputParser()
-                input_parser.set_source(benchmark)
-                program = input_parser.parse_source()
+                with phase(PARSE):
+                    input_parser = InputParser()
+                    input_parser.set_source(benchmark)
+                    program = input_parser.parse_source()
             except Exception as e:
                 print("Amber failed to parse source.")
                 print(e)
                 return
 
+            if args.simulate:
+                try:
+                    parameters = dict(p.split("=", 1) for p in args.parameters)
+                    simulation = simulate(program, args.runs, args.max_iterations, args.seed, parameters)
+                    simulation.print()
+                except Exception as e:
+                    print("Something went wrong while simulating the program.")
+                    print(e)
+
             try:
+                reset_counts()
+                reset_intern_counts()
+                metrics = get_metrics()
                 start = time.time()
-                result = decide_termination(program)
+                result = None
+                if certificates and args.revalidate:
+                    result = certificates.revalidate(program)
+                    if result is not None:
+                        print("Result revalidated from its certificate.")
+                if result is None:
+                    if result_cache:
+                        hits = result_cache.hits
+                        result = result_cache.decide_termination(program)
+                        if result_cache.hits > hits:
+                            print("Result taken from the cache.")
+                    else:
+                        result = decide_termination(program)
+                    if certificates:
+                        certificates.put(program, result)
                 result.print()
                 print(f"Computation time: { round(time.time() - start, 4) }s")
+                print_fallbacks()
+                if args.store_sizes:
+                    print_store_sizes()
+                if args.metrics:
+                    print_metrics(get_metrics_since(metrics))
+                if phase_memory:
+                    MemoryReport(phase_memory.peaks).print()
             except Exception as e:
                 print("Something went wrong while deciding termination.")
                 print(e)
                 return
 
+            memory_stack.close()
+            if profiler:
+                remove_listener(profiler)
+                program_name = os.path.normpath(benchmark).replace(os.sep, "_")
+                paths = profiler.dump(args.profile, program_name)
+                print(f"Profiles written to: {', '.join(paths)}")
+                profiler.print_summary()
+
 
 if __name__ == "__main__":
     main()
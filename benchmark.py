@@ -0,0 +1,231 @@
+"""This file is part of Amber
+
+This runnable script measures the performance of Amber on probabilistic programs stored in files.
+Every program is analyzed several times and the time spent gets broken down into the phases parse, moments,
+bounds and rules. The results can be stored as a baseline and later runs can be compared against a stored baseline.
+Programs failing to be analyzed are recorded with their error and reported by the comparison.
+For the command line arguments run the script with "--help".
+"""
+
+import glob
+import json
+import statistics
+import sys
+import time
+from argparse import ArgumentParser
+
+from mora.input import InputParser
+from mora.utils import set_log_level as set_mora_log_level, LOG_NOTHING as MORA_LOG_NOTHING
+from src import decide_termination
+from src.phases import PhaseTimer, phase, PARSE, MOMENTS, BOUNDS, RULES
+from src.utils import set_log_level, LOG_NOTHING
+
+PHASES = [PARSE, MOMENTS, BOUNDS, RULES]
+BASELINE_VERSION = 1
+
+
+parser = ArgumentParser(description="Measure the performance of Amber and compare it against a stored baseline")
+
+parser.add_argument(
+    "--benchmarks",
+    dest="benchmarks",
+    required=True,
+    type=str,
+    nargs="+",
+    help="A list of benchmarks to run Amber on"
+)
+
+parser.add_argument(
+    "--warmup",
+    dest="warmup",
+    type=int,
+    default=1,
+    help="Number of runs per program which are not measured"
+)
+
+parser.add_argument(
+    "--repeats",
+    dest="repeats",
+    type=int,
+    default=3,
+    help="Number of measured runs per program. The median of the runs is reported"
+)
+
+parser.add_argument(
+    "--output",
+    dest="output",
+    type=str,
+    default="",
+    help="If set, the measurements are written as JSON to the given file, which can be used as a baseline"
+)
+
+parser.add_argument(
+    "--compare",
+    dest="compare",
+    type=str,
+    default="",
+    help="A baseline JSON file to compare the measurements against. The exit code is 1 if there is a regression"
+)
+
+parser.add_argument(
+    "--threshold",
+    dest="threshold",
+    type=float,
+    default=0.25,
+    help="Relative slowdown of a single program which counts as a regression"
+)
+
+parser.add_argument(
+    "--aggregate-threshold",
+    dest="aggregate_threshold",
+    type=float,
+    default=0.1,
+    help="Relative slowdown of the sum over all programs which counts as a regression"
+)
+
+parser.add_argument(
+    "--min-time",
+    dest="min_time",
+    type=float,
+    default=0.05,
+    help="Programs faster than this many seconds (in baseline and current run) are never reported as regressions"
+)
+
+
+def run_once(benchmark: str):
+    """
+    Parses and analyzes a benchmark once and returns the time per phase, the total time and the result
+    """
+    with PhaseTimer() as timer:
+        start = time.perf_counter()
+        with phase(PARSE):
+            input_parser = InputParser()
+            input_parser.set_source(benchmark)
+            program = input_parser.parse_source()
+        result = decide_termination(program)
+        total = time.perf_counter() - start
+
+    times = timer.grouped_times()
+    times = {p: times.get(p, 0) for p in PHASES}
+    return times, total, result
+
+
+def measure(benchmark: str, warmup: int, repeats: int):
+    """
+    Measures a single benchmark. Returns the medians of the total time and the phase times over all repeats.
+    If the analysis of the benchmark fails, only the error is returned.
+    """
+    totals = []
+    phase_times = {p: [] for p in PHASES}
+    result = None
+    try:
+        for _ in range(warmup):
+            run_once(benchmark)
+        for _ in range(repeats):
+            times, total, result = run_once(benchmark)
+            totals.append(total)
+            for p in PHASES:
+                phase_times[p].append(times[p])
+    except Exception as e:
+        return {"error": str(e) or type(e).__name__}
+
+    return {
+        "total": statistics.median(totals),
+        "phases": {p: statistics.median(ts) for p, ts in phase_times.items()},
+        "runs": totals,
+        "PAST": str(result.PAST),
+        "AST": str(result.AST),
+    }
+
+
+def compare(current, baseline, threshold: float, aggregate_threshold: float, min_time: float):
+    """
+    Compares the current measurements against a baseline. Returns the list of regression messages.
+    Programs failing now but not in the baseline count as regressions. Programs failing in the baseline or missing
+    from it are only reported. Only programs measured in both count for the aggregate.
+    """
+    regressions = []
+    current_sum = 0
+    baseline_sum = 0
+    for benchmark, measurement in current["programs"].items():
+        if benchmark not in baseline["programs"]:
+            print(f"{benchmark}: not in baseline")
+            continue
+
+        old_measurement = baseline["programs"][benchmark]
+        if "error" in measurement:
+            print(f"{benchmark}: failed ({measurement['error']})")
+            if "error" not in old_measurement:
+                regressions.append(f"{benchmark} failed: {measurement['error']}")
+            continue
+        if "error" in old_measurement:
+            print(f"{benchmark}: failed in baseline ({old_measurement['error']})")
+            continue
+
+        old = old_measurement["total"]
+        new = measurement["total"]
+        current_sum += new
+        baseline_sum += old
+        if old > 0:
+            change = (new - old) / old
+        else:
+            change = float("inf") if new > 0 else 0
+        print(f"{benchmark}: {round(old, 4)}s -> {round(new, 4)}s ({round(change * 100, 1)}%)")
+
+        if change > threshold and max(old, new) >= min_time:
+            regressions.append(f"{benchmark} got slower by {round(change * 100, 1)}%")
+
+    if baseline_sum > 0:
+        change = (current_sum - baseline_sum) / baseline_sum
+        print(f"Aggregate: {round(baseline_sum, 4)}s -> {round(current_sum, 4)}s ({round(change * 100, 1)}%)")
+        if change > aggregate_threshold:
+            regressions.append(f"All programs together got slower by {round(change * 100, 1)}%")
+
+    return regressions
+
+
+def main():
+    set_mora_log_level(MORA_LOG_NOTHING)
+    set_log_level(LOG_NOTHING)
+
+    args = parser.parse_args()
+    args.benchmarks = [b for bs in map(glob.glob, args.benchmarks) for b in bs]
+
+    current = {
+        "version": BASELINE_VERSION,
+        "warmup": args.warmup,
+        "repeats": args.repeats,
+        "programs": {}
+    }
+    for benchmark in args.benchmarks:
+        measurement = measure(benchmark, args.warmup, args.repeats)
+        current["programs"][benchmark] = measurement
+        if "error" in measurement:
+            print(f"{benchmark}: failed ({measurement['error']})")
+            continue
+        phases = ", ".join([f"{p}: {round(t, 4)}s" for p, t in measurement["phases"].items()])
+        print(f"{benchmark}: {round(measurement['total'], 4)}s ({phases})")
+
+    current["total"] = sum([m["total"] for m in current["programs"].values() if "error" not in m])
+    print(f"Total: {round(current['total'], 4)}s")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(current, file, indent=2)
+
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        print()
+        regressions = compare(current, baseline, args.threshold, args.aggregate_threshold, args.min_time)
+        print()
+        if regressions:
+            print("Performance regressions:")
+            for r in regressions:
+                print(f"  {r}")
+            sys.exit(1)
+        print("No performance regressions.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Budgets for single symbolic operations (e.g. limit, summation, solve). An operation gets aborted with BudgetExceeded
+as soon as it runs longer than its time budget, or right away if its input is larger than its size budget (measured
+in the number of operations of the expression). The callers catch BudgetExceeded and fall back to a cheaper but
+sound answer, e.g. a trivial bound. How often budgets are exceeded and fallbacks are taken gets counted, the calls
+of every operation and the time spent in them are recorded in the metrics.
+Time budgets rely on SIGALRM and hence only apply in the main thread of a process.
+"""
+
+import signal
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from typing import Dict, Optional, Tuple
+
+from diofant import Basic
+
+from .metrics import timed
+
+LIMIT = "limit"
+SUMMATION = "summation"
+SOLVE = "solve"
+
+# The budgets (seconds, maximum operations) of operations by name. The budgets stored under None apply to all others.
+budgets: Dict[Optional[str], Tuple[Optional[float], Optional[int]]] = {None: (None, None)}
+
+# How often the budget of an operation has been exceeded, by operation
+exceeded = Counter()
+
+# How often a fallback has been taken, by the place taking it
+fallbacks = Counter()
+
+__running = False
+
+
+class BudgetExceeded(Exception):
+    pass
+
+
+def set_budgets(seconds: Optional[float] = None, max_operations: Optional[int] = None, operation: Optional[str] = None):
+    """
+    Sets the budgets of the given operation or of all operations if no operation is given. None means unbounded.
+    """
+    if operation is None:
+        budgets.clear()
+    budgets[operation] = (seconds, max_operations)
+
+
+def get_budgets(operation: str) -> Tuple[Optional[float], Optional[int]]:
+    return budgets.get(operation, budgets.get(None, (None, None)))
+
+
+def fallback(place: str):
+    """
+    Counts that the given place fell back to a sound answer because some budget got exceeded
+    """
+    fallbacks[place] += 1
+
+
+def reset_counts():
+    exceeded.clear()
+    fallbacks.clear()
+
+
+@contextmanager
+def budget(operation: str, expression=None):
+    """
+    Context manager running the enclosed operation on the given expression within the budgets of the operation.
+    Operations nested in another one run within the budget of the outer one.
+    """
+    with timed(operation), __within_budget(operation, expression):
+        yield
+
+
+@contextmanager
+def __within_budget(operation: str, expression):
+    global __running
+    seconds, max_operations = get_budgets(operation)
+    if max_operations is not None and isinstance(expression, Basic) and expression.count_ops() > max_operations:
+        exceeded[operation] += 1
+        raise BudgetExceeded(f"{operation} exceeded its size budget")
+
+    use_alarm = seconds is not None and not __running and hasattr(signal, "setitimer") \
+        and threading.current_thread() is threading.main_thread()
+    if not use_alarm:
+        yield
+        return
+
+    def exceed(signum, frame):
+        exceeded[operation] += 1
+        raise BudgetExceeded(f"{operation} exceeded its time budget")
+
+    previous = signal.signal(signal.SIGALRM, exceed)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    __running = True
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+        __running = False
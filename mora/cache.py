@@ -0,0 +1,187 @@
+"""
+Bounded stores for the caches of MORA and Amber. A store behaves like a dictionary, but evicts its least recently used
+entries as soon as it holds more than a maximum number of entries or more than a maximum number of (estimated) bytes.
+All entries are caches which get recomputed when they are missing, hence evicting them never changes results.
+Stores can be linked, such that evicting an entry also evicts the entry with the same key from the linked stores
+(e.g. a solution and its exponential polynomial are only useful together).
+The keys and values of interning stores get hash-consed, such that equal subexpressions are shared across entries.
+"""
+
+import sys
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from diofant import Basic
+
+from .intern import intern
+
+# The limits (maximum entries, maximum bytes) of stores by name. The limits stored under None apply to all others.
+limits: Dict[Optional[str], Tuple[Optional[int], Optional[int]]] = {None: (None, None)}
+
+# The most recently created store of every name
+stores: Dict[str, "BoundedStore"] = {}
+
+
+def set_limits(max_entries: Optional[int] = None, max_bytes: Optional[int] = None, name: Optional[str] = None):
+    """
+    Sets the limits of the stores with the given name or of all stores if no name is given. None means unbounded.
+    The limits apply to the current stores and to all stores created later.
+    """
+    if name is None:
+        limits.clear()
+    limits[name] = (max_entries, max_bytes)
+    for store_name, store in stores.items():
+        if name is None or name == store_name:
+            store.max_entries, store.max_bytes = get_limits(store_name)
+            store.evict()
+
+
+def get_limits(name: str) -> Tuple[Optional[int], Optional[int]]:
+    return limits.get(name, limits.get(None, (None, None)))
+
+
+def create_store(name: str, items: Dict = None, interning: bool = False) -> "BoundedStore":
+    """
+    Creates a new store with the limits configured for the name. The store replaces the previous one of that name
+    in the size report. An interning store interns the expressions of its keys and values.
+    """
+    store = BoundedStore(name, *get_limits(name), interning=interning)
+    if items:
+        store.update(items)
+    stores[name] = store
+    return store
+
+
+def link(*linked: "BoundedStore"):
+    """
+    Links the given stores, such that an entry evicted from one of them also gets removed from the others
+    """
+    for store in linked:
+        store.links = [s for s in linked if s is not store]
+
+
+def store_sizes() -> Dict[str, Dict[str, int]]:
+    """
+    Returns the number of entries, the estimated resident bytes and the number of evictions of the current stores
+    """
+    return {name: {"entries": len(store), "bytes": store.bytes, "evictions": store.evictions}
+            for name, store in stores.items()}
+
+
+def estimate_size(value) -> int:
+    """
+    Estimates the bytes held by a value. Expressions, containers and plain objects are followed recursively, every
+    object is counted once.
+    """
+    size = 0
+    seen = set()
+    todo = [value]
+    while todo:
+        current = todo.pop()
+        if id(current) in seen:
+            continue
+        seen.add(id(current))
+        size += sys.getsizeof(current)
+        if isinstance(current, Basic):
+            todo.extend(current.args)
+        elif isinstance(current, dict):
+            todo.extend(current.keys())
+            todo.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset)):
+            todo.extend(current)
+        elif hasattr(current, "__dict__") and not isinstance(current, type):
+            todo.extend(vars(current).values())
+    return size
+
+
+class BoundedStore(dict):
+    """
+    A dictionary evicting its least recently used entries when it exceeds its limits. The entry inserted last is never
+    evicted, such that it can always be read right after it has been stored.
+    """
+
+    def __init__(self, name: str, max_entries: Optional[int] = None, max_bytes: Optional[int] = None,
+                 interning: bool = False):
+        super().__init__()
+        self.name = name
+        self.interning = interning
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.links: List[BoundedStore] = []
+        self.bytes = 0
+        self.evictions = 0
+        # Maps the keys in the order of their last use to their estimated sizes
+        self.__usage = OrderedDict()
+
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        self.__usage.move_to_end(key)
+        return value
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def __setitem__(self, key, value):
+        if self.interning:
+            key, value = intern(key), intern(value)
+        if key in self:
+            self.__discard(key)
+        super().__setitem__(key, value)
+        size = estimate_size(key) + estimate_size(value)
+        self.__usage[key] = size
+        self.bytes += size
+        self.evict()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self.bytes -= self.__usage.pop(key)
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def pop(self, key, *default):
+        if key not in self:
+            if default:
+                return default[0]
+            raise KeyError(key)
+        value = super().__getitem__(key)
+        del self[key]
+        return value
+
+    def popitem(self):
+        key = next(iter(self.__usage))
+        return key, self.pop(key)
+
+    def clear(self):
+        super().clear()
+        self.__usage.clear()
+        self.bytes = 0
+
+    def evict(self):
+        """
+        Evicts the least recently used entries until the store is within its limits
+        """
+        while len(self) > 1 and self.__exceeds_limits():
+            key = next(iter(self.__usage))
+            self.__discard(key)
+            self.evictions += 1
+            for store in self.links:
+                store.__discard(key)
+
+    def __exceeds_limits(self) -> bool:
+        if self.max_entries is not None and len(self) > self.max_entries:
+            return True
+        return self.max_bytes is not None and self.bytes > self.max_bytes
+
+    def __discard(self, key):
+        if key in self:
+            del self[key]
+
+    def __reduce__(self):
+        return self.__class__, (self.name, self.max_entries, self.max_bytes, self.interning), None, None, iter(dict.items(self))
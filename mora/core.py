@@ -1,6 +1,11 @@
-from diofant import Symbol, sympify, simplify, expand, Expr, Poly, symbols, summation
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from diofant import Symbol, sympify, simplify, expand, Expr, Poly, symbols, summation, prod
 from mora.utils import *
-from typing import List, Dict, Set
+from mora import utils, linear
+from mora.budget import budget, SUMMATION
+from mora.cache import create_store, link
+from mora.metrics import hit, miss
+from typing import List, Dict, Set, Iterator, Tuple
 
 
 class Program:
@@ -17,16 +22,22 @@ class Program:
 
 
 # Stores the solutions of E-variables
-solution_store = {}
+solution_store = create_store("solutions", interning=True)
 
 # Stores the recurrences of E-variables
-recurrence_store = {}
+recurrence_store = create_store("recurrences")
+
+# Stores the solutions of E-variables computed by solving whole monomial closures, as exponential polynomials
+exp_poly_store = create_store("exp_polys")
+link(solution_store, exp_poly_store)
 
 
 def reset_mora():
-    global solution_store, recurrence_store
-    solution_store = {}
-    recurrence_store = {}
+    global solution_store, recurrence_store, exp_poly_store
+    solution_store = create_store("solutions", interning=True)
+    recurrence_store = create_store("recurrences")
+    exp_poly_store = create_store("exp_polys")
+    link(solution_store, exp_poly_store)
 
 
 def core(program: Program, goal_monomials: List[Expr] = None, goal_power: int = 1):
@@ -46,6 +57,72 @@ def core(program: Program, goal_monomials: List[Expr] = None, goal_power: int =
     return solution_store
 
 
+def moments(program: Program, goal_monomials: List[Expr] = None, max_power: int = 1, processes: int = 1) \
+        -> Iterator[Tuple[Expr, Expr]]:
+    """
+    Yields the expected values of the given monomials (by default all program variables) raised to the powers
+    1 to max_power, as soon as they are computed. The stores are not reset, such that all results computed before
+    (in particular the lower moments) are reused. If processes is larger than 1, the goals of every power are solved
+    in parallel by that many processes and the store entries computed by the workers are merged back.
+    The stores belong to a single program, call reset_mora before computing moments of another program.
+    """
+    if goal_monomials is None:
+        goal_monomials = program.variables
+
+    if processes <= 1:
+        for power in range(1, max_power + 1):
+            for m in goal_monomials:
+                goal = (m ** power).as_poly(program.variables)
+                yield goal.as_expr(), get_solution(program, goal)
+        return
+
+    with ProcessPoolExecutor(max_workers=processes, initializer=_initialize_worker,
+                             initargs=(program, utils.LOG_LEVEL)) as pool:
+        for power in range(1, max_power + 1):
+            futures = []
+            # The stores get pickled in the background, hence they must not change while the goals are submitted
+            stores = dict(solution_store), dict(recurrence_store), dict(exp_poly_store)
+            for m in goal_monomials:
+                goal = expand(m ** power)
+                if goal in stores[0]:
+                    yield goal, stores[0][goal]
+                else:
+                    futures.append(pool.submit(_solve_in_worker, goal, *stores))
+            for future in as_completed(futures):
+                goal, solution, solutions, recurrences, exp_polys = future.result()
+                solution_store.update(solutions)
+                recurrence_store.update(recurrences)
+                exp_poly_store.update(exp_polys)
+                yield goal, solution
+
+
+# The program solved by a worker process of moments
+worker_program = None
+
+
+def _initialize_worker(program: Program, log_level: int):
+    global worker_program
+    worker_program = program
+    set_log_level(log_level)
+
+
+def _solve_in_worker(goal: Expr, solutions: Dict, recurrences: Dict, exp_polys: Dict):
+    """
+    Solves a single goal in a worker process, starting from the given stores. Returns the solution together with
+    all store entries which were newly computed.
+    """
+    global solution_store, recurrence_store, exp_poly_store
+    solution_store = create_store("solutions", solutions, interning=True)
+    recurrence_store = create_store("recurrences", recurrences)
+    exp_poly_store = create_store("exp_polys", exp_polys)
+    link(solution_store, exp_poly_store)
+    solution = get_solution(worker_program, goal.as_poly(worker_program.variables))
+    new_solutions = {m: e for m, e in solution_store.items() if m not in solutions}
+    new_recurrences = {m: r for m, r in recurrence_store.items() if m not in recurrences}
+    new_exp_polys = {m: e for m, e in exp_poly_store.items() if m not in exp_polys}
+    return goal, solution, new_solutions, new_recurrences, new_exp_polys
+
+
 def get_solution(program: Program, monomial: Poly):
     """
     For a given monomial returns its expected value by first checking if it already has been computed and stored
@@ -55,7 +132,11 @@ def get_solution(program: Program, monomial: Poly):
     if monomial_is_constant(monomial):
         return monomial.as_expr()
     if monomial.as_expr() not in solution_store:
-        solution_store[monomial.as_expr()] = compute_solution(program, monomial)
+        with miss("solutions"):
+            if not compute_solutions_of_closure(program, monomial):
+                solution_store[monomial.as_expr()] = compute_solution(program, monomial)
+    else:
+        hit("solutions")
     log(f"End get solution, { monomial.as_expr() }", LOG_VERBOSE)
     return solution_store[monomial.as_expr()]
 
@@ -70,6 +151,11 @@ def compute_solution(program: Program, monomial: Poly):
 
     factor = monomial.coeffs()[0]
     monomial = monomial.monic()
+    factors = get_independent_factors(program, monomial)
+    if len(factors) > 1:
+        solution = expand(prod(get_solution(program, f) for f in factors))
+        log(f"End compute solution, { monomial.as_expr() }", LOG_ESSENTIAL)
+        return factor * solution
     recurrence = get_recurrence(program, monomial)
     recurr_coeff = recurrence.coeff_monomial(monomial.as_expr())
     inhom_part = recurrence - (recurr_coeff * monomial)
@@ -80,6 +166,86 @@ def compute_solution(program: Program, monomial: Poly):
     return factor * solution
 
 
+def compute_solutions_of_closure(program: Program, monomial: Poly):
+    """
+    Solves the recurrences of all monomials the given monomial transitively depends on at once, in the order of
+    their dependencies. This avoids symbolic summation, but is only possible if all recurrences have rational
+    coefficients for their own monomial. Returns false if the closure could not be solved that way.
+    """
+    if monomial.coeffs()[0] != 1:
+        return False
+    closure = get_closure(program, monomial)
+    if closure is None:
+        return False
+
+    log(f"Start compute solutions of closure, { monomial.as_expr() }", LOG_VERBOSE)
+    n = symbols('n', integer=True, positive=True)
+    # The stores may evict entries while the closure gets solved, hence the required solutions are kept locally
+    exp_polys = {}
+    for m, recurr_coeff, inhom_part in closure:
+        dependencies = inhom_part if recurr_coeff is None else get_monoms(inhom_part)
+        for d in dependencies:
+            if d.as_expr() in exp_poly_store:
+                exp_polys[d.as_expr()] = exp_poly_store[d.as_expr()]
+
+    for m, recurr_coeff, inhom_part in closure:
+        if recurr_coeff is None:
+            solution = linear.constant(1)
+            for f in inhom_part:
+                solution = linear.product(solution, exp_polys[f.as_expr()])
+            exp_polys[m.as_expr()] = exp_poly_store[m.as_expr()] = solution
+            solution_store[m.as_expr()] = linear.as_expression(solution, n)
+            continue
+        inhom_part_solution = linear.constant(inhom_part.coeff_monomial(1))
+        for dependency in get_monoms(inhom_part):
+            coefficient = inhom_part.coeff_monomial(dependency.as_expr())
+            linear.add_scaled(inhom_part_solution, exp_polys[dependency.as_expr()], coefficient)
+        initial_value = get_expected_initial_value(program, m)
+        solution = linear.solve_recurrence(recurr_coeff, linear.normalized(inhom_part_solution), initial_value)
+        exp_polys[m.as_expr()] = exp_poly_store[m.as_expr()] = solution
+        solution_store[m.as_expr()] = linear.as_expression(solution, n)
+        log(f"End compute solution, { m.as_expr() }", LOG_ESSENTIAL)
+    return True
+
+
+def get_closure(program: Program, monomial: Poly):
+    """
+    Returns all monomials the given monic monomial transitively depends on (including itself) which have not been
+    solved yet, ordered such that every monomial comes after its dependencies. Every monomial comes together with the
+    coefficient of itself in its recurrence and the rest of its recurrence. Monomials which split into independent
+    factors come with None and their factors instead, as their solution is the product of the solutions of the factors.
+    Returns None if the closure contains a non-rational coefficient or a monomial whose solution has not been computed
+    as an exponential polynomial.
+    """
+    closure = []
+    visited = set()
+
+    def visit(m: Poly):
+        key = m.as_expr()
+        if key in exp_poly_store or key in visited:
+            return True
+        if key in solution_store:
+            return False
+        visited.add(key)
+        factors = get_independent_factors(program, m)
+        if len(factors) > 1:
+            if not all(visit(f) for f in factors):
+                return False
+            closure.append((m, None, factors))
+            return True
+        recurrence = get_recurrence(program, m)
+        recurr_coeff = recurrence.coeff_monomial(key)
+        if not recurr_coeff.is_Rational:
+            return False
+        inhom_part = recurrence - (recurr_coeff * m)
+        if not all(visit(d) for d in get_monoms(inhom_part)):
+            return False
+        closure.append((m, recurr_coeff, inhom_part))
+        return True
+
+    return closure if visit(monomial) else None
+
+
 def get_inhom_part_solution(program: Program, inhom_part: Poly):
     """
     For a given inhomogenous part of the assignment of a monomial replace the monomials in the inhom part by their
@@ -129,7 +295,8 @@ def compute_solution_for_recurrence(recurr_coeff: Expr, inhom_part_solution: Exp
     hom_solution = (recurr_coeff ** n) * initial_value
     k = symbols('_k', integer=True, positive=True)
     summand = simplify((recurr_coeff ** k) * inhom_part_solution.xreplace({n: (n-1) - k}))
-    particular_solution = summation(summand, (k, 0, (n-1)))
+    with budget(SUMMATION, summand):
+        particular_solution = summation(summand, (k, 0, (n-1)))
     particular_solution = without_piecewise(particular_solution)
     solution = simplify(hom_solution + particular_solution)
     log(f"End compute solution for recurrence, { recurr_coeff }, { inhom_part_solution }, { initial_value }", LOG_VERBOSE)
@@ -146,7 +313,10 @@ def get_recurrence(program: Program, monomial: Poly):
     if monomial_is_constant(monomial):
         return monomial
     if monomial.as_expr() not in recurrence_store:
-        recurrence_store[monomial.as_expr()] = compute_recurrence(program, monomial)
+        with miss("recurrences"):
+            recurrence_store[monomial.as_expr()] = compute_recurrence(program, monomial)
+    else:
+        hit("recurrences")
     log(f"End get recurrence, { monomial.as_expr() }", LOG_VERBOSE)
     return recurrence_store[monomial.as_expr()]
 
@@ -0,0 +1,85 @@
+"""
+Compiles the closed-form moments computed by the core into functions of n which can be evaluated over whole arrays
+of n at once. Symbolic constants of the program become parameters of the compiled functions. The numpy backend
+evaluates in floating point, the mpmath backend evaluates element-wise with arbitrary precision.
+"""
+
+from typing import Dict, Iterable
+
+import mpmath
+import numpy
+from diofant import Expr, lambdify, symbols, sympify
+
+import mora.core
+
+BACKENDS = ("numpy", "mpmath")
+
+# Stores the compiled functions of closed forms, keyed by the closed form and the backend
+compiled_store = {}
+
+
+class CompiledMoment:
+    """
+    A closed form E[monomial](n) compiled into a function of n and the symbolic constants it contains
+    """
+
+    def __init__(self, expression: Expr, backend: str = "numpy"):
+        if backend not in BACKENDS:
+            raise Exception(f"Unknown backend {backend}. Supported are {', '.join(BACKENDS)}")
+        n = symbols("n", integer=True, positive=True)
+        self.expression = expression
+        self.backend = backend
+        self.parameters = sorted(expression.free_symbols - {n}, key=str)
+        self.function = lambdify((n, *self.parameters), expression, backend)
+
+    def __call__(self, ns, **parameters):
+        """
+        Evaluates the closed form for all values in ns. Returns a float array for the numpy backend and an object
+        array of mpmath numbers for the mpmath backend.
+        """
+        missing = [str(p) for p in self.parameters if str(p) not in parameters]
+        if missing:
+            raise Exception(f"Values for the constants {', '.join(missing)} are required to evaluate {self.expression}")
+        values = [parameters[str(p)] for p in self.parameters]
+
+        if self.backend == "numpy":
+            # Integer arrays would silently overflow for exponentials in n
+            ns = numpy.asarray(ns, dtype=numpy.float64)
+            with numpy.errstate(over="ignore"):
+                return numpy.broadcast_to(self.function(ns, *values), ns.shape)
+
+        values = [mpmath.mpf(v) if isinstance(v, (int, float)) else v for v in values]
+        ns = numpy.asarray(ns)
+        result = [self.function(mpmath.mpf(int(n)), *values) for n in ns.flat]
+        return numpy.array(result, dtype=object).reshape(ns.shape)
+
+
+def compile_moment(expression: Expr, backend: str = "numpy") -> CompiledMoment:
+    """
+    Returns the compiled function of a closed form by first checking if it already has been compiled
+    """
+    global compiled_store
+    expression = sympify(expression)
+    key = (expression, backend)
+    if key not in compiled_store:
+        compiled_store[key] = CompiledMoment(expression, backend)
+    return compiled_store[key]
+
+
+def compile_moments(solutions: Dict[Expr, Expr] = None, backend: str = "numpy") -> Dict[Expr, CompiledMoment]:
+    """
+    Compiles all given closed forms. If no closed forms are given, all solutions computed by the core are compiled.
+    """
+    if solutions is None:
+        solutions = mora.core.solution_store
+    return {monomial: compile_moment(solution, backend) for monomial, solution in solutions.items()}
+
+
+def evaluate_moments(ns: Iterable, solutions: Dict[Expr, Expr] = None, parameters: Dict[str, object] = None,
+                     backend: str = "numpy") -> Dict[Expr, numpy.ndarray]:
+    """
+    Evaluates all given closed forms (by default all solutions computed by the core) for all values in ns
+    """
+    parameters = parameters or {}
+    compiled = compile_moments(solutions, backend)
+    return {monomial: moment(ns, **parameters) for monomial, moment in compiled.items()}
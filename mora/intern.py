@@ -0,0 +1,76 @@
+"""
+Hash-consing of the expressions held by the stores. Closed forms, bounds and branches of different monomials contain
+many structurally equal subexpressions (e.g. (1/2)**n or n**2) which are built independently. Interning an expression
+replaces its subexpressions by the equal ones already in the pool, such that equal subexpressions are shared by all
+stored expressions. Shared subexpressions use less memory and comparing expressions containing them short-circuits
+on identity. The pool only holds weak references, an expression leaves it as soon as no store refers to it anymore.
+"""
+
+import weakref
+
+from diofant import Basic
+from diofant.core.operations import AssocOp
+
+# The interned expressions by their hash. Expressions with colliding hashes are simply not shared.
+pool = weakref.WeakValueDictionary()
+
+# Number of expressions replaced by an equal expression from the pool since the last reset, e.g. during one analysis
+shared = 0
+
+
+def intern(value):
+    """
+    Interns the expressions in the given value and returns it. Expressions, lists, tuples and plain objects (like
+    bounds or branches) are followed, lists and plain objects are updated in place.
+    """
+    if isinstance(value, Basic):
+        return intern_expression(value)
+    if isinstance(value, list):
+        value[:] = [intern(v) for v in value]
+        return value
+    if isinstance(value, tuple):
+        return tuple(intern(v) for v in value)
+    if hasattr(value, "__dict__") and not isinstance(value, type):
+        for name, attribute in vars(value).items():
+            setattr(value, name, intern(attribute))
+    return value
+
+
+def intern_expression(expression: Basic) -> Basic:
+    """
+    Returns the expression from the pool equal to the given one. If there is none, the expression gets rebuilt from its
+    interned arguments and the rebuilt expression is added to the pool. The given expression is never changed, as
+    expressions are immutable and may be shared with the caches of diofant.
+    """
+    global shared
+    key = hash(expression)
+    existing = pool.get(key)
+    if existing is expression:
+        return existing
+    if existing is not None and type(existing) is type(expression) and existing == expression:
+        shared += 1
+        return existing
+
+    # Polys keep their terms outside of their arguments and are only shared as a whole
+    args = tuple(intern_expression(a) for a in expression._args)
+    if any(a is not b for a, b in zip(args, expression._args)):
+        # Sums and products get rebuilt from their already flattened and sorted arguments without evaluating them again.
+        # Other expressions get evaluated again, which only keeps the expression if its arguments are canonical.
+        if isinstance(expression, AssocOp):
+            rebuilt = expression.func._from_args(args)
+        else:
+            rebuilt = expression.func(*args)
+        if type(rebuilt) is type(expression) and rebuilt == expression:
+            expression = rebuilt
+    if existing is None:
+        pool[key] = expression
+    return expression
+
+
+def pool_size() -> int:
+    return len(pool)
+
+
+def reset_counts():
+    global shared
+    shared = 0
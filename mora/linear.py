@@ -0,0 +1,120 @@
+"""
+Solves the recurrences of the moments of a whole monomial closure without symbolic summation. The closed forms are
+kept as exponential polynomials sum_b p_b(n) * b^n with rational bases b. For these, the first-order recurrences
+f(n+1) = a*f(n) + g(n) with rational a have particular solutions of the same shape, whose coefficients follow from
+small triangular systems of linear equations.
+"""
+
+from typing import Dict, List
+
+from diofant import Expr, Rational, binomial, expand, sympify
+
+# Maps the bases b to the coefficient lists [p_0, p_1, ...] of the polynomials p_b(n)
+ExpPoly = Dict[Expr, List[Expr]]
+
+
+def constant(c: Expr) -> ExpPoly:
+    """
+    Returns the exponential polynomial of a constant
+    """
+    return normalized({Rational(1): [sympify(c)]})
+
+
+def add_scaled(target: ExpPoly, source: ExpPoly, factor: Expr):
+    """
+    Adds factor * source to target in place
+    """
+    for base, coefficients in source.items():
+        current = target.setdefault(base, [])
+        current.extend([0] * (len(coefficients) - len(current)))
+        for i, c in enumerate(coefficients):
+            current[i] = expand(current[i] + factor * c)
+
+
+def product(f: ExpPoly, g: ExpPoly) -> ExpPoly:
+    """
+    Returns the product of two exponential polynomials
+    """
+    result = {}
+    for base_f, p in f.items():
+        for base_g, q in g.items():
+            coefficients = [0] * (len(p) + len(q) - 1)
+            for i, a in enumerate(p):
+                for j, b in enumerate(q):
+                    coefficients[i + j] += a * b
+            add_scaled(result, {base_f * base_g: coefficients}, 1)
+    return normalized(result)
+
+
+def normalized(f: ExpPoly) -> ExpPoly:
+    """
+    Removes trailing zero coefficients and vanishing polynomials
+    """
+    result = {}
+    for base, coefficients in f.items():
+        coefficients = list(coefficients)
+        while coefficients and coefficients[-1] == 0:
+            coefficients.pop()
+        if coefficients:
+            result[base] = coefficients
+    return result
+
+
+def shifted_back(f: ExpPoly) -> ExpPoly:
+    """
+    Returns g with g(n) = f(n-1), which requires all bases to be non-zero
+    """
+    result = {}
+    for base, p in f.items():
+        q = [expand(sum(p[i] * binomial(i, j) * (-1) ** (i - j) for i in range(j, len(p))) / base)
+             for j in range(len(p))]
+        result[base] = q
+    return normalized(result)
+
+
+def particular_solution(a: Expr, base: Expr, p: List[Expr]) -> List[Expr]:
+    """
+    Returns the coefficients of a polynomial q such that q(n)*base^n solves f(n+1) = a*f(n) + p(n)*base^n,
+    that is base*q(n+1) - a*q(n) = p(n)
+    """
+    d = len(p) - 1
+    if base != a:
+        q = [0] * (d + 1)
+        for j in reversed(range(d + 1)):
+            rest = sum(binomial(i, j) * q[i] for i in range(j + 1, d + 1))
+            q[j] = expand((p[j] - base * rest) / (base - a))
+        return q
+
+    # For base = a the polynomial has one degree more and a*(q(n+1) - q(n)) = p(n), the constant part of q is free
+    q = [0] * (d + 2)
+    for j in reversed(range(d + 1)):
+        rest = sum(binomial(i, j) * q[i] for i in range(j + 2, d + 2))
+        q[j + 1] = expand((p[j] / a - rest) / (j + 1))
+    return q
+
+
+def solve_recurrence(a: Expr, inhom_part: ExpPoly, initial_value: Expr) -> ExpPoly:
+    """
+    Solves f(0) = initial_value; f(n+1) = a*f(n) + inhom_part(n) for a rational a. Like the summation based
+    solution of the core, the solution for a = 0 is f(n) = inhom_part(n-1) which holds for n >= 1.
+    """
+    if a == 0:
+        return shifted_back(inhom_part)
+
+    solution = {}
+    for base, p in inhom_part.items():
+        add_scaled(solution, {base: particular_solution(a, base, p)}, 1)
+    homogeneous = initial_value - sum(p[0] for p in solution.values())
+    add_scaled(solution, {a: [homogeneous]}, 1)
+    return normalized(solution)
+
+
+def as_expression(f: ExpPoly, n: Expr) -> Expr:
+    """
+    Returns the closed form of an exponential polynomial as an expression in n
+    """
+    result = sympify(0)
+    for base, p in f.items():
+        polynomial = expand(sum(c * n ** i for i, c in enumerate(p)))
+        result += polynomial if base == 1 else polynomial * base ** n
+    return result
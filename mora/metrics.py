@@ -0,0 +1,92 @@
+"""
+Counters and timers showing how effective the stores are and where the time of the symbolic primitives goes.
+For every store the hits, the misses and the seconds spent computing the missing entries are counted. As computing an
+entry often looks up other entries, the seconds of a store include the ones of the stores it depends on. For every
+primitive (e.g. limit, summation, solve) the calls and the seconds spent in them are counted.
+Recording only costs a few dictionary updates per lookup, such that the metrics are always collected. The counters
+are never reset, the metrics of a single analysis are the difference to the metrics before it.
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict
+
+# [hits, misses, seconds] by store
+lookups: Dict[str, list] = {}
+
+# [calls, seconds] by primitive
+primitives: Dict[str, list] = {}
+
+# Functions returning the cache info of functools caches, by store
+caches: Dict[str, Callable] = {}
+
+
+def hit(store: str):
+    """
+    Counts that an entry has been found in the given store
+    """
+    counts = lookups.setdefault(store, [0, 0, 0.0])
+    counts[0] += 1
+
+
+@contextmanager
+def miss(store: str):
+    """
+    Context manager counting that an entry was missing in the given store and timing the enclosed computation of it
+    """
+    counts = lookups.setdefault(store, [0, 0, 0.0])
+    counts[1] += 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        counts[2] += time.perf_counter() - start
+
+
+@contextmanager
+def timed(primitive: str):
+    """
+    Context manager (or decorator) counting a call of the given primitive and timing it
+    """
+    counts = primitives.setdefault(primitive, [0, 0.0])
+    counts[0] += 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        counts[1] += time.perf_counter() - start
+
+
+def register_cache(store: str, cache_info: Callable):
+    """
+    Registers a functools cache, whose hits and misses are then reported under the given store name
+    """
+    caches[store] = cache_info
+
+
+def get_metrics() -> Dict[str, Dict[str, Dict[str, float]]]:
+    """
+    Returns the counts and seconds of all stores and primitives since the start of the process
+    """
+    stores = {name: {"hits": h, "misses": m, "seconds": s} for name, (h, m, s) in lookups.items()}
+    for name, cache_info in caches.items():
+        info = cache_info()
+        stores[name] = {"hits": info.hits, "misses": info.misses, "seconds": None}
+    return {
+        "stores": stores,
+        "primitives": {name: {"calls": c, "seconds": s} for name, (c, s) in primitives.items()},
+    }
+
+
+def get_metrics_since(before) -> Dict[str, Dict[str, Dict[str, float]]]:
+    """
+    Returns the metrics collected since the given result of get_metrics
+    """
+    metrics = get_metrics()
+    for group, entries in metrics.items():
+        for name, values in entries.items():
+            previous = before[group].get(name, {})
+            for key, value in values.items():
+                if value is not None:
+                    values[key] = value - previous.get(key, 0)
+    return metrics
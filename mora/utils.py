@@ -251,6 +251,59 @@ def all_are_independent_from_all(program, xs, ys):
     return True
 
 
+def get_read_variables(program, x):
+    """
+    Returns the program variables read by the update of x, including the ones read by parameters of random variables
+    """
+    update = program.updates[x]
+    if update.is_random_var:
+        parameters = update.random_var.parameters
+        expressions = [p for ps in parameters for p in (ps if isinstance(ps, tuple) else [ps])]
+    else:
+        expressions = [e for branch in update.branches for e in branch]
+    return {s for e in expressions for s in sympify(e).free_symbols if s in program.updates}
+
+
+def get_dependency_cone(program, x):
+    """
+    Returns x together with all variables x transitively depends on. Other than the ancestors stored in the program,
+    the cone also follows parameters of random variables and variables which are assigned later in the loop body.
+    """
+    cone = {x}
+    todo = [x]
+    while todo:
+        v = todo.pop()
+        for parent in (program.ancestors.get(v, set()) | get_read_variables(program, v)) - cone:
+            cone.add(parent)
+            todo.append(parent)
+    return cone
+
+
+def get_independent_factors(program, monomial: Poly):
+    """
+    Splits a monomial into factors whose variables are statistically independent in every iteration. Two variables
+    are independent if their dependency cones are disjoint, because all variables are initialized independently and
+    every update draws its branches and random variables independently. The coefficient of the monomial is not part
+    of any factor. Monomials containing variables without initial value (like the loop guard) are never split.
+    """
+    powers = monomial.monoms()[0]
+    variables = [(v, p) for v, p in zip(monomial.gens, powers) if p > 0]
+    if len(variables) < 2 or any(v not in program.initial_values for v, _ in variables):
+        return [monomial.monic()]
+
+    groups = []
+    for v, p in variables:
+        cone = get_dependency_cone(program, v)
+        merged = [g for g in groups if g[0] & cone]
+        group = (set(cone), [(v, p)])
+        for g in merged:
+            group[0].update(g[0])
+            group[1].extend(g[1])
+            groups.remove(g)
+        groups.append(group)
+    return [prod(v ** p for v, p in g[1]).as_poly(monomial.gens) for g in groups]
+
+
 def get_powers_of_variable_in_polynomial(variable: Symbol, polynomial: Poly):
     """
     Returns the set of all powers p for which variable ** p occurs in the polynomial
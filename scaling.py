@@ -0,0 +1,213 @@
+"""This file is part of Amber
+
+This runnable script measures how Amber scales with the size of the analyzed programs. It generates random
+Prob-solvable loops over a grid of sizes (number of variables, degree of the updates, number of branches, number of
+random variables and degree of the loop guard) and reports the time and optionally the memory per phase.
+Every program is analyzed in a fresh process, such that no caches are shared and a timeout can stop it.
+For the command line arguments run the script with "--help".
+"""
+
+import itertools
+import json
+import multiprocessing
+import statistics
+import time
+from argparse import ArgumentParser
+
+from mora.input import InputParser
+from mora.utils import set_log_level as set_mora_log_level, LOG_NOTHING as MORA_LOG_NOTHING
+from src import decide_termination
+from src.generator import generate_program
+from src.phases import PhaseMemory, PhaseTimer, phase, PARSE, MOMENTS, BOUNDS, RULES
+from src.utils import set_log_level, LOG_NOTHING
+
+PHASES = [PARSE, MOMENTS, BOUNDS, RULES]
+DIMENSIONS = ["variables", "degree", "branches", "rvs", "guard_degree"]
+
+
+parser = ArgumentParser(description="Measure how Amber scales on generated programs of growing size")
+
+parser.add_argument(
+    "--variables",
+    dest="variables",
+    type=int,
+    nargs="+",
+    default=[1, 2, 3, 4],
+    help="Numbers of program variables"
+)
+
+parser.add_argument(
+    "--degree",
+    dest="degree",
+    type=int,
+    nargs="+",
+    default=[1],
+    help="Degrees of the polynomial parts of the updates"
+)
+
+parser.add_argument(
+    "--branches",
+    dest="branches",
+    type=int,
+    nargs="+",
+    default=[2],
+    help="Numbers of branches per update"
+)
+
+parser.add_argument(
+    "--rvs",
+    dest="rvs",
+    type=int,
+    nargs="+",
+    default=[0],
+    help="Numbers of random variables"
+)
+
+parser.add_argument(
+    "--guard-degree",
+    dest="guard_degree",
+    type=int,
+    nargs="+",
+    default=[1],
+    help="Degrees of the loop guard"
+)
+
+parser.add_argument(
+    "--seeds",
+    dest="seeds",
+    type=int,
+    default=3,
+    help="Number of programs generated per grid point. The median over the programs is reported"
+)
+
+parser.add_argument(
+    "--timeout",
+    dest="timeout",
+    type=float,
+    default=60,
+    help="Seconds after which the analysis of a single program gets stopped"
+)
+
+parser.add_argument(
+    "--memory",
+    dest="memory",
+    action="store_true",
+    default=False,
+    help="Additionally measure the peak memory per phase with tracemalloc in a separate run of every program"
+)
+
+parser.add_argument(
+    "--output",
+    dest="output",
+    type=str,
+    default="",
+    help="If set, the measurements of all programs are written as JSON to the given file"
+)
+
+
+def run_once(source: str, memory: bool):
+    """
+    Parses and analyzes a program once. Returns the time or the peak memory per phase, the total time and the result
+    """
+    listener = PhaseMemory() if memory else PhaseTimer()
+    with listener:
+        start = time.perf_counter()
+        with phase(PARSE):
+            input_parser = InputParser()
+            input_parser.set_source_text(source, "generated")
+            program = input_parser.parse_source()
+        result = decide_termination(program)
+        total = time.perf_counter() - start
+
+    values = listener.grouped_peaks() if memory else listener.grouped_times()
+    return {p: values.get(p, 0) for p in PHASES}, total, result
+
+
+def _measure_in_process(source: str, memory: bool, connection):
+    set_mora_log_level(MORA_LOG_NOTHING)
+    set_log_level(LOG_NOTHING)
+    try:
+        values, total, result = run_once(source, memory)
+        connection.send({"phases": values, "total": total, "PAST": str(result.PAST), "AST": str(result.AST)})
+    except Exception as e:
+        connection.send({"error": str(e) or type(e).__name__})
+
+
+def measure(source: str, memory: bool, timeout: float):
+    """
+    Measures a single program in a fresh process. Returns None if the analysis did not finish in time.
+    """
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+    process = multiprocessing.Process(target=_measure_in_process, args=(source, memory, sender))
+    process.start()
+    sender.close()
+    measurement = None
+    if receiver.poll(timeout):
+        try:
+            measurement = receiver.recv()
+        except EOFError:
+            measurement = {"error": f"The analysis crashed with exit code {process.exitcode}"}
+    process.terminate()
+    process.join()
+    return measurement
+
+
+def measure_grid_point(sizes, seeds: int, memory: bool, timeout: float):
+    """
+    Measures all programs generated for a single grid point and summarizes them
+    """
+    programs = []
+    for seed in range(seeds):
+        source = generate_program(**sizes, seed=seed)
+        program = {"seed": seed, "source": source, "time": measure(source, False, timeout)}
+        if memory and program["time"] is not None:
+            program["memory"] = measure(source, True, timeout)
+        programs.append(program)
+
+    finished = [p for p in programs if p["time"] is not None and "error" not in p["time"]]
+    summary = {
+        **sizes,
+        "programs": programs,
+        "timeouts": len([p for p in programs if p["time"] is None]),
+        "errors": len([p for p in programs if p["time"] is not None and "error" in p["time"]]),
+        "total": statistics.median([p["time"]["total"] for p in finished]) if finished else None,
+        "phases": {ph: statistics.median([p["time"]["phases"][ph] for p in finished]) for ph in PHASES}
+        if finished else None,
+    }
+    measured = [p["memory"] for p in finished if p.get("memory") and "error" not in p["memory"]]
+    if memory and measured:
+        summary["memory"] = {ph: max([m["phases"][ph] for m in measured]) for ph in PHASES}
+    return summary
+
+
+def print_summary(summary, seeds: int):
+    sizes = " ".join([f"{d}={summary[d]}" for d in DIMENSIONS])
+    if summary["total"] is None:
+        print(f"{sizes}: no program finished ({summary['timeouts']} timeouts, {summary['errors']} errors)")
+        return
+    phases = ", ".join([f"{p}: {round(t, 4)}s" for p, t in summary["phases"].items()])
+    line = f"{sizes}: {round(summary['total'], 4)}s ({phases})"
+    if "memory" in summary:
+        memory = ", ".join([f"{p}: {round(m / 2 ** 20, 2)}MiB" for p, m in summary["memory"].items()])
+        line += f" memory ({memory})"
+    if summary["timeouts"] or summary["errors"]:
+        line += f" [{summary['timeouts']}/{seeds} timeouts, {summary['errors']}/{seeds} errors]"
+    print(line)
+
+
+def main():
+    args = parser.parse_args()
+    grid = itertools.product(args.variables, args.degree, args.branches, args.rvs, args.guard_degree)
+    summaries = []
+    for point in grid:
+        summary = measure_grid_point(dict(zip(DIMENSIONS, point)), args.seeds, args.memory, args.timeout)
+        print_summary(summary, args.seeds)
+        summaries.append(summary)
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({"seeds": args.seeds, "timeout": args.timeout, "grid": summaries}, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
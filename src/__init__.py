@@ -1 +1,2 @@
 from .decission import decide_termination
+from .api import analyze, analyze_many
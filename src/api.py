@@ -0,0 +1,182 @@
+"""
+This module contains the API for using Amber as a library. Programs can be given as source strings or as already
+parsed programs. The results are returned as objects together with timings and the metrics of the stores and
+symbolic primitives, nothing gets printed.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager, nullcontext
+from typing import Dict, List, Optional, Union
+
+import mora.intern
+import mora.utils
+from mora.core import Program
+from mora.input import InputParser
+from mora.metrics import get_metrics, get_metrics_since
+from . import utils
+from .decission import decide_termination
+from .memory import MemoryReport
+from .phases import PhaseMemory, PhaseTimer, phase, PARSE
+from .result import Result
+from .result_cache import ResultCache
+
+Source = Union[str, Program]
+
+
+class Analysis:
+    """
+    The outcome of analyzing a single program
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.program: Optional[Program] = None
+        self.result: Optional[Result] = None
+        self.error: Optional[str] = None
+        self.times: Dict[str, float] = {}
+        self.memory: Optional[MemoryReport] = None
+        self.metrics: Dict[str, Dict] = {}
+
+    @property
+    def total_time(self) -> float:
+        return sum(self.times.values())
+
+    def as_dict(self):
+        """
+        Returns the analysis as a dictionary only containing strings and numbers, which e.g. can be serialized to JSON
+        """
+        result = self.result.as_dict() if self.result else {}
+        analysis = {
+            "name": self.name,
+            **result,
+            "error": self.error,
+            "times": self.times,
+            "time": self.total_time,
+            "metrics": self.metrics
+        }
+        if self.memory:
+            analysis["memory"] = self.memory.as_dict()
+        return analysis
+
+
+@contextmanager
+def silenced():
+    """
+    Context manager suppressing all logging of Amber and MORA
+    """
+    mora_level, amber_level = mora.utils.LOG_LEVEL, utils.LOG_LEVEL
+    mora.utils.set_log_level(mora.utils.LOG_NOTHING)
+    utils.set_log_level(utils.LOG_NOTHING)
+    try:
+        yield
+    finally:
+        mora.utils.set_log_level(mora_level)
+        utils.set_log_level(amber_level)
+
+
+def parse(source: str, name: str = "from_text") -> Program:
+    """
+    Parses a program from its source text
+    """
+    input_parser = InputParser()
+    input_parser.set_source_text(source, name)
+    return input_parser.parse_source()
+
+
+def analyze(source: Source, name: str = None, memory: bool = False, results: ResultCache = None) -> Analysis:
+    """
+    Decides the termination behavior of a single program given as source text or as parsed program.
+    If memory is true, also the memory used by the analysis gets reported, which slows down the analysis.
+    If a result cache is given, the result (and the moments and bounds) of an equal program get reused from it.
+    Errors (e.g. during parsing) are raised.
+    """
+    if name is None:
+        name = source.name if isinstance(source, Program) else "from_text"
+    analysis = Analysis(name)
+    metrics = get_metrics()
+    mora.intern.reset_counts()
+    with silenced(), PhaseTimer() as timer, PhaseMemory() if memory else nullcontext() as phase_memory:
+        if isinstance(source, Program):
+            analysis.program = source
+        else:
+            with phase(PARSE):
+                analysis.program = parse(source, name)
+        if results is not None:
+            analysis.result = results.decide_termination(analysis.program)
+        else:
+            analysis.result = decide_termination(analysis.program)
+    analysis.times = timer.grouped_times()
+    analysis.metrics = get_metrics_since(metrics)
+    if memory:
+        analysis.memory = MemoryReport(phase_memory.peaks)
+    return analysis
+
+
+def analyze_many(sources: List[Source], names: List[str] = None, processes: int = 1) -> List[Analysis]:
+    """
+    Analyzes a batch of programs. Identical source texts are only analyzed once. Programs which are equal up to
+    renaming of variables, formatting and the order of independent updates share their result, moments and bounds
+    through a result cache keyed by the canonical hash (per process). If processes is larger than 1, the programs are
+    distributed over that many processes. Errors do not abort the batch but are stored in the respective analysis.
+    """
+    if names is None:
+        names = [None] * len(sources)
+
+    unique_sources = {}
+    for source, name in zip(sources, names):
+        key = source if isinstance(source, str) else id(source)
+        if key not in unique_sources:
+            unique_sources[key] = (source, name)
+
+    jobs = list(unique_sources.values())
+    if processes > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=processes, initializer=_start_batch) as pool:
+            chunk_size = max(1, len(jobs) // (processes * 4))
+            analyses = list(pool.map(_analyze_in_batch, jobs, chunksize=chunk_size))
+    else:
+        results = ResultCache()
+        analyses = [_analyze_safely(job, results) for job in jobs]
+
+    analyses = dict(zip(unique_sources.keys(), analyses))
+    result = []
+    for source, name in zip(sources, names):
+        key = source if isinstance(source, str) else id(source)
+        analysis = analyses[key]
+        if name is not None and name != analysis.name:
+            analysis = __renamed(analysis, name)
+        result.append(analysis)
+    return result
+
+
+# The result cache shared by the programs of a batch analyzed in the current worker process
+_batch_results: Optional[ResultCache] = None
+
+
+def _start_batch():
+    global _batch_results
+    _batch_results = ResultCache()
+
+
+def _analyze_in_batch(job) -> Analysis:
+    return _analyze_safely(job, _batch_results)
+
+
+def _analyze_safely(job, results: ResultCache = None) -> Analysis:
+    source, name = job
+    try:
+        return analyze(source, name, results=results)
+    except Exception as e:
+        analysis = Analysis(name or "from_text")
+        analysis.error = str(e) or type(e).__name__
+        return analysis
+
+
+def __renamed(analysis: Analysis, name: str) -> Analysis:
+    copy = Analysis(name)
+    copy.program = analysis.program
+    copy.result = analysis.result
+    copy.error = analysis.error
+    copy.times = analysis.times
+    copy.memory = analysis.memory
+    copy.metrics = analysis.metrics
+    return copy
@@ -1,5 +1,7 @@
 from .utils import *
 from enum import Enum, auto
+from typing import Optional
+import mpmath
 
 
 class Direction(Enum):
@@ -15,6 +17,7 @@ def dominated(fs: [Expr], n: Symbol):
     return get_eventual_bound(fs, n, Direction.NegInf)
 
 
+@timed("eventual_bound")
 def get_eventual_bound(fs: [Expr], n: Symbol, direction: Direction = Direction.PosInf) -> Expr:
     """
     Given a list of expressions in n, it returns a single expression which is eventually a bound on all fs.
@@ -42,6 +45,10 @@ def is_dominating_or_same(f1: Expr, f2: Expr, n: Symbol, direction: Direction =
     """
     upper = direction is Direction.PosInf
     lower = not upper
+    screened = screen_dominating_or_same(f1, f2, n, direction)
+    if screened is not None:
+        return screened
+
     limit_f1 = amber_limit(f1, n)
     limit_f2 = amber_limit(f2, n)
 
@@ -71,6 +78,167 @@ def is_dominating_or_same(f1: Expr, f2: Expr, n: Symbol, direction: Direction =
         return (upper and amber_limit(f1 / f2, n).is_finite) or (lower and amber_limit(f1 / f2, n) > 0)
 
 
+class Growth(Enum):
+    """
+    The eventual behavior of a function in n
+    """
+    PosInf = auto()
+    NegInf = auto()
+    Pos = auto()
+    Neg = auto()
+    Zero = auto()
+
+    def is_infinite(self):
+        return self is Growth.PosInf or self is Growth.NegInf
+
+    def order(self):
+        return [Growth.NegInf, Growth.Neg, Growth.Zero, Growth.Pos, Growth.PosInf].index(self)
+
+
+# The points at which functions get evaluated for the numeric screening and the precision used
+SCREENING_POINTS = [10 ** 8, 10 ** 16, 10 ** 32, 10 ** 64]
+SCREENING_PRECISION = 150
+# Numbers in screened functions (and numerators and denominators of rationals) have to be within
+# [1 / SCREENING_MAX_NUMBER, SCREENING_MAX_NUMBER], such that the terms are ordered by their growth already at the
+# smallest screening point, e.g. a large constant term cannot hide behind the values at the screening points
+SCREENING_MAX_NUMBER = 10 ** 3
+
+
+class NotScreenable(Exception):
+    pass
+
+
+def screen_dominating_or_same(f1: Expr, f2: Expr, n: Symbol, direction: Direction = Direction.PosInf) -> Optional[bool]:
+    """
+    Fast numeric version of is_dominating_or_same which does not need any limits. Both expressions are written as
+    k * g(n) where k does not contain n and has a known sign and g only contains numbers and n. The eventual behavior
+    of g is then determined by evaluating it at exponentially growing points. This is only done if g is built from
+    integer powers of n and exponentials in n with positive rational bases and small numbers, and all evaluations
+    agree on the behavior. Only diverging and vanishing behaviors are trusted, functions of n which seem to approach a
+    non-zero constant (which may as well be slowly growing) are left to the limits.
+    Returns None if the answer cannot be determined in this way.
+    """
+    if n not in f1.free_symbols and n not in f2.free_symbols:
+        return None
+    try:
+        growth1, values1 = __get_screened_growth(f1, n)
+        growth2, values2 = __get_screened_growth(f2, n)
+    except NotScreenable:
+        return None
+    # Only expressions without n are known to be constant
+    if (__is_constant(growth1) and n in f1.free_symbols) or (__is_constant(growth2) and n in f2.free_symbols):
+        return None
+
+    upper = direction is Direction.PosInf
+    if not growth1.is_infinite() and not growth2.is_infinite():
+        if upper:
+            return growth1 is Growth.Pos or growth2 is Growth.Neg or (growth1 is Growth.Zero and growth2 is Growth.Zero)
+        else:
+            return growth1 is Growth.Neg or growth2 is Growth.Pos or (growth1 is Growth.Zero and growth2 is Growth.Zero)
+
+    if growth1 is not growth2:
+        return growth1.order() > growth2.order() if upper else growth1.order() < growth2.order()
+
+    # Both functions go to the same infinity, so their fraction is positive and its magnitude decides
+    fraction_growth = __get_growth([abs(v1 / v2) for v1, v2 in zip(values1, values2)], sympify(1))
+    if fraction_growth is None or __is_constant(fraction_growth):
+        return None
+    if (growth1 is Growth.PosInf) == upper:
+        return fraction_growth is Growth.PosInf
+    return fraction_growth is Growth.Zero
+
+
+def __is_constant(growth: Growth) -> bool:
+    return growth is Growth.Pos or growth is Growth.Neg
+
+
+def __get_screened_growth(expression: Expr, n: Symbol):
+    """
+    Returns the eventual behavior of an expression together with the values of its part depending on n
+    at the screening points
+    """
+    if expression.is_zero:
+        return Growth.Zero, None
+    k, g = __split_constant_factor(expression, n)
+    values = [__evaluate_exp_poly(g, n, p) for p in SCREENING_POINTS]
+    growth = __get_growth(values, k)
+    if growth is None:
+        raise NotScreenable()
+    return growth, values
+
+
+def __split_constant_factor(expression: Expr, n: Symbol):
+    """
+    Writes an expression as k * g such that k does not contain n and has a known sign and g only contains n
+    """
+    k, g = factor_terms(expression).as_independent(n, as_Add=False)
+    if g.free_symbols - {n}:
+        raise NotScreenable()
+    if k.has(oo, -oo, zoo, nan) or (not k.is_positive and not k.is_negative):
+        raise NotScreenable()
+    return k, g
+
+
+def __evaluate_exp_poly(expression: Expr, n: Symbol, value: int):
+    """
+    Evaluates an expression built from small numbers, n, sums, products, integer powers and exponentials with a
+    positive rational base at n = value
+    """
+    with mpmath.workdps(SCREENING_PRECISION):
+        return __evaluate(expression, n, value)
+
+
+def __evaluate(expression: Expr, n: Symbol, value: int):
+    if expression == n:
+        return mpmath.mpf(value)
+    if expression.is_Rational:
+        if abs(expression.numerator) > SCREENING_MAX_NUMBER or expression.denominator > SCREENING_MAX_NUMBER:
+            raise NotScreenable()
+        return mpmath.mpf(expression.numerator) / expression.denominator
+    if expression.is_number:
+        if not expression.is_real:
+            raise NotScreenable()
+        number = mpmath.mpf(str(expression.evalf(SCREENING_PRECISION)))
+        if not 1 / mpmath.mpf(SCREENING_MAX_NUMBER) <= abs(number) <= SCREENING_MAX_NUMBER:
+            raise NotScreenable()
+        return number
+    if expression.is_Add:
+        return mpmath.fsum([__evaluate(a, n, value) for a in expression.args])
+    if expression.is_Mul:
+        return mpmath.fprod([__evaluate(a, n, value) for a in expression.args])
+    if expression.is_Pow:
+        base, exponent = expression.args
+        if n not in exponent.free_symbols and exponent.is_Integer:
+            return mpmath.power(__evaluate(base, n, value), __evaluate(exponent, n, value))
+        if base.is_Rational and base.is_positive and exponent.is_polynomial(n) and degree(exponent, n) == 1:
+            return mpmath.power(__evaluate(base, n, value), __evaluate(exponent, n, value))
+    raise NotScreenable()
+
+
+def __get_growth(values, constant_factor: Expr) -> Optional[Growth]:
+    """
+    Determines the eventual behavior of a function from its values at exponentially growing points.
+    Returns None if the values do not clearly show the behavior.
+    """
+    if any(v == 0 for v in values):
+        return None
+    signs = {mpmath.sign(v) for v in values}
+    if len(signs) != 1:
+        return None
+    positive = (signs.pop() > 0) == bool(constant_factor.is_positive)
+
+    magnitudes = [mpmath.log10(abs(v)) for v in values]
+    steps = [m2 - m1 for m1, m2 in zip(magnitudes, magnitudes[1:])]
+    if all(s >= 1 for s in steps):
+        return Growth.PosInf if positive else Growth.NegInf
+    if all(s <= -1 for s in steps):
+        return Growth.Zero
+    if all(abs(s) <= 1e-3 for s in steps):
+        return Growth.Pos if positive else Growth.Neg
+    return None
+
+
+@timed("simplify_asymptotically")
 def simplify_asymptotically(expression: Expr, n: Symbol):
     """
     For a given expression returns another expression such that eventually the two expressions grow/shrink at
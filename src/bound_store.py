@@ -4,11 +4,16 @@ This modules contains functions providing the bounds of given monomials and poly
 
 from diofant import *
 from mora.core import Program, get_solution as get_expected
+from mora.budget import budget, fallback, BudgetExceeded, SUMMATION, SOLVE
+from mora.cache import create_store
+from mora.metrics import hit, miss
 from .utils import *
 from .asymptotics import *
 from . import branch_store
+from .expression import get_split_overlay
+from .phases import in_phase, BOUNDS
 
-store = {}
+store = create_store("bounds", interning=True)
 program: Program = None
 
 
@@ -34,7 +39,7 @@ def set_program(p: Program):
     """
     global program, store
     program = p
-    store = {}
+    store = create_store("bounds", interning=True)
 
 
 def __multiply_rvs_for_monom_bounds(rvs, monom_bounds: Bounds, original_monom: Expr):
@@ -42,15 +47,16 @@ def __multiply_rvs_for_monom_bounds(rvs, monom_bounds: Bounds, original_monom: E
     Given bounds for a monom x, computes bounds for the monom rvs * x by handling one random variable in rv at a time
     """
     global program
+    overlay = get_split_overlay(program)
     n = symbols("n", integer=True, positive=True)
     result_bounds = Bounds()
-    result_bounds.expression = original_monom.as_poly(program.variables)
+    result_bounds.expression = original_monom.as_poly(overlay.variables)
     result_bounds.lower = monom_bounds.lower
     result_bounds.upper = monom_bounds.upper
     result_bounds.maybe_positive = monom_bounds.maybe_positive
     result_bounds.maybe_negative = monom_bounds.maybe_negative
     for rv, power in rvs:
-        low, high = program.updates[rv].random_var.get_support(power)
+        low, high = overlay.updates[rv].random_var.get_support(power)
         candidates = [
             low * result_bounds.lower,
             high * result_bounds.lower,
@@ -77,15 +83,37 @@ def __multiply_rvs_for_monom_bounds(rvs, monom_bounds: Bounds, original_monom: E
     return result_bounds
 
 
+@in_phase(BOUNDS)
 def get_bounds_of_expr(expression: Expr) -> Bounds:
     """
     Computes the bounds of a polynomial over the program variables. It does so by substituting the bounds of the monomials.
+    The polynomial may also contain variables of the program's split overlay.
+    If some operation exceeds its budget, the trivial bounds -oo and oo are returned.
     """
-    expression = expression.as_poly(program.variables)
+    try:
+        return __compute_bounds_of_expr(expression)
+    except BudgetExceeded:
+        fallback("bounds")
+        return __get_trivial_bounds(expression.as_poly(get_split_overlay(program).variables))
+
+
+def __get_trivial_bounds(expression) -> Bounds:
+    bounds = Bounds()
+    bounds.expression = expression
+    bounds.upper = oo
+    bounds.lower = -oo
+    bounds.maybe_positive = True
+    bounds.maybe_negative = True
+    return bounds
+
+
+def __compute_bounds_of_expr(expression: Expr) -> Bounds:
+    overlay = get_split_overlay(program)
+    expression = expression.as_poly(overlay.variables)
     expr_bounds = __initialize_bounds_for_expression(expression)
     monoms = get_monoms(expression)
     for monom in monoms:
-        rvs, m = separate_rvs_from_monom(monom, program)
+        rvs, m = separate_rvs_from_monom(monom, overlay)
         m_bounds = __get_bounds_of_monom(m)
         if rvs:
             monom_bounds = __multiply_rvs_for_monom_bounds(rvs, m_bounds, monom)
@@ -154,7 +182,14 @@ def __get_bounds_of_monom(monom: Expr) -> Bounds:
     """
     monom = sympify(monom).as_expr()
     if monom not in store:
-        __compute_bounds_of_monom(monom)
+        with miss("bounds"):
+            try:
+                __compute_bounds_of_monom(monom)
+            except BudgetExceeded:
+                fallback("bounds")
+                store[monom] = __get_trivial_bounds(monom)
+    else:
+        hit("bounds")
     return store[monom]
 
 
@@ -335,7 +370,8 @@ def __compute_bound_candidate(c: Number, inhom_part: Expr, starting_value: Expr)
     hom_solution = (c ** n) * starting_value
     k = symbols('_k', integer=True, positive=True)
     summand = simplify((c ** k) * inhom_part.xreplace({n: (n - 1) - k}))
-    particular_solution = summation(summand, (k, 0, (n - 1)))
+    with budget(SUMMATION, summand):
+        particular_solution = summation(summand, (k, 0, (n - 1)))
     solution = simplify(hom_solution + particular_solution)
     return solution
 
@@ -358,7 +394,8 @@ def __split_on_signums(expression: Expr) -> [Expr]:
             # Get rid of the signum expression by replacing it by a positive and an negative constant
             # This is done by substituting the arbitrary symbol by just the right expression s.t. things cancel out
             constant = unique_symbol('e', positive=True, real=True)
-            solutions = solve(s - constant, [symbol])
+            with budget(SOLVE, s):
+                solutions = solve(s - constant, [symbol])
             assert len(solutions) >= 1
             solution_pos = solutions[0][symbol]
             solution_neg = solution_pos.subs({constant: constant * -1})
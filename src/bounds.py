@@ -1,7 +1,19 @@
+"""
+This module computes asymptotic bounds of expressions over program variables, either for a single expression or for
+batches of expressions. All expressions of a program share the stores, such that the bounds of monomials are only
+computed once per program.
+"""
+
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple
+
 from diofant import sympify
 
+from mora.core import Program, reset_mora
 from mora.input import InputParser
 from . import branch_store, bound_store
+from .api import silenced
 from .utils import log, LOG_ESSENTIAL
 
 
@@ -20,3 +32,68 @@ def bounds(benchmark, expression):
     log(f"Absolute upper bound: {bounds.absolute_upper}", LOG_ESSENTIAL)
     log(f"Maybe positive: {bounds.maybe_positive}", LOG_ESSENTIAL)
     log(f"Maybe negative: {bounds.maybe_negative}", LOG_ESSENTIAL)
+
+
+def read_expressions(path: str) -> List[str]:
+    """
+    Reads a file containing one expression per line. Empty lines and lines starting with '#' are skipped.
+    """
+    with open(path) as file:
+        lines = [line.strip() for line in file]
+    return [line for line in lines if line and not line.startswith("#")]
+
+
+def bounds_of_expressions(program: Program, expressions: List[str]) -> List[Dict]:
+    """
+    Computes the bounds of all given expressions of a program in one session sharing the stores. Returns a dictionary
+    only containing strings and numbers per expression. Errors only abort the respective expression.
+    """
+    reset_mora()
+    branch_store.set_program(program)
+    bound_store.set_program(program)
+    variables = {str(v): v for v in program.variables}
+    results = []
+    for expression in expressions:
+        start = time.time()
+        try:
+            expression_bounds = bound_store.get_bounds_of_expr(sympify(expression, locals=variables))
+            result = {
+                "expression": expression,
+                "lower": str(expression_bounds.lower),
+                "upper": str(expression_bounds.upper),
+                "absolute_upper": str(expression_bounds.absolute_upper),
+                "maybe_positive": bool(expression_bounds.maybe_positive),
+                "maybe_negative": bool(expression_bounds.maybe_negative),
+            }
+        except Exception as e:
+            result = {"expression": expression, "error": str(e) or type(e).__name__}
+        result["time"] = time.time() - start
+        results.append(result)
+    return results
+
+
+def batch_bounds(jobs: List[Tuple[str, List[str]]], processes: int = 1) -> List[Dict]:
+    """
+    Computes the bounds of batches of expressions. Every job consists of a benchmark file and its expressions.
+    If processes is larger than 1, the benchmarks are distributed over that many processes. Nothing gets logged.
+    """
+    if processes > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            return list(pool.map(_bounds_of_benchmark, jobs))
+    return [_bounds_of_benchmark(job) for job in jobs]
+
+
+def _bounds_of_benchmark(job) -> Dict:
+    benchmark, expressions = job
+    start = time.time()
+    try:
+        input_parser = InputParser()
+        input_parser.set_source(benchmark)
+        program = input_parser.parse_source()
+        with silenced():
+            results = bounds_of_expressions(program, expressions)
+        error = None
+    except Exception as e:
+        results = []
+        error = str(e) or type(e).__name__
+    return {"benchmark": benchmark, "bounds": results, "error": error, "time": time.time() - start}
@@ -13,11 +13,16 @@ Branches of x*y:
 - (x + 1)(y + 1) @ 1/4
 
 The branches of monomials are computed just in time and stored so they can be reused.
+Branches of products of independently updated factors (like x*y above) and of powers of single variables
+are derived from the stored cases of their factors instead of being enumerated from scratch.
 """
 
 from diofant import *
 from mora.core import Program
-from .expression import get_cases_for_expression, get_initial_polarity_for_expression
+from mora.cache import create_store
+from mora.metrics import hit, miss
+from .expression import get_cases_for_expression, get_initial_polarity_for_expression, combine_expressions
+from .utils import get_all_monom_powers
 
 
 class Branch:
@@ -32,8 +37,9 @@ class Branch:
     initial_value: Number
 
 
-store = {}
-initial_value_store = {}
+store = create_store("branches", interning=True)
+case_store = create_store("cases")
+initial_value_store = create_store("initial_values")
 program: Program = None
 
 
@@ -41,10 +47,11 @@ def set_program(p: Program):
     """
     Set the program and initialize the store. This function needs to be called before the store is used.
     """
-    global program, store, initial_value_store
+    global program, store, case_store, initial_value_store
     program = p
-    store = {}
-    initial_value_store = {}
+    store = create_store("branches", interning=True)
+    case_store = create_store("cases")
+    initial_value_store = create_store("initial_values")
 
 
 def get_branches_of_monom(monom: Expr) -> [Branch]:
@@ -53,7 +60,10 @@ def get_branches_of_monom(monom: Expr) -> [Branch]:
     """
     monom = sympify(monom)
     if monom not in store:
-        __compute_branches(monom)
+        with miss("branches"):
+            __compute_branches(monom)
+    else:
+        hit("branches")
     return store[monom]
 
 
@@ -64,18 +74,88 @@ def get_initial_polarity_of_monom(monom: Expr) -> (bool, bool):
     global program, initial_value_store
     monom = sympify(monom)
     if monom not in initial_value_store:
-        initial_value_store[monom] = get_initial_polarity_for_expression(monom, program)
+        with miss("initial_values"):
+            initial_value_store[monom] = get_initial_polarity_for_expression(monom, program)
+    else:
+        hit("initial_values")
     return initial_value_store[monom]
 
 
 def __compute_branches(monom: Expr):
-    global program
     monom = sympify(monom)
-    cases = get_cases_for_expression(monom, program)
+    cases = __get_cases_of_monom(monom)
     branches = __cases_to_branches(cases, monom)
     store[monom] = branches
 
 
+def __get_cases_of_monom(monom: Expr):
+    """
+    Lazily computes the cases (polynomial after one loop iteration together with its probability) of a monomial
+    """
+    if monom not in case_store:
+        with miss("cases"):
+            case_store[monom] = __compute_cases(monom)
+    else:
+        hit("cases")
+    return case_store[monom]
+
+
+def __compute_cases(monom: Expr):
+    """
+    Computes the cases of a monomial. If the monomial splits into factors whose updates are independent within one
+    iteration, the cases are the products of the cases of the factors. If the monomial is a power of a single variable
+    the cases are the powers of the cases of the variable. Only otherwise all cases get enumerated.
+    """
+    global program
+    factors = __get_independent_factors(monom)
+    if len(factors) > 1:
+        cases = [(sympify(1).as_poly(program.variables), sympify(1))]
+        for factor in factors:
+            factor_cases = __get_cases_of_monom(factor)
+            cases = [(c1 * c2, p1 * p2) for c1, p1 in cases for c2, p2 in factor_cases]
+        return combine_expressions(cases)
+
+    variables = list(monom.free_symbols)
+    if len(variables) == 1 and monom != variables[0]:
+        power = get_all_monom_powers(monom)[0]
+        variable_cases = __get_cases_of_monom(variables[0])
+        return combine_expressions([(case ** power, prob) for case, prob in variable_cases])
+
+    return get_cases_for_expression(monom, program)
+
+
+def __get_independent_factors(monom: Expr) -> [Expr]:
+    """
+    Splits a monomial into factors such that the updates of the variables of different factors do not depend on a
+    common variable which has branches. This means that splitting the factors on their branches is independent.
+    """
+    monom = monom.as_poly(monom.free_symbols)
+    groups = []
+    for variable, power in zip(monom.gens, monom.monoms()[0]):
+        closure = __get_split_closure(variable)
+        factor = variable ** power
+        connected = [g for g in groups if g[0] & closure]
+        for g in connected:
+            groups.remove(g)
+            closure = closure | g[0]
+            factor = factor * g[1]
+        groups.append((closure, factor))
+    return [g[1] for g in groups]
+
+
+def __get_split_closure(variable: Symbol):
+    """
+    Returns all variables with branches which have to be substituted when splitting the given variable
+    """
+    global program
+    has_branches = [v for v in program.variables if hasattr(program.updates[v], "branches")]
+    if variable not in program.ancestors:
+        # Variables without ancestor information (e.g. the loop guard) are conservatively connected to all others
+        return set(has_branches) if variable in has_branches else set()
+    closure = program.ancestors[variable] | {variable}
+    return closure.intersection(has_branches)
+
+
 def __cases_to_branches(cases, monom):
     result = []
     for case in cases:
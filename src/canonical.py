@@ -0,0 +1,150 @@
+"""
+This module computes a canonical form of programs. Programs which only differ in the names of their variables,
+whitespace, comments, the order of their branches or the order of independent updates have the same canonical form.
+The variables get ordered by a Weisfeiler-Lehman style refinement of their structural signatures and renamed
+according to that order.
+"""
+
+import hashlib
+from typing import Dict, List
+
+from diofant import Expr, Symbol, expand, sympify
+
+from mora.core import Program
+from mora.utils import Update
+from mora.input import LOOP_GUARD_VAR
+
+# Is part of every canonical form, such that changes of the form invalidate all hashes computed before
+CANONICAL_FORM_VERSION = 1
+
+
+class CanonicalProgram:
+    """
+    The canonical form of a program. variables contains the names of the program variables in canonical order,
+    the i-th variable is called "#{i}" in the canonical text (which cannot clash with the name of a constant).
+    """
+
+    def __init__(self, variables: List[str], text: str):
+        self.variables = variables
+        self.text = text
+        self.hash = hashlib.sha256(text.encode()).hexdigest()
+
+    def renaming_to(self, other: "CanonicalProgram") -> Dict[str, str]:
+        """
+        Returns the renaming of the variables of this program to the corresponding variables of an equivalent program
+        """
+        return dict(zip(self.variables, other.variables))
+
+
+def canonical_form(program: Program) -> CanonicalProgram:
+    variables = [v for v in program.variables if str(v) != LOOP_GUARD_VAR]
+    reads = {v: __read_variables(program.updates[v], variables) - {v} for v in variables}
+    labels = __get_labels(program, variables, reads)
+    order = __get_canonical_order(variables, reads, labels)
+
+    renaming = {str(v): Symbol(f"#{i}") for i, v in enumerate(order)}
+    lines = [f"version {CANONICAL_FORM_VERSION}"]
+    for v in order:
+        lines.append(f"init {renaming[str(v)]} = {__update_text(program.initial_values[v], renaming)}")
+    for v in order:
+        lines.append(f"update {renaming[str(v)]} = {__update_text(program.updates[v], renaming)}")
+    if program.loop_guard:
+        lines.append(f"guard {__expression_text(expand(sympify(program.loop_guard)), renaming)} > 0")
+    return CanonicalProgram([str(v) for v in order], "\n".join(lines))
+
+
+def program_hash(program: Program) -> str:
+    return canonical_form(program).hash
+
+
+def __get_labels(program: Program, variables: List[Symbol], reads: Dict[Symbol, set]) -> Dict[Symbol, str]:
+    """
+    Computes labels of the variables which only depend on the structure of the program. Initially a label describes
+    the initialization and the update of a variable without the names of the variables. Then the labels get refined by
+    the labels of the variables which are read and of the variables which read.
+    """
+    anonymous = {str(v): Symbol("#") for v in variables}
+    guard_variables = set()
+    if program.loop_guard:
+        guard_variables = {str(s) for s in sympify(program.loop_guard).free_symbols}
+    labels = {}
+    for v in variables:
+        initial_value = __update_text(program.initial_values[v], anonymous)
+        update = __update_text(program.updates[v], anonymous)
+        labels[v] = __digest(f"{initial_value} | {update} | {str(v) in guard_variables}")
+
+    readers = {v: {w for w in variables if v in reads[w]} for v in variables}
+    for _ in range(len(variables)):
+        refined = {}
+        for v in variables:
+            read_labels = sorted(labels[w] for w in reads[v])
+            reader_labels = sorted(labels[w] for w in readers[v])
+            refined[v] = __digest(f"{labels[v]} | {read_labels} | {reader_labels}")
+        if len(set(refined.values())) == len(set(labels.values())):
+            labels = refined
+            break
+        labels = refined
+    return labels
+
+
+def __get_canonical_order(variables: List[Symbol], reads: Dict[Symbol, set], labels: Dict[Symbol, str]):
+    """
+    Orders the variables by their labels, but keeps the relative order of every two variables where one reads the
+    other, as swapping their updates would change the program.
+    """
+    position = {v: i for i, v in enumerate(variables)}
+    predecessors = {v: set() for v in variables}
+    for v in variables:
+        for w in reads[v]:
+            first, second = (v, w) if position[v] < position[w] else (w, v)
+            predecessors[second].add(first)
+
+    order = []
+    remaining = list(variables)
+    while remaining:
+        available = [v for v in remaining if not predecessors[v] - set(order)]
+        chosen = min(available, key=lambda v: (labels[v], position[v]))
+        order.append(chosen)
+        remaining.remove(chosen)
+    return order
+
+
+def __read_variables(update: Update, variables: List[Symbol]) -> set:
+    names = {str(v): v for v in variables}
+    if update.is_random_var:
+        expressions = [sympify(p) for p in __flat_parameters(update)]
+    else:
+        expressions = [sympify(e) for branch in update.branches for e in branch]
+    return {names[str(s)] for e in expressions for s in e.free_symbols if str(s) in names}
+
+
+def __flat_parameters(update: Update) -> List:
+    parameters = []
+    for p in update.random_var.parameters:
+        parameters.extend(p if isinstance(p, tuple) else [p])
+    return parameters
+
+
+def __update_text(update: Update, renaming: Dict[str, Symbol]) -> str:
+    if update.is_random_var:
+        parameters = update.random_var.parameters
+        if update.random_var.distribution == "finite":
+            parameters = sorted(f"{__expression_text(v, renaming)} @ {__expression_text(p, renaming)}"
+                                for v, p in parameters)
+        else:
+            parameters = [__expression_text(p, renaming) for p in parameters]
+        return f"RV({update.random_var.distribution}, {', '.join(parameters)})"
+
+    branches = sorted(f"{__expression_text(e, renaming)} @ {__expression_text(p, renaming)}"
+                      for e, p in update.branches)
+    return "; ".join(branches)
+
+
+def __expression_text(expression: Expr, renaming: Dict[str, Symbol]) -> str:
+    expression = sympify(expression)
+    substitutions = {s: renaming[str(s)] for s in expression.free_symbols if str(s) in renaming}
+    return str(expression.xreplace(substitutions))
+
+
+def __digest(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()
@@ -0,0 +1,191 @@
+"""
+This module contains a store of certificates. A certificate is the result of a program together with the data of its
+witnesses, stored as JSON per canonical hash of the program. Instead of searching for a proof again, a stored
+certificate gets revalidated by only checking the conditions its witnesses claim. Only if there is no certificate for
+the program (e.g. because it changed) or if a check fails, the program gets analyzed fully.
+The bounds of the monomials computed during the analysis are part of the certificate. They are trusted when checking
+the witnesses, such that the checks only combine them instead of solving the recurrences of the monomials again.
+"""
+
+import json
+import os
+import string
+import tempfile
+from typing import Dict, Optional
+
+from diofant import Expr, symbols, sympify
+
+from mora.core import Program, reset_mora
+from . import branch_store, bound_store
+from .bound_store import Bounds
+from .canonical import canonical_form
+from .decission import decide_termination
+from .facts import Facts
+from .initial_state_rule import InitialStateRule
+from .phases import phase, rule_phase
+from .ranking_sm_rule import RankingSMRule
+from .repulsing_sm_rule import RepulsingSMRule
+from .result import Result
+from .slicing import slice_program
+from .supermartingale_rule import SupermartingaleRule
+from .utils import Answer, unique_symbol
+
+# The rules which found the witnesses of the given kinds
+WITNESS_RULES = {
+    "PAST": RankingSMRule,
+    "AST": SupermartingaleRule,
+    "Not AST": RepulsingSMRule,
+    "Not PAST": RepulsingSMRule
+}
+
+
+class CertificateStore:
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.revalidated = 0
+        self.failed = 0
+        self.missing = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def put(self, program: Program, result: Result):
+        """
+        Stores the certificate of the result of the given program
+        """
+        canonical = canonical_form(program)
+        bounds = self.__bounds(program)
+        expressions = [sympify(v) for w in result.witnesses for v in w.data.values()]
+        expressions += [e for b in bounds.values() for e in (b.lower, b.upper)]
+        constants = {s for e in expressions for s in e.free_symbols if s.is_positive} - self.__known_symbols(program)
+        certificate = {
+            "variables": canonical.variables,
+            "PAST": result.PAST.name,
+            "AST": result.AST.name,
+            "witnesses": [{"kind": w.kind, "data": {k: str(v) for k, v in w.data.items()}} for w in result.witnesses],
+            "bounds": {str(monomial): {
+                "lower": str(b.lower),
+                "upper": str(b.upper),
+                "maybe_positive": bool(b.maybe_positive),
+                "maybe_negative": bool(b.maybe_negative)
+            } for monomial, b in bounds.items()},
+            "constants": sorted(str(c) for c in constants)
+        }
+        handle, path = tempfile.mkstemp(dir=self.directory)
+        with os.fdopen(handle, "w") as file:
+            json.dump(certificate, file, indent=2)
+        os.replace(path, self.__path(canonical.hash))
+
+    def revalidate(self, program: Program) -> Optional[Result]:
+        """
+        Returns the result of the certificate of the program if all its witnesses still hold, otherwise None
+        """
+        canonical = canonical_form(program)
+        path = self.__path(canonical.hash)
+        if not os.path.exists(path):
+            self.missing += 1
+            return None
+        with open(path) as file:
+            certificate = json.load(file)
+
+        # Constants keep their names and assumptions (e.g. positivity), variables get renamed
+        names = {str(s): s for s in self.__symbols(program)}
+        variables = {str(v): v for v in program.variables}
+        names.update({old: variables[new] for old, new in zip(certificate["variables"], canonical.variables)})
+        names["n"] = symbols("n", integer=True, positive=True)
+        # The positive constants of bounds get fresh names, as their names might already be used in this process
+        for name in certificate.get("constants", []):
+            names[name] = unique_symbol(name.rstrip(string.digits), positive=True, real=True)
+        try:
+            result = self.__check(program, certificate, names)
+        except Exception:
+            result = None
+        if result is None:
+            self.failed += 1
+        else:
+            self.revalidated += 1
+        return result
+
+    def decide_termination(self, program: Program) -> Result:
+        """
+        Revalidates the certificate of the program or decides termination fully and stores the certificate
+        """
+        result = self.revalidate(program)
+        if result is None:
+            result = decide_termination(program)
+            self.put(program, result)
+        return result
+
+    @staticmethod
+    def __check(program: Program, certificate: Dict, names: Dict) -> Optional[Result]:
+        program_slice = slice_program(program)
+        program = program_slice.program
+        reset_mora()
+        branch_store.set_program(program)
+        bound_store.set_program(program)
+        for monomial, bounds in certificate.get("bounds", {}).items():
+            stored = Bounds()
+            stored.expression = sympify(monomial, locals=names)
+            stored.lower = sympify(bounds["lower"], locals=names)
+            stored.upper = sympify(bounds["upper"], locals=names)
+            stored.maybe_positive = bounds["maybe_positive"]
+            stored.maybe_negative = bounds["maybe_negative"]
+            bound_store.store[stored.expression] = stored
+        facts = Facts(program)
+
+        result = Result()
+        result.slice = program_slice.statistics
+        witnesses = certificate["witnesses"]
+        if not witnesses and certificate["PAST"] == Answer.TRUE.name:
+            witnesses = [{"kind": "Initial state", "data": {}}]
+        for witness in witnesses:
+            rule = WITNESS_RULES.get(witness["kind"], InitialStateRule)(facts)
+            data = {key: sympify(value, locals=names) for key, value in witness["data"].items()}
+            with phase(rule_phase(rule)):
+                result = rule.revalidate(result, data)
+
+        if result.PAST.name != certificate["PAST"] or result.AST.name != certificate["AST"]:
+            return None
+        return result
+
+    @staticmethod
+    def __bounds(program: Program) -> Dict[Expr, Bounds]:
+        """
+        Returns the bounds of the monomials over the program variables, if the bound store belongs to the program.
+        Only bounds whose constants are positive are taken, as the constants are restored as positive symbols.
+        """
+        if bound_store.program is None:
+            return {}
+        analyzed = canonical_form(bound_store.program)
+        expected = canonical_form(slice_program(program).program)
+        if (analyzed.hash, analyzed.variables) != (expected.hash, expected.variables):
+            return {}
+
+        known = CertificateStore.__known_symbols(program)
+        variables = set(program.variables)
+        bounds = {}
+        for monomial, monomial_bounds in bound_store.store.items():
+            if not isinstance(monomial, Expr) or not monomial.free_symbols <= variables:
+                continue
+            constants = (monomial_bounds.lower.free_symbols | monomial_bounds.upper.free_symbols) - known
+            if all(c.is_positive for c in constants):
+                bounds[monomial] = monomial_bounds
+        return bounds
+
+    @staticmethod
+    def __known_symbols(program: Program):
+        n = symbols("n", integer=True, positive=True)
+        return CertificateStore.__symbols(program) | set(program.variables) | {n}
+
+    @staticmethod
+    def __symbols(program: Program):
+        expressions = [sympify(program.loop_guard)] if program.loop_guard else []
+        for update in list(program.updates.values()) + list(program.initial_values.values()):
+            if update.is_random_var:
+                parameters = update.random_var.parameters
+                expressions += [p for ps in parameters for p in (ps if isinstance(ps, tuple) else [ps])]
+            else:
+                expressions += [e for branch in update.branches for e in branch]
+        return {s for e in expressions for s in sympify(e).free_symbols}
+
+    def __path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
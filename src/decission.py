@@ -3,66 +3,53 @@ This is the module which handles the decision on what proof-rule to apply to a p
 to get something about its termination behavior. Then the proof-rule gets applied
 """
 
-from mora.core import Program, get_solution as get_expected, get_recurrence, reset_mora
-from mora.input import LOOP_GUARD_VAR
-from diofant import sympify, symbols, expand, simplify
+from mora.budget import fallback, BudgetExceeded
+from mora.core import Program, reset_mora
 
 from . import branch_store, bound_store
+from .facts import Facts
 from .initial_state_rule import InitialStateRule
 from .supermartingale_rule import SupermartingaleRule
 from .ranking_sm_rule import RankingSMRule
 from .repulsing_sm_rule import RepulsingSMRule
 from .rule import Result
-from .utils import LOG_ESSENTIAL, log, substitute_deterministic_variables
+from .phases import phase, rule_phase
+from .slicing import slice_program
+from .utils import log, LOG_ESSENTIAL
 
 
-def decide_termination(program: Program):
+def decide_termination(program: Program, reset_stores: bool = True):
     """
-    The main function, gathering all the information, deciding on and calling a proof-rule
+    The main function, gathering all the information, deciding on and calling a proof-rule.
+    The analysis runs on the program sliced to the dependency cone of the loop guard.
+    If reset_stores is false, the stores need to be initialized for the sliced program already.
     """
-    reset_mora()
-    branch_store.set_program(program)
-    bound_store.set_program(program)
-    lgc = get_loop_guard_change(program)
-    me_pos = create_martingale_expression(program)
-    me_neg = expand(me_pos * (-1))
-    log(f"Martingale expression: {me_pos.as_expr()}", LOG_ESSENTIAL)
+    program_slice = slice_program(program)
+    program = program_slice.program
+    if reset_stores:
+        reset_mora()
+        branch_store.set_program(program)
+        bound_store.set_program(program)
+    facts = Facts(program)
     rules = [
-        InitialStateRule(lgc, me_pos, program),
-        RankingSMRule(lgc, me_pos, program),
-        SupermartingaleRule(lgc, me_pos, program),
-        RepulsingSMRule(lgc, me_neg, program)
+        InitialStateRule(facts),
+        RankingSMRule(facts),
+        SupermartingaleRule(facts),
+        RepulsingSMRule(facts)
     ]
     result = Result()
+    result.slice = program_slice.statistics
 
     for rule in rules:
-        if rule.is_applicable():
-            result = rule.run(result)
-            if result.all_known():
-                break
+        with phase(rule_phase(rule)):
+            try:
+                if rule.is_applicable():
+                    result = rule.run(result)
+            except BudgetExceeded as e:
+                # The rule could not establish anything, hence its answers stay unknown
+                fallback("rules")
+                log(f"{type(rule).__name__} gave up: {e}", LOG_ESSENTIAL)
+        if result.all_known():
+            break
 
     return result
-
-
-def create_martingale_expression(program: Program):
-    """
-    Creates the martingale expression E(M_{i+1} - M_i | F_i). Also deterministic variables get substituted
-    with their representation in n.
-    """
-    lg = symbols(LOOP_GUARD_VAR).as_poly(program.variables)
-    expected_guard = get_recurrence(program, lg)
-    lg = program.updates[symbols(LOOP_GUARD_VAR)].branches[0][0]
-    expression = expand(expected_guard - lg).as_expr()
-    expression = substitute_deterministic_variables(expression, program)
-    return simplify(expression)
-
-
-def get_loop_guard_change(program: Program):
-    """
-    Returns E[LG_{n+1} - LG_{n}]
-    """
-    n = symbols("n", integer=True, positive=True)
-    lg = sympify(LOOP_GUARD_VAR).as_poly(program.variables)
-    expected_lg = get_expected(program, lg)
-    expected_lg_plus = expected_lg.xreplace({n: n+1})
-    return expand(expected_lg_plus - expected_lg)
\ No newline at end of file
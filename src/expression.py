@@ -3,7 +3,7 @@ This module contains functions which compute for for a given expression M_{i+1}
 which could be the predecessor of M_{i+1} before executing the loop body together with the associated
 probabilities.
 """
-from typing import Iterable, Tuple
+from typing import Iterable, Tuple, Dict, List, Set
 
 from diofant import Expr, Symbol, simplify, Rational, symbols, Number, Min, Max
 from mora.core import Program, RandomVar, Update
@@ -113,8 +113,7 @@ def split_expressions_on_rvs(expressions: [Case], program: Program):
     """
     Splits given expressions on all random variables
     """
-    variables = program.variables.copy()
-    for var in variables:
+    for var in program.variables:
         if program.updates[var].is_random_var and not hasattr(program.updates[var], "branches"):
             expressions = split_expressions_on_rv(expressions, var, program)
     return expressions
@@ -127,31 +126,103 @@ def split_expressions_on_rv(expressions: [Case], rv: Symbol, program: Program):
         1. rv is replaced by a random variable with only negative support
         2. rv is replaced by a random variable with support ranging over 0
         3. rv is replaced by a random variable with support only positive
+    The replacing random variables are taken from the split overlay of the program, so the program is not modified.
     """
-    low, high = program.updates[rv].random_var.get_support()
-    if low > 0 or high < 0:
+    split_vars = get_split_overlay(program).get_split_variables(rv)
+    if not split_vars:
         return expressions
 
-    split_rvs = []
-    epsilon = unique_symbol("eps", real=True, positive=True)
-    split_rvs.append(RandomVar("symbolic-support", (low, -epsilon)))
-    split_rvs.append(RandomVar("symbolic-support", (-epsilon, epsilon)))
-    split_rvs.append(RandomVar("symbolic-support", (epsilon, high)))
-
     cases = []
-    for split_rv in split_rvs:
-        var = unique_symbol("var")
-        update = Update(var)
-        update.is_random_var = True
-        update.random_var = split_rv
-        program.updates[var] = update
-        program.variables.append(var)
-        for expression, _ in expressions:
+    for expression, prob in expressions:
+        if rv not in expression.free_symbols:
+            cases.append((expression, prob))
+            continue
+        for var in split_vars:
             cases.append((expression.xreplace({rv: var}), unique_symbol("p")))
 
     return cases
 
 
+class SplitOverlay:
+    """
+    Holds the random variables introduced by splitting expressions on random variables of a program. They are kept
+    separate from the program, such that the variables and updates of the program never change. The overlay provides
+    the variables and updates of the program together with the split variables.
+    """
+
+    def __init__(self, program: Program):
+        self.program = program
+        self.contains_rvs = program.contains_rvs
+        self.split_variables: Dict[Symbol, List[Symbol]] = {}
+        self.split_updates: Dict[Symbol, Update] = {}
+        self.variables: List[Symbol] = program.variables
+        self.updates: Dict[Symbol, Update] = program.updates
+
+    def get_split_variables(self, rv: Symbol) -> List[Symbol]:
+        """
+        Lazily creates the three random variables rv gets split into. Returns an empty list if rv cannot be
+        both positive and negative.
+        """
+        if rv not in self.split_variables:
+            self.split_variables[rv] = self.__create_split_variables(rv)
+        return self.split_variables[rv]
+
+    def __create_split_variables(self, rv: Symbol) -> List[Symbol]:
+        low, high = self.program.updates[rv].random_var.get_support()
+        if low > 0 or high < 0:
+            return []
+
+        epsilon = unique_symbol("eps", real=True, positive=True)
+        split_rvs = [
+            RandomVar("symbolic-support", (low, -epsilon)),
+            RandomVar("symbolic-support", (-epsilon, epsilon)),
+            RandomVar("symbolic-support", (epsilon, high))
+        ]
+
+        split_vars = []
+        for split_rv in split_rvs:
+            var = unique_symbol("var")
+            update = Update(var)
+            update.is_random_var = True
+            update.random_var = split_rv
+            self.split_updates[var] = update
+            split_vars.append(var)
+
+        self.variables = self.program.variables + list(self.split_updates.keys())
+        self.updates = {**self.program.updates, **self.split_updates}
+        return split_vars
+
+
+__split_overlay: SplitOverlay = None
+
+
+def get_split_overlay(program: Program) -> SplitOverlay:
+    """
+    Returns the split overlay of the given program. The overlay is memoized for the most recent program only.
+    """
+    global __split_overlay
+    if __split_overlay is None or __split_overlay.program is not program:
+        __split_overlay = SplitOverlay(program)
+    return __split_overlay
+
+
+def carry_over_split_overlay(overlay: SplitOverlay, program: Program, rvs: Set[Symbol]) -> SplitOverlay:
+    """
+    Makes a new split overlay for the given program the most recent one. The overlay reuses the split variables which
+    the given overlay (of a previous version of the program) created for the given random variables.
+    """
+    global __split_overlay
+    __split_overlay = SplitOverlay(program)
+    for rv, split_vars in overlay.split_variables.items():
+        if rv in rvs:
+            __split_overlay.split_variables[rv] = split_vars
+            for var in split_vars:
+                __split_overlay.split_updates[var] = overlay.split_updates[var]
+    __split_overlay.variables = program.variables + list(__split_overlay.split_updates.keys())
+    __split_overlay.updates = {**program.updates, **__split_overlay.split_updates}
+    return __split_overlay
+
+
 def combine_expressions(expressions: [Case]) -> [Case]:
     """
     In a given list of expressions with probabilities, combines equal expressions and their probabilities
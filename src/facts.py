@@ -0,0 +1,105 @@
+"""
+This module contains the facts about a program which the proof rules are based on. The facts are shared by all
+rules and every fact gets computed lazily, at most once and only if some rule asks for it.
+"""
+
+from functools import cached_property
+
+from diofant import Expr, expand, simplify, symbols, sympify
+
+from mora.budget import fallback, BudgetExceeded
+from mora.core import Program, get_solution as get_expected, get_recurrence
+from mora.input import LOOP_GUARD_VAR
+from .expression import get_cases_for_expression, split_expressions_on_rvs
+from .invariance import is_invariant
+from .phases import phase, MOMENTS
+from .utils import LOG_ESSENTIAL, log, amber_limit, get_max_0, substitute_deterministic_variables
+
+
+class Facts:
+
+    def __init__(self, program: Program):
+        self.program = program
+        self.__invariance = {}
+
+    @cached_property
+    def loop_guard(self) -> Expr:
+        return sympify(self.program.loop_guard)
+
+    @cached_property
+    def loop_guard_change(self) -> Expr:
+        """
+        E[LG_{n+1} - LG_{n}]
+        """
+        with phase(MOMENTS):
+            return get_loop_guard_change(self.program)
+
+    @cached_property
+    def loop_guard_change_limit(self) -> Expr:
+        n = symbols("n", integer=True, positive=True)
+        return amber_limit(self.loop_guard_change, n)
+
+    @cached_property
+    def loop_guard_change_max_0(self):
+        """
+        The maximum positive 0 of the loop guard change or 0 if it does not exist
+        """
+        n = symbols("n", integer=True, positive=True)
+        return get_max_0(self.loop_guard_change, n)
+
+    @cached_property
+    def martingale_expression(self) -> Expr:
+        with phase(MOMENTS):
+            expression = create_martingale_expression(self.program)
+        log(f"Martingale expression: {expression.as_expr()}", LOG_ESSENTIAL)
+        return expression
+
+    @cached_property
+    def negated_martingale_expression(self) -> Expr:
+        return expand(self.martingale_expression * (-1))
+
+    @cached_property
+    def guard_cases(self):
+        """
+        All possible loop guards after one iteration together with their probabilities, split on random variables
+        """
+        cases = get_cases_for_expression(self.loop_guard, self.program)
+        if self.program.contains_rvs:
+            cases = split_expressions_on_rvs(cases, self.program)
+        return cases
+
+    def is_invariant(self, expression: Expr) -> bool:
+        """
+        Whether the given expression is eventually invariantly <= 0. False if that cannot be decided within the budgets.
+        """
+        if expression not in self.__invariance:
+            try:
+                self.__invariance[expression] = is_invariant(expression, self.program)
+            except BudgetExceeded:
+                fallback("invariance")
+                self.__invariance[expression] = False
+        return self.__invariance[expression]
+
+
+def create_martingale_expression(program: Program):
+    """
+    Creates the martingale expression E(M_{i+1} - M_i | F_i). Also deterministic variables get substituted
+    with their representation in n.
+    """
+    lg = symbols(LOOP_GUARD_VAR).as_poly(program.variables)
+    expected_guard = get_recurrence(program, lg)
+    lg = program.updates[symbols(LOOP_GUARD_VAR)].branches[0][0]
+    expression = expand(expected_guard - lg).as_expr()
+    expression = substitute_deterministic_variables(expression, program)
+    return simplify(expression)
+
+
+def get_loop_guard_change(program: Program):
+    """
+    Returns E[LG_{n+1} - LG_{n}]
+    """
+    n = symbols("n", integer=True, positive=True)
+    lg = sympify(LOOP_GUARD_VAR).as_poly(program.variables)
+    expected_lg = get_expected(program, lg)
+    expected_lg_plus = expected_lg.xreplace({n: n+1})
+    return expand(expected_lg_plus - expected_lg)
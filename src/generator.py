@@ -0,0 +1,87 @@
+"""
+This module generates random Prob-solvable loops of a given size, which allows to measure how Amber scales with the
+number of variables, the degree of the updates, the number of branches, the number of random variables and the degree
+of the loop guard. Every variable is updated by itself plus a polynomial in the random variables and the variables
+updated before it, which keeps the generated loops Prob-solvable.
+"""
+
+import itertools
+from collections import Counter
+from fractions import Fraction
+from random import Random
+from typing import List
+
+# Distributions with bounded support, as the bounds of monomials containing random variables depend on their support
+DISTRIBUTIONS = ["uniform", "bernoulli"]
+
+
+def generate_program(variables: int = 2, degree: int = 1, branches: int = 2, rvs: int = 0, guard_degree: int = 1,
+                     seed: int = 0) -> str:
+    """
+    Returns the source of a random Prob-solvable loop. Every update has the given number of branches and a polynomial
+    part of the given degree. The loop guard is a polynomial of the given degree over the program variables.
+    """
+    rng = Random(seed)
+    names = [f"x{i}" for i in range(1, variables + 1)]
+    rv_names = [f"r{i}" for i in range(1, rvs + 1)]
+
+    lines = [f"{x} = {rng.randint(0, 10)}" for x in names]
+    guard = __polynomial(rng, names, guard_degree, positive=True)
+    lines.append(f"while {guard} < {rng.randint(10, 1000)}:")
+    for r in rv_names:
+        lines.append(f"    {r} = {__random_var(rng)}")
+    for i, x in enumerate(names):
+        readable = rv_names + names[:i]
+        updates = [f"{x} + {__polynomial(rng, readable, degree)}" for _ in range(branches)]
+        lines.append(f"    {x} = {__branches(rng, updates)}")
+    return "\n".join(lines) + "\n"
+
+
+def __random_var(rng: Random) -> str:
+    distribution = rng.choice(DISTRIBUTIONS)
+    if distribution == "uniform":
+        bound = rng.randint(1, 3)
+        return f"RV(uniform, {-bound}, {bound + rng.randint(0, 1)})"
+    return f"RV(bernoulli, {Fraction(rng.randint(1, 3), 4)})"
+
+
+def __polynomial(rng: Random, variables: List[str], degree: int, positive: bool = False) -> str:
+    """
+    Returns a random polynomial over the given variables with a monomial of exactly the given degree (if there are
+    variables) and a constant term
+    """
+    monomials = [m for d in range(1, degree + 1) for m in itertools.combinations_with_replacement(variables, d)]
+    chosen = []
+    if monomials:
+        chosen.append(rng.choice([m for m in monomials if len(m) == degree]))
+        chosen += [m for m in rng.sample(monomials, min(2, len(monomials))) if m not in chosen]
+    terms = [__term(__coefficient(rng, positive), m) for m in chosen]
+    terms.append(str(__coefficient(rng, positive)))
+    return " + ".join(f"({t})" if t.startswith("-") else t for t in terms)
+
+
+def __term(coefficient: int, monomial) -> str:
+    factors = [v if k == 1 else f"{v}**{k}" for v, k in Counter(monomial).items()]
+    if abs(coefficient) != 1:
+        factors.insert(0, str(abs(coefficient)))
+    term = "*".join(factors)
+    return f"-{term}" if coefficient < 0 else term
+
+
+def __coefficient(rng: Random, positive: bool) -> int:
+    coefficient = rng.randint(1, 3)
+    if not positive and rng.random() < 0.5:
+        coefficient = -coefficient
+    return coefficient
+
+
+def __branches(rng: Random, updates: List[str]) -> str:
+    """
+    Joins the updates into branches with random probabilities. The last branch gets the remaining probability.
+    """
+    if len(updates) == 1:
+        return updates[0]
+    weights = [rng.randint(1, 4) for _ in updates]
+    probabilities = [Fraction(w, sum(weights)) for w in weights]
+    branches = [f"{u} @ {p}" for u, p in zip(updates[:-1], probabilities[:-1])]
+    return "; ".join(branches + [updates[-1]])
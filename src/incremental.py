@@ -0,0 +1,153 @@
+"""
+This module contains sessions for analyzing a program repeatedly while it gets edited. After every analysis the
+session keeps the stores of MORA, the branch store and the bound store. When the next version of the program gets
+analyzed, only the entries involving variables affected by the edit are dropped, all others are reused.
+
+A variable is affected by an edit if its update changed or if it (transitively) depends on a variable whose update
+changed. Recurrences, branches and cases only depend on the updates. Moments, bounds and initial polarities also
+depend on the initial values, hence they are additionally dropped for variables depending on changed initial values.
+"""
+
+from typing import Dict, Set
+
+from diofant import Symbol, sympify
+
+import mora.core
+from mora.core import Program
+from mora.utils import Update
+from . import branch_store, bound_store
+from .decission import decide_termination
+from .expression import SplitOverlay, get_split_overlay, carry_over_split_overlay
+from .result import Result
+from .slicing import slice_program
+
+
+class Session:
+    """
+    Analyses successive versions of a program, reusing the stores of the previous analysis
+    """
+
+    def __init__(self):
+        self.program: Program = None
+        self.overlay: SplitOverlay = None
+        self.stores: Dict[str, Dict] = {}
+        # Number of reused and dropped entries of the last analysis
+        self.reused = 0
+        self.dropped = 0
+
+    def analyze(self, program: Program) -> Result:
+        program = slice_program(program).program
+        if self.program is None:
+            result = decide_termination(program)
+        else:
+            self.__restore_stores(program)
+            result = decide_termination(program, reset_stores=False)
+        self.program = program
+        self.overlay = get_split_overlay(program)
+        self.stores = {
+            "solutions": mora.core.solution_store,
+            "recurrences": mora.core.recurrence_store,
+            "exp_polys": mora.core.exp_poly_store,
+            "branches": branch_store.store,
+            "cases": branch_store.case_store,
+            "initial_values": branch_store.initial_value_store,
+            "bounds": bound_store.store,
+        }
+        return result
+
+    def __restore_stores(self, program: Program):
+        changed_updates, changed_initial_values = get_changed_variables(self.program, program)
+        update_affected = get_descendants(changed_updates, self.program) | get_descendants(changed_updates, program)
+        affected = update_affected | get_descendants(changed_initial_values, self.program) | \
+            get_descendants(changed_initial_values, program)
+        # Recurrences, branches and cases are polynomials over the program variables and only stay valid as long as
+        # the program variables stay the same
+        if [str(v) for v in self.program.variables] != [str(v) for v in program.variables]:
+            update_affected = {str(v) for v in self.program.variables + program.variables}
+        self.reused = 0
+        self.dropped = 0
+
+        mora.core.reset_mora()
+        mora.core.solution_store.update(self.__kept("solutions", affected))
+        mora.core.recurrence_store.update(self.__kept("recurrences", update_affected))
+        mora.core.exp_poly_store.update(self.__kept("exp_polys", affected))
+
+        branch_store.set_program(program)
+        branch_store.store.update(self.__kept("branches", update_affected))
+        branch_store.case_store.update(self.__kept("cases", update_affected))
+        branch_store.initial_value_store.update(self.__kept("initial_values", affected))
+
+        # The split variables of unaffected random variables are reused, such that bounds involving them stay valid
+        unaffected_rvs = {rv for rv in self.overlay.split_variables if str(rv) not in affected}
+        overlay = carry_over_split_overlay(self.overlay, program, unaffected_rvs)
+        split_origins = {str(var): str(rv) for rv, split_vars in overlay.split_variables.items() for var in split_vars}
+        bound_store.set_program(program)
+        for expression, bounds in self.stores["bounds"].items():
+            names = {split_origins.get(str(s), str(s)) for s in expression.as_expr().free_symbols}
+            if names & affected or not names <= set(split_origins.values()) | {str(v) for v in program.variables}:
+                self.dropped += 1
+                continue
+            self.reused += 1
+            bounds.expression = expression.as_expr().as_poly(overlay.variables)
+            bound_store.store[bounds.expression] = bounds
+
+    def __kept(self, store: str, affected: Set[str]) -> Dict:
+        kept = {}
+        for key, value in self.stores[store].items():
+            if {str(s) for s in sympify(key).free_symbols} & affected:
+                self.dropped += 1
+            else:
+                self.reused += 1
+                kept[key] = value
+        return kept
+
+
+def get_changed_variables(old: Program, new: Program) -> (Set[str], Set[str]):
+    """
+    Returns the names of the variables whose updates changed and the names of the variables whose initial values
+    changed. Variables only occurring in one of the programs count as changed in both respects.
+    """
+    old_variables = {str(v): v for v in old.variables}
+    new_variables = {str(v): v for v in new.variables}
+    changed_updates = set(old_variables.keys()) ^ set(new_variables.keys())
+    changed_initial_values = set(changed_updates)
+    for name in set(old_variables.keys()) & set(new_variables.keys()):
+        old_v, new_v = old_variables[name], new_variables[name]
+        if __update_text(old.updates[old_v]) != __update_text(new.updates[new_v]):
+            changed_updates.add(name)
+        if __update_text(old.initial_values.get(old_v)) != __update_text(new.initial_values.get(new_v)):
+            changed_initial_values.add(name)
+    return changed_updates, changed_initial_values
+
+
+def get_descendants(names: Set[str], program: Program) -> Set[str]:
+    """
+    Returns the given variables together with all variables of the program whose updates transitively read them
+    """
+    reads = {str(v): {str(s) for s in __update_symbols(program.updates[v])} for v in program.variables}
+    descendants = set(names)
+    changed = True
+    while changed:
+        changed = False
+        for v, read in reads.items():
+            if v not in descendants and read & descendants:
+                descendants.add(v)
+                changed = True
+    return descendants
+
+
+def __update_symbols(update: Update) -> Set[Symbol]:
+    if update.is_random_var:
+        parameters = update.random_var.parameters
+        expressions = [p for ps in parameters for p in (ps if isinstance(ps, tuple) else [ps])]
+    else:
+        expressions = [e for branch in update.branches for e in branch]
+    return {s for e in expressions for s in sympify(e).free_symbols}
+
+
+def __update_text(update: Update) -> str:
+    if update is None:
+        return ""
+    if update.is_random_var:
+        return f"RV({update.random_var.distribution}, {update.random_var.parameters})"
+    return str(update.branches)
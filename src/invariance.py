@@ -33,12 +33,12 @@ def is_deterministic_invariant(expression: Expr) -> bool:
 
 def is_probabilistic_invariant(expression: Expr, program: Program) -> bool:
     """
-    Tries several strategies to determine if a given expression eventually stays <= 0
+    Tries several strategies to determine if a given expression eventually stays <= 0. If none of them succeeds, the
+    expression is not known to be invariant and False is returned. This is also the case if the bounds are trivial
+    because some operation exceeded its budget.
     """
     answer = __is_probabilistic_invariant_via_bounds(expression)
-    if answer.is_known():
-        return answer.is_true()
-    raise NotImplemented()
+    return answer.is_true()
 
 
 def __is_probabilistic_invariant_via_bounds(expression: Expr) -> Answer:
@@ -0,0 +1,67 @@
+"""
+This module reports the memory an analysis uses: the peak memory allocated in every phase (including every rule), the
+entries and estimated bytes of every store, the size of the pool of interned expressions and histograms of the sizes of
+the stored closed forms and bounds. The size of an expression is its number of nodes, such that swollen expressions
+show up in the upper buckets.
+"""
+
+from typing import Dict, Iterable
+
+from diofant import preorder_traversal, sympify
+
+import mora.core
+import mora.intern
+from mora.cache import store_sizes
+from . import bound_store
+
+
+class MemoryReport:
+
+    def __init__(self, phases: Dict[str, int]):
+        self.phases = phases
+        self.stores = store_sizes()
+        self.interned = {"expressions": mora.intern.pool_size(), "shared": mora.intern.shared}
+        self.histograms = get_stored_expression_histograms()
+
+    def as_dict(self):
+        return {"phases": self.phases, "stores": self.stores, "interned": self.interned, "histograms": self.histograms}
+
+    def print(self):
+        phases = ", ".join([f"{p} {round(m / 2 ** 20, 2)}MiB" for p, m in self.phases.items()])
+        print(f"Peak memory per phase: {phases}")
+        for name, sizes in self.stores.items():
+            print(f"Store {name}: {sizes['entries']} entries, {sizes['bytes']} bytes, {sizes['evictions']} evictions")
+        print(f"Interned expressions: {self.interned['expressions']}, shared {self.interned['shared']} times")
+        for name, histogram in self.histograms.items():
+            buckets = ", ".join([f"<={size}: {count}" for size, count in histogram.items()])
+            print(f"Nodes of stored {name}: {buckets or 'none'}")
+
+
+def node_count(expression) -> int:
+    return sum(1 for _ in preorder_traversal(sympify(expression).as_expr()))
+
+
+def get_node_count_histogram(expressions: Iterable) -> Dict[int, int]:
+    """
+    Counts the expressions per number of nodes, in buckets of powers of two. A bucket contains the expressions
+    with at most its number of nodes, but more than the number of nodes of the previous bucket.
+    """
+    histogram = {}
+    for expression in expressions:
+        count = node_count(expression)
+        bucket = 1
+        while bucket < count:
+            bucket *= 2
+        histogram[bucket] = histogram.get(bucket, 0) + 1
+    return dict(sorted(histogram.items()))
+
+
+def get_stored_expression_histograms() -> Dict[str, Dict[int, int]]:
+    """
+    Returns the node count histograms of the closed forms in the solution store and of the bounds in the bound store
+    """
+    bounds = [b for bounds in bound_store.store.values() for b in (bounds.lower, bounds.upper)]
+    return {
+        "solutions": get_node_count_histogram(mora.core.solution_store.values()),
+        "bounds": get_node_count_histogram(bounds),
+    }
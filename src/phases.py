@@ -0,0 +1,185 @@
+"""
+This module keeps track of the phase the analysis is currently in (e.g. parse, moments, bounds or a rule).
+Phases can be nested. Only the innermost phase is running, the outer phases are suspended until the inner phase
+ends. Listeners get notified whenever a phase starts or stops running, which allows to e.g. time phases exclusively.
+"""
+
+import time
+import tracemalloc
+from contextlib import contextmanager
+from functools import wraps
+from typing import Dict
+
+PARSE = "parse"
+MOMENTS = "moments"
+BOUNDS = "bounds"
+RULES = "rules"
+
+
+class PhaseListener:
+    """
+    Base class for objects which want to be notified about running phases
+    """
+
+    def start(self, phase: str):
+        pass
+
+    def stop(self, phase: str):
+        pass
+
+
+__stack = []
+__listeners = []
+
+
+def add_listener(listener: PhaseListener):
+    global __listeners
+    __listeners.append(listener)
+
+
+def remove_listener(listener: PhaseListener):
+    global __listeners
+    __listeners.remove(listener)
+
+
+def rule_phase(rule) -> str:
+    """
+    Returns the name of the phase in which a given rule runs
+    """
+    return f"{RULES}.{type(rule).__name__}"
+
+
+def phase_group(phase: str) -> str:
+    """
+    Returns the top-level phase a phase belongs to, e.g. 'rules' for 'rules.RankingSMRule'
+    """
+    return phase.split(".")[0]
+
+
+@contextmanager
+def phase(name: str):
+    """
+    Context manager running the enclosed code in the given phase. Entering the phase which is already running
+    has no effect, such that recursive functions can declare their phase.
+    """
+    global __stack, __listeners
+    if __stack and __stack[-1] == name:
+        yield
+        return
+
+    if __stack:
+        __notify_stop(__stack[-1])
+    __stack.append(name)
+    __notify_start(name)
+    try:
+        yield
+    finally:
+        __stack.pop()
+        __notify_stop(name)
+        if __stack:
+            __notify_start(__stack[-1])
+
+
+def in_phase(name: str):
+    """
+    Decorator running the decorated function in the given phase
+    """
+    def decorator(function):
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            with phase(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def __notify_start(name: str):
+    for listener in __listeners:
+        listener.start(name)
+
+
+def __notify_stop(name: str):
+    for listener in __listeners:
+        listener.stop(name)
+
+
+class PhaseTimer(PhaseListener):
+    """
+    Measures the time spent in every phase. Time spent in nested phases is not counted for the outer phase.
+    """
+
+    def __init__(self):
+        self.times: Dict[str, float] = {}
+        self.__started = {}
+
+    def start(self, phase: str):
+        self.__started[phase] = time.perf_counter()
+
+    def stop(self, phase: str):
+        if phase not in self.__started:
+            return
+        elapsed = time.perf_counter() - self.__started.pop(phase)
+        self.times[phase] = self.times.get(phase, 0) + elapsed
+
+    def grouped_times(self) -> Dict[str, float]:
+        """
+        Returns the times summed up per top-level phase
+        """
+        result = {}
+        for p, t in self.times.items():
+            result[phase_group(p)] = result.get(phase_group(p), 0) + t
+        return result
+
+    def __enter__(self):
+        add_listener(self)
+        return self
+
+    def __exit__(self, *exc):
+        remove_listener(self)
+
+
+class PhaseMemory(PhaseListener):
+    """
+    Measures the peak of the memory allocated by Python (via tracemalloc) while every phase is running, relative to
+    the memory allocated when the phase started running. Tracing gets started when entering the context if necessary.
+    Without tracemalloc.reset_peak (before Python 3.9) only the memory allocated at the end of a phase is measured.
+    """
+
+    def __init__(self):
+        self.peaks: Dict[str, int] = {}
+        self.__started = {}
+        self.__tracing = False
+
+    def start(self, phase: str):
+        if hasattr(tracemalloc, "reset_peak"):
+            tracemalloc.reset_peak()
+        self.__started[phase] = tracemalloc.get_traced_memory()[0]
+
+    def stop(self, phase: str):
+        if phase not in self.__started:
+            return
+        current, peak = tracemalloc.get_traced_memory()
+        if not hasattr(tracemalloc, "reset_peak"):
+            peak = current
+        self.peaks[phase] = max(self.peaks.get(phase, 0), peak - self.__started.pop(phase))
+
+    def grouped_peaks(self) -> Dict[str, int]:
+        """
+        Returns the largest peak per top-level phase
+        """
+        result = {}
+        for p, peak in self.peaks.items():
+            result[phase_group(p)] = max(result.get(phase_group(p), 0), peak)
+        return result
+
+    def __enter__(self):
+        self.__tracing = not tracemalloc.is_tracing()
+        if self.__tracing:
+            tracemalloc.start()
+        add_listener(self)
+        return self
+
+    def __exit__(self, *exc):
+        remove_listener(self)
+        if self.__tracing:
+            tracemalloc.stop()
@@ -0,0 +1,83 @@
+"""
+This module contains a phase listener which profiles every phase of the analysis separately with cProfile.
+Moreover, it summarizes the number of calls and the cumulative time of the key symbolic primitives.
+"""
+
+import cProfile
+import os
+import pstats
+from typing import Dict, List, Tuple
+
+from diofant import limit, summation, solve, simplify, expand
+from mora.core import get_solution
+from . import bound_store
+from .phases import PhaseListener
+from .utils import amber_limit
+
+PRIMITIVES = {
+    "amber_limit": amber_limit,
+    "limit": limit,
+    "summation": summation,
+    "solve": solve,
+    "simplify": simplify,
+    "expand": expand,
+    "get_solution": get_solution,
+    "get_bounds_of_expr": bound_store.get_bounds_of_expr,
+}
+
+
+class PhaseProfiler(PhaseListener):
+    """
+    Keeps one profile per phase, which is only enabled while the phase is running
+    """
+
+    def __init__(self):
+        self.profiles: Dict[str, cProfile.Profile] = {}
+
+    def start(self, phase: str):
+        if phase not in self.profiles:
+            self.profiles[phase] = cProfile.Profile()
+        self.profiles[phase].enable()
+
+    def stop(self, phase: str):
+        self.profiles[phase].disable()
+
+    def dump(self, directory: str, program_name: str) -> List[str]:
+        """
+        Writes one .pstats file per phase into the given directory and returns their paths
+        """
+        os.makedirs(directory, exist_ok=True)
+        paths = []
+        for phase, profile in self.profiles.items():
+            path = os.path.join(directory, f"{program_name}.{phase}.pstats")
+            profile.dump_stats(path)
+            paths.append(path)
+        return paths
+
+    def primitive_summary(self) -> Dict[str, Tuple[int, float]]:
+        """
+        Returns for every key primitive the number of calls and the cumulative time over all phases
+        """
+        profiles = list(self.profiles.values())
+        summary = {name: (0, 0.0) for name in PRIMITIVES.keys()}
+        if not profiles:
+            return summary
+
+        stats = pstats.Stats(profiles[0])
+        for profile in profiles[1:]:
+            stats.add(profile)
+
+        for name, function in PRIMITIVES.items():
+            code = getattr(function, "__wrapped__", function).__code__
+            key = (code.co_filename, code.co_firstlineno, code.co_name)
+            if key in stats.stats:
+                _, calls, _, cumulative_time, _ = stats.stats[key]
+                summary[name] = (calls, cumulative_time)
+        return summary
+
+    def print_summary(self):
+        summary = self.primitive_summary()
+        name_length = max([len(name) for name in summary.keys()]) + 2
+        print(f"{'Primitive'.ljust(name_length)} {'Calls'.rjust(10)} {'Cumulative time'.rjust(18)}")
+        for name, (calls, cumulative_time) in summary.items():
+            print(f"{name.ljust(name_length)} {str(calls).rjust(10)} {(str(round(cumulative_time, 4)) + 's').rjust(18)}")
@@ -2,32 +2,51 @@
 This module implements the ranking supermartingale proof rule
 """
 
-from diofant import symbols, sympify
+from diofant import symbols, sympify, simplify
 from . import bound_store
-from .invariance import is_invariant
 from .rule import Rule, Result, Witness
-from .utils import get_max_0, Answer, amber_limit
+from .utils import Answer
 from .asymptotics import is_dominating_or_same, Direction
 
 
 class RankingSMRule(Rule):
 
     def is_applicable(self):
+        return bool(self.facts.loop_guard_change_limit < 0 or self.facts.loop_guard_change_max_0 > 0)
+
+    def revalidate(self, result: Result, data):
+        """
+        Only checks that the bound claimed by the witness eventually is at most -1 and still bounds the martingale
+        expression, which then also is invariant
+        """
+        martingale_expression = self.facts.martingale_expression
+        if result.PAST.is_known() or not self.claims_martingale_expression(martingale_expression, data):
+            return result
+
+        bound = data["SM expression bound"]
         n = symbols("n", integer=True, positive=True)
-        lim = amber_limit(self.loop_guard_change, n)
-        max_0 = get_max_0(self.loop_guard_change, n)
-        return bool(lim < 0 or max_0 > 0)
+        if not is_dominating_or_same(bound, sympify(-1), n, direction=Direction.NegInf):
+            return result
+        upper = bound_store.get_bounds_of_expr(martingale_expression).upper
+        if simplify(upper - bound) != 0 and not is_dominating_or_same(upper, bound, n, direction=Direction.NegInf):
+            return result
+
+        result.PAST = Answer.TRUE
+        result.AST = Answer.TRUE
+        result.add_witness(PASTWitness(self.program.loop_guard, martingale_expression, bound))
+        return result
 
     def run(self, result: Result):
         if result.PAST.is_known():
             return result
 
         # Martingale expression has to be <= 0 eventually
-        if not is_invariant(self.martingale_expression, self.program):
+        martingale_expression = self.facts.martingale_expression
+        if not self.facts.is_invariant(martingale_expression):
             return result
 
         # To be ranking martingale expression has to eventually decrease more or equal to constant
-        bounds = bound_store.get_bounds_of_expr(self.martingale_expression)
+        bounds = bound_store.get_bounds_of_expr(martingale_expression)
         n = symbols("n", integer=True, positive=True)
         if not is_dominating_or_same(bounds.upper, sympify(-1), n, direction=Direction.NegInf):
             return result
@@ -36,7 +55,7 @@ class RankingSMRule(Rule):
         result.AST = Answer.TRUE
         result.add_witness(PASTWitness(
             self.program.loop_guard,
-            self.martingale_expression,
+            martingale_expression,
             bounds.upper
         ))
 
@@ -5,33 +5,60 @@ This module implements the repulsing supermartingale proof rule
 from diofant import symbols, sympify, simplify
 
 from . import bound_store
-from .asymptotics import is_dominating_or_same, Answer, dominating
-from .expression import get_cases_for_expression, split_expressions_on_rvs
-from .invariance import is_invariant
+from .asymptotics import is_dominating_or_same, Answer, dominating, Direction
+from .bound_store import Bounds
 from .rule import Rule, Result, Witness
-from .utils import amber_limit
 
 
 class RepulsingSMRule(Rule):
 
     def is_applicable(self):
+        return self.facts.loop_guard_change_limit >= 0
+
+    def revalidate(self, result: Result, data):
+        """
+        For a Not AST witness only checks that the claimed epsilons and cs still satisfy the conditions, that the
+        martingale expression still decreases by the epsilons and that some branch still continues the loop with
+        positive probability. The conditions of a Not PAST witness get checked like run does.
+        """
+        martingale_expression = self.facts.negated_martingale_expression
+        if not self.claims_martingale_expression(martingale_expression, data):
+            return result
+        if "Epsilons" not in data:
+            return self.run(result)
+        if result.PAST.is_known() and result.AST.is_known():
+            return result
+
         n = symbols("n", integer=True, positive=True)
-        lim = amber_limit(self.loop_guard_change, n)
-        return lim >= 0
+        epsilons, cs = data["Epsilons"], data["Cs"]
+        if not is_dominating_or_same(sympify(1), epsilons, n) or not is_dominating_or_same(sympify(1), cs, n):
+            return result
+        if is_dominating_or_same(sympify(0), epsilons, n) or not is_dominating_or_same(epsilons, cs, n):
+            return result
+
+        # The martingale expression has to decrease by the epsilons, which makes it invariant
+        upper = bound_store.get_bounds_of_expr(martingale_expression).upper
+        if simplify(upper + epsilons) != 0 and \
+                not is_dominating_or_same(upper, epsilons * -1, n, direction=Direction.NegInf):
+            return result
+        if not any(self.__never_decreases(branch) for branch, _ in self.facts.guard_cases):
+            return result
+
+        result.PAST = Answer.FALSE
+        result.AST = Answer.FALSE
+        result.add_witness(NONASTWitness(self.facts.loop_guard * -1, martingale_expression, epsilons, cs))
+        return result
 
     def run(self, result: Result):
         if result.PAST.is_known() and result.AST.is_known():
             return result
 
-        # Martingale expression has to be <= 0 eventually
-        if not is_invariant(self.martingale_expression, self.program):
+        # Martingale expression of the negated loop guard has to be <= 0 eventually
+        martingale_expression = self.facts.negated_martingale_expression
+        if not self.facts.is_invariant(martingale_expression):
             return result
 
-        branches = get_cases_for_expression(sympify(self.program.loop_guard), self.program)
-        if self.program.contains_rvs:
-            branches = split_expressions_on_rvs(branches, self.program)
-        branches = [simplify(branch - sympify(self.program.loop_guard)) for branch, _ in branches]
-        bounds = [bound_store.get_bounds_of_expr(case) for case in branches]
+        bounds = [self.__get_change_bounds(branch) for branch, _ in self.facts.guard_cases]
 
         # Make sure that there is always a positive probability of having a next iteration
         if all([cb.maybe_negative for cb in bounds]):
@@ -39,7 +66,7 @@ class RepulsingSMRule(Rule):
 
         n = symbols("n", integer=True, positive=True)
         cs = dominating([cb.absolute_upper for cb in bounds], n)
-        epsilons = simplify(bound_store.get_bounds_of_expr(self.martingale_expression).upper * -1)
+        epsilons = simplify(bound_store.get_bounds_of_expr(martingale_expression).upper * -1)
 
         # Epsilons and cs have to be bound by a constant
         if not is_dominating_or_same(sympify(1), epsilons, n):
@@ -52,20 +79,29 @@ class RepulsingSMRule(Rule):
             result.PAST = Answer.FALSE
             result.AST = Answer.FALSE
             result.add_witness(NONASTWitness(
-                sympify(self.program.loop_guard) * -1,
-                self.martingale_expression,
+                self.facts.loop_guard * -1,
+                martingale_expression,
                 epsilons,
                 cs
             ))
         elif is_dominating_or_same(sympify(0), epsilons, n) and is_dominating_or_same(sympify(1), cs, n):
             result.PAST = Answer.FALSE
             result.add_witness(NONPASTWitness(
-                sympify(self.program.loop_guard) * -1,
-                self.martingale_expression
+                self.facts.loop_guard * -1,
+                martingale_expression
             ))
 
         return result
 
+    def __get_change_bounds(self, branch) -> Bounds:
+        return bound_store.get_bounds_of_expr(simplify(branch - self.facts.loop_guard))
+
+    def __never_decreases(self, branch) -> bool:
+        """
+        Whether the branch of LG_{i+1} - LG_i is never negative, such that taking it keeps the loop running
+        """
+        return not self.__get_change_bounds(branch).maybe_negative
+
 
 class NONASTWitness(Witness):
 
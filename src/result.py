@@ -7,6 +7,8 @@ class Result:
         self.PAST = Answer.UNKNOWN
         self.AST = Answer.UNKNOWN
         self.witnesses = []
+        # Statistics about slicing the program to the dependency cone of its loop guard
+        self.slice = None
 
     def all_known(self) -> bool:
         return self.PAST.is_known() and self.AST.is_known()
@@ -14,12 +16,25 @@ class Result:
     def add_witness(self, witness):
         self.witnesses.append(witness)
 
+    def as_dict(self):
+        """
+        Returns the result as a dictionary only containing strings, which e.g. can be serialized to JSON
+        """
+        return {
+            "PAST": str(self.PAST),
+            "AST": str(self.AST),
+            "witnesses": [w.as_dict() for w in self.witnesses],
+            "slice": self.slice.as_dict() if self.slice else None
+        }
+
     def print(self):
         log("", LOG_ESSENTIAL)
         log("", LOG_ESSENTIAL)
         log(f"PAST: {self.PAST}", LOG_ESSENTIAL)
         log(f"AST: {self.AST}", LOG_ESSENTIAL)
         log("", LOG_ESSENTIAL)
+        if self.slice:
+            self.slice.print()
         log("", LOG_ESSENTIAL)
         for witness in self.witnesses:
             witness.print()
@@ -0,0 +1,186 @@
+"""
+This module contains a persistent cache of analysis results. Entries are keyed by the canonical hash of a program,
+such that programs which are equal up to renaming of variables, formatting and the order of independent updates
+share their entries. Next to the result and its witnesses the moments and bounds computed during the analysis are
+cached, which get renamed to the variables of the program at hand when an entry is used. Without a directory the cache
+only lives in memory, e.g. to share the entries between the requests of a server or the programs of a batch.
+"""
+
+import os
+import pickle
+import re
+import tempfile
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from diofant import Expr, sympify
+
+import mora.core
+from mora.core import Program
+from . import bound_store
+from .bound_store import Bounds
+from .canonical import CanonicalProgram, canonical_form
+from .decission import decide_termination
+from .expression import get_split_overlay
+from .result import Result
+from .slicing import SliceStatistics
+
+
+class CacheEntry:
+
+    def __init__(self, canonical: CanonicalProgram, result: Result, solutions: Dict, bounds: Dict):
+        self.canonical = canonical
+        self.result = result
+        self.solutions = solutions
+        self.bounds = bounds
+
+
+class ResultCache:
+    """
+    Results stored as one pickle file per canonical hash in the given directory. Loaded entries are kept in memory.
+    If max_entries is given, the least recently used entries are dropped from memory (but not from the directory).
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_entries: Optional[int] = None):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.entries: Dict[str, CacheEntry] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def get(self, program: Program) -> Optional[Result]:
+        """
+        Returns the cached result for the given program with all variables renamed to the ones of the program.
+        Also the stores of mora and the bound store get filled with the cached moments and bounds.
+        """
+        canonical = canonical_form(program)
+        entry = self.__load(canonical.hash)
+        if entry is None or entry.canonical.text != canonical.text:
+            self.misses += 1
+            return None
+        self.hits += 1
+
+        variables = {str(v): v for v in program.variables}
+        renaming = {old: variables[new] for old, new in entry.canonical.renaming_to(canonical).items()}
+        mora.core.reset_mora()
+        for monomial, solution in entry.solutions.items():
+            mora.core.solution_store[self.__renamed(monomial, renaming)] = solution
+        bound_store.set_program(program)
+        overlay_variables = get_split_overlay(program).variables
+        for expression, bounds in entry.bounds.items():
+            renamed = self.__renamed_bounds(bounds, renaming, overlay_variables)
+            bound_store.store[renamed.expression] = renamed
+        return self.__renamed_result(entry.result, renaming)
+
+    def put(self, program: Program, result: Result):
+        """
+        Stores the result of the given program together with the current stores of mora and of the bound store
+        """
+        canonical = canonical_form(program)
+        names = {str(v) for v in program.variables} | {"n"} | {str(s) for s in self.__constants(program)}
+        solutions = dict(mora.core.solution_store)
+        # Bounds involving split variables or their epsilons are not cached, as these symbols are unique per run
+        bounds = {e: b for e, b in bound_store.store.items()
+                  if all(str(s) in names for s in self.__free_symbols(b))}
+        entry = CacheEntry(canonical, result, solutions, bounds)
+        self.__keep(canonical.hash, entry)
+        if self.directory is None:
+            return
+
+        handle, path = tempfile.mkstemp(dir=self.directory)
+        with os.fdopen(handle, "wb") as file:
+            pickle.dump(entry, file)
+        os.replace(path, self.__path(canonical.hash))
+
+    def decide_termination(self, program: Program) -> Result:
+        """
+        Returns the cached result of the program or decides termination and caches the result
+        """
+        result = self.get(program)
+        if result is None:
+            result = decide_termination(program)
+            self.put(program, result)
+        return result
+
+    def __load(self, key: str) -> Optional[CacheEntry]:
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            return self.entries[key]
+        if self.directory is None:
+            return None
+        path = self.__path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "rb") as file:
+                entry = pickle.load(file)
+        except Exception:
+            return None
+        self.__keep(key, entry)
+        return entry
+
+    def __keep(self, key: str, entry: CacheEntry):
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        if self.max_entries is not None:
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def __path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.pickle")
+
+    @staticmethod
+    def __constants(program: Program):
+        constants = set()
+        for update in list(program.updates.values()) + list(program.initial_values.values()):
+            if update.is_random_var:
+                parameters = update.random_var.parameters
+                expressions = [p for ps in parameters for p in (ps if isinstance(ps, tuple) else [ps])]
+            else:
+                expressions = [e for branch in update.branches for e in branch]
+            for e in expressions:
+                constants |= sympify(e).free_symbols
+        return constants - set(program.variables)
+
+    @staticmethod
+    def __free_symbols(bounds: Bounds):
+        return bounds.expression.as_expr().free_symbols | sympify(bounds.lower).free_symbols | \
+            sympify(bounds.upper).free_symbols
+
+    @staticmethod
+    def __renamed(expression: Expr, renaming: Dict) -> Expr:
+        expression = sympify(expression)
+        return expression.xreplace({s: renaming[str(s)] for s in expression.free_symbols if str(s) in renaming})
+
+    @staticmethod
+    def __renamed_bounds(bounds: Bounds, renaming: Dict, variables) -> Bounds:
+        renamed = Bounds()
+        renamed.expression = ResultCache.__renamed(bounds.expression.as_expr(), renaming).as_poly(variables)
+        renamed.lower = ResultCache.__renamed(bounds.lower, renaming)
+        renamed.upper = ResultCache.__renamed(bounds.upper, renaming)
+        renamed.maybe_positive = bounds.maybe_positive
+        renamed.maybe_negative = bounds.maybe_negative
+        return renamed
+
+    @staticmethod
+    def __renamed_result(result: Result, renaming: Dict) -> Result:
+        """
+        Returns a copy of the result where the variables in all witnesses are renamed
+        """
+        names = {old: str(new) for old, new in renaming.items() if old != str(new)}
+        pattern = re.compile(r"\b(" + "|".join(map(re.escape, sorted(names, key=len, reverse=True))) + r")\b")
+        renamed = Result()
+        renamed.PAST = result.PAST
+        renamed.AST = result.AST
+        if result.slice:
+            renamed.slice = SliceStatistics(result.slice.variables, [names.get(v, v) for v in result.slice.removed])
+        for witness in result.witnesses:
+            copy = witness.__class__.__new__(witness.__class__)
+            copy.__dict__.update(witness.__dict__)
+            copy.data = {key: ResultCache.__renamed(value, renaming) for key, value in witness.data.items()}
+            if names:
+                copy.explanation = pattern.sub(lambda m: names[m.group(1)], witness.explanation)
+            renamed.add_witness(copy)
+        return renamed
@@ -3,18 +3,20 @@ This module contains implementations common to all termination proof rules
 """
 
 from abc import ABC, abstractmethod
-from diofant import Expr
-from mora.core import Program
+from typing import Dict
+
+from diofant import Expr, simplify
+
+from .facts import Facts
 from .result import Result
 from .utils import log, LOG_ESSENTIAL
 
 
 class Rule(ABC):
 
-    def __init__(self, loop_guard_change: Expr, martingale_expression: Expr, program: Program):
-        self.loop_guard_change = loop_guard_change
-        self.martingale_expression = martingale_expression
-        self.program = program
+    def __init__(self, facts: Facts):
+        self.facts = facts
+        self.program = facts.program
 
     @abstractmethod
     def is_applicable(self) -> bool: pass
@@ -22,6 +24,20 @@ class Rule(ABC):
     @abstractmethod
     def run(self, result: Result) -> Result: pass
 
+    def revalidate(self, result: Result, data: Dict[str, Expr]) -> Result:
+        """
+        Checks only the conditions claimed by the data of a witness the rule found before, skipping the applicability
+        check. Returns the result updated like run does if the conditions still hold and the unchanged result
+        otherwise. By default the rule just runs again.
+        """
+        return self.run(result)
+
+    def claims_martingale_expression(self, martingale_expression: Expr, data: Dict[str, Expr]) -> bool:
+        """
+        Whether the martingale expression of a witness is the one of the program
+        """
+        return simplify(martingale_expression - data["SM expression"]) == 0
+
 
 class Witness(ABC):
 
@@ -30,6 +46,16 @@ class Witness(ABC):
         self.data = {}
         self.explanation = ""
 
+    def as_dict(self):
+        """
+        Returns the witness as a dictionary only containing strings, which e.g. can be serialized to JSON
+        """
+        return {
+            "kind": self.kind,
+            "data": {key: str(value) for key, value in self.data.items()},
+            "explanation": self.explanation
+        }
+
     def print(self):
         headline = f"Witness for {self.kind}"
         log(headline, LOG_ESSENTIAL)
@@ -0,0 +1,264 @@
+"""
+This module implements a long-running analysis server. Requests and responses are JSON-RPC 2.0 messages, one per line,
+either over stdin/stdout or over a local unix socket. Programs get analyzed in a pool of worker processes which have
+all imports loaded and the grammar constructed already. Caches (e.g. limits and results) persist across requests.
+Every worker keeps the results, moments and bounds of its analyses keyed by the canonical hash of the programs, such
+that programs equal up to renaming of variables reuse them in later requests.
+
+Example request:
+{"jsonrpc": "2.0", "id": 1, "method": "decide_termination", "params": {"source": "x = 0\\nwhile x < 10:\\n    x = x + 1"}}
+"""
+
+import json
+import os
+import socketserver
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, Future
+from typing import Optional
+
+from mora.budget import set_budgets
+from mora.cache import set_limits, store_sizes
+from mora.metrics import get_metrics
+from mora.input import get_lark_parser
+from mora.utils import set_log_level as set_mora_log_level, LOG_NOTHING as MORA_LOG_NOTHING
+from . import result_cache
+from .api import analyze
+from .utils import set_log_level, LOG_NOTHING
+
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+ANALYSIS_ERROR = -32000
+
+WARM_UP_SOURCE = "x = 0\nwhile x < 1:\n    x = x + 1 @ 1/2; x\n"
+
+# The results, moments and bounds of the analyses of the worker process by canonical hash
+worker_results: Optional[result_cache.ResultCache] = None
+
+
+def initialize_worker(max_store_entries=None, max_store_bytes=None, operation_seconds=None, operation_max_size=None,
+                      cache_size=None):
+    """
+    Prepares a worker process: silences all logging, bounds the stores and the symbolic operations, constructs the
+    grammar and runs a tiny analysis, such that all lazily loaded modules are loaded before the first request arrives
+    """
+    global worker_results
+    worker_results = result_cache.ResultCache(max_entries=cache_size)
+    set_limits(max_store_entries, max_store_bytes)
+    set_budgets(operation_seconds, operation_max_size)
+    set_mora_log_level(MORA_LOG_NOTHING)
+    set_log_level(LOG_NOTHING)
+    get_lark_parser()
+    analyze_source(WARM_UP_SOURCE, "warm_up")
+
+
+def analyze_source(source: str, name: str, memory: bool = False):
+    """
+    Parses and analyzes a program given as source text. Returns the result as a dictionary.
+    """
+    return analyze(source, name, memory, worker_results).as_dict()
+
+
+class ResultCache:
+    """
+    Bounded cache of analysis results keyed by the program source. Evicts the least recently used result.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.results = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, source: str):
+        with self.lock:
+            if source not in self.results:
+                return None
+            self.results.move_to_end(source)
+            return self.results[source]
+
+    def put(self, source: str, result):
+        with self.lock:
+            self.results[source] = result
+            self.results.move_to_end(source)
+            while len(self.results) > self.max_size:
+                self.results.popitem(last=False)
+
+
+class Server:
+    """
+    Dispatches JSON-RPC requests to a pool of warm worker processes
+    """
+
+    def __init__(self, workers: int = 1, cache_size: int = 1024, max_store_entries: int = None,
+                 max_store_bytes: int = None, operation_seconds: float = None, operation_max_size: int = None,
+                 memory: bool = False):
+        self.pool = ProcessPoolExecutor(max_workers=workers, initializer=initialize_worker,
+                                        initargs=(max_store_entries, max_store_bytes, operation_seconds,
+                                                  operation_max_size, cache_size))
+        # Start all workers right away, such that they are warm when the first request arrives
+        for f in [self.pool.submit(os.getpid) for _ in range(workers)]:
+            f.result()
+        self.cache = ResultCache(cache_size)
+        # Whether the results report the memory used by the analyses
+        self.memory = memory
+        self.running = {}
+        # Reentrant, because callbacks of already finished analyses run immediately in the thread adding them
+        self.lock = threading.RLock()
+        self.requests = 0
+        self.cache_hits = 0
+
+    def handle_line(self, line: str) -> Future:
+        """
+        Handles a single request line. Returns a future of the response message.
+        """
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError as e:
+            return self.__error(None, PARSE_ERROR, str(e))
+
+        if not isinstance(request, dict) or "method" not in request:
+            return self.__error(None, INVALID_REQUEST, "Request has to be an object with a method")
+
+        request_id = request.get("id")
+        params = request.get("params", {})
+        method = request["method"]
+        if method == "decide_termination":
+            return self.__decide_termination(request_id, params)
+        if method == "stats":
+            return self.__response(request_id, {
+                "requests": self.requests,
+                "cache_hits": self.cache_hits,
+                "cached_results": len(self.cache.results)
+            })
+        if method == "store_sizes":
+            return self.__from_worker(request_id, store_sizes)
+        if method == "metrics":
+            return self.__from_worker(request_id, get_metrics)
+        return self.__error(request_id, METHOD_NOT_FOUND, f"Unknown method {method}")
+
+    def __from_worker(self, request_id, report) -> Future:
+        """
+        Responds with the given report (e.g. the sizes of the stores or the metrics) of a single, arbitrary worker, as
+        seen after the last analysis it ran. The reports are not aggregated across workers, hence with several workers
+        the metrics (counted over the lifetime of the worker) of successive requests may go down as well as up.
+        """
+        response = Future()
+        result = self.pool.submit(report)
+        result.add_done_callback(lambda f: response.set_result(self.__response_message(request_id, f.result())))
+        return response
+
+    def __decide_termination(self, request_id, params) -> Future:
+        if not isinstance(params, dict) or not isinstance(params.get("source"), str):
+            return self.__error(request_id, INVALID_PARAMS, "Parameter 'source' is required")
+
+        source = params["source"]
+        name = params.get("name", "from_text")
+        with self.lock:
+            self.requests += 1
+            cached = self.cache.get(source)
+            if cached is not None:
+                self.cache_hits += 1
+                return self.__response(request_id, {**cached, "name": name, "cached": True})
+
+            # Identical programs which are currently analyzed share the running analysis
+            analysis = self.running.get(source)
+            if analysis is None:
+                analysis = self.pool.submit(analyze_source, source, name, self.memory)
+                self.running[source] = analysis
+                analysis.add_done_callback(lambda f: self.__finish_analysis(source, f))
+            else:
+                self.cache_hits += 1
+
+        response = Future()
+
+        def done(future: Future):
+            try:
+                result = future.result()
+            except Exception as e:
+                response.set_result(self.__error_message(request_id, ANALYSIS_ERROR, str(e)))
+                return
+            response.set_result(self.__response_message(request_id, {**result, "name": name, "cached": False}))
+
+        analysis.add_done_callback(done)
+        return response
+
+    def __finish_analysis(self, source: str, analysis: Future):
+        with self.lock:
+            self.running.pop(source, None)
+            if analysis.exception() is None:
+                self.cache.put(source, analysis.result())
+
+    def __response(self, request_id, result) -> Future:
+        future = Future()
+        future.set_result(self.__response_message(request_id, result))
+        return future
+
+    def __error(self, request_id, code, message) -> Future:
+        future = Future()
+        future.set_result(self.__error_message(request_id, code, message))
+        return future
+
+    @staticmethod
+    def __response_message(request_id, result):
+        return {"jsonrpc": "2.0", "id": request_id, "result": result}
+
+    @staticmethod
+    def __error_message(request_id, code, message):
+        return {"jsonrpc": "2.0", "id": request_id, "error": {"code": code, "message": message}}
+
+    def shutdown(self):
+        self.pool.shutdown()
+
+
+def serve_stdio(server: Server, input_stream=sys.stdin, output_stream=sys.stdout):
+    """
+    Reads requests line by line from the input stream and writes every response as a line to the output stream as
+    soon as it is ready. Therefore, responses can arrive in a different order than the requests.
+    """
+    lock = threading.Lock()
+    pending = []
+
+    def write(future: Future):
+        with lock:
+            output_stream.write(json.dumps(future.result()) + "\n")
+            output_stream.flush()
+
+    for line in input_stream:
+        if not line.strip():
+            continue
+        response = server.handle_line(line)
+        response.add_done_callback(write)
+        pending.append(response)
+
+    for response in pending:
+        response.result()
+
+
+def serve_unix_socket(server: Server, path: str):
+    """
+    Accepts connections on a unix socket. Every connection can send any number of requests, one per line.
+    The responses for a connection are written in the order of its requests.
+    """
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            for line in self.rfile:
+                line = line.decode()
+                if not line.strip():
+                    continue
+                response = server.handle_line(line).result()
+                self.wfile.write((json.dumps(response) + "\n").encode())
+                self.wfile.flush()
+
+    class ThreadingUnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+
+    if os.path.exists(path):
+        os.remove(path)
+    with ThreadingUnixServer(path, Handler) as socket_server:
+        try:
+            socket_server.serve_forever()
+        finally:
+            os.remove(path)
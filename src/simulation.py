@@ -0,0 +1,262 @@
+"""
+This module contains a Monte Carlo simulator for Prob-solvable loops. A parsed program gets compiled into vectorized
+NumPy functions, such that many independent runs of the program advance in lockstep. Runs whose loop guard fails
+are removed from the simulation. The simulator gives quick empirical statistics about the termination behavior
+and the moments of a program.
+"""
+
+from typing import Dict, List
+
+import numpy as np
+from diofant import Expr, Symbol, lambdify, sympify
+
+from mora.core import Program
+from mora.utils import RandomVar, Update
+from mora.input import LOOP_GUARD_VAR
+
+
+class SimulationResult:
+    """
+    Empirical statistics of a simulation
+    """
+
+    def __init__(self, runs: int, max_iterations: int, iterations: np.ndarray, final_states: Dict[str, np.ndarray]):
+        self.runs = runs
+        self.max_iterations = max_iterations
+        self.iterations = iterations
+        self.final_states = final_states
+
+    @property
+    def terminated(self) -> np.ndarray:
+        """
+        A mask of all runs which terminated within the maximum number of iterations
+        """
+        return self.iterations >= 0
+
+    @property
+    def termination_rate(self) -> float:
+        return float(np.mean(self.terminated))
+
+    def iteration_quantiles(self, quantiles=(0.5, 0.9, 0.99)) -> Dict[float, float]:
+        terminated = self.iterations[self.terminated]
+        if len(terminated) == 0:
+            return {q: float("nan") for q in quantiles}
+        return {q: float(np.quantile(terminated, q)) for q in quantiles}
+
+    @property
+    def mean_iterations(self) -> float:
+        terminated = self.iterations[self.terminated]
+        return float(np.mean(terminated)) if len(terminated) > 0 else float("nan")
+
+    def moments(self, power: int = 1) -> Dict[str, float]:
+        """
+        Sample moments of the variables at the end of all terminated runs. Runs in which a variable without initial
+        value never got assigned are ignored for the moments of that variable.
+        """
+        moments = {}
+        for v, values in self.final_states.items():
+            values = values[self.terminated]
+            values = values[~np.isnan(values)]
+            moments[v] = float(np.mean(values ** power)) if len(values) > 0 else float("nan")
+        return moments
+
+    def as_dict(self):
+        return {
+            "runs": self.runs,
+            "max_iterations": self.max_iterations,
+            "termination_rate": self.termination_rate,
+            "mean_iterations": self.mean_iterations,
+            "iteration_quantiles": {str(q): v for q, v in self.iteration_quantiles().items()},
+            "first_moments": self.moments(1),
+            "second_moments": self.moments(2)
+        }
+
+    def print(self):
+        print(f"Simulated runs: {self.runs} (at most {self.max_iterations} iterations each)")
+        print(f"Termination rate: {round(self.termination_rate, 4)}")
+        print(f"Mean iterations of terminated runs: {round(self.mean_iterations, 4)}")
+        quantiles = ", ".join([f"{q}: {v}" for q, v in self.iteration_quantiles().items()])
+        print(f"Iteration quantiles of terminated runs: {quantiles}")
+        for power in [1, 2]:
+            moments = ", ".join([f"E[{v}^{power}] = {round(m, 4)}" for v, m in self.moments(power).items()])
+            print(f"Final moments: {moments}")
+
+
+class Simulator:
+    """
+    Compiles a program into vectorized NumPy functions. Symbolic constants in the program need to be given values.
+    """
+
+    COMPACTION_RATIO = 0.75
+
+    def __init__(self, program: Program, parameters: Dict[str, float] = None):
+        self.program = program
+        self.parameters = parameters or {}
+        self.variables: List[Symbol] = [v for v in program.variables if str(v) != LOOP_GUARD_VAR]
+        self.updates = [self.__compile_update(program.updates[v]) for v in self.variables]
+        self.guard = None
+        if program.loop_guard:
+            self.guard = self.__compile_expression(sympify(program.loop_guard))
+        self.initializers = [self.__compile_initialization(v) for v in self.variables]
+
+    def run(self, runs: int, max_iterations: int, seed: int = None) -> SimulationResult:
+        """
+        Simulates the given number of independent runs of the program for at most max_iterations iterations.
+        The iteration count of runs which did not terminate is -1.
+        """
+        rng = np.random.default_rng(seed)
+        with np.errstate(all="ignore"):
+            state = [np.zeros(runs) for _ in self.variables]
+            for j, initialize in enumerate(self.initializers):
+                state[j] = initialize(rng, state, runs)
+
+            iterations = np.full(runs, -1, dtype=np.int64)
+            final_states = [np.array(s, copy=True) for s in state]
+            # Indices of the runs the state arrays belong to. Terminated runs are only removed from the state arrays
+            # once enough of them accumulated, until then they are masked out.
+            active_runs = np.arange(runs)
+            alive = np.ones(runs, dtype=bool)
+
+            for i in range(max_iterations + 1):
+                if self.guard is not None:
+                    keep = (self.guard(*state) > 0) & alive
+                    done = alive & ~keep
+                    if np.any(done):
+                        iterations[active_runs[done]] = i
+                        for final_state, s in zip(final_states, state):
+                            final_state[active_runs[done]] = s[done]
+                    alive = keep
+                    alive_count = np.count_nonzero(alive)
+                    if alive_count == 0:
+                        break
+                    if alive_count <= self.COMPACTION_RATIO * len(active_runs):
+                        active_runs = active_runs[alive]
+                        state = [s[alive] for s in state]
+                        alive = np.ones(len(active_runs), dtype=bool)
+                if i == max_iterations:
+                    break
+
+                size = len(active_runs)
+                for j, update in enumerate(self.updates):
+                    state[j] = update(rng, state, size)
+
+            for final_state, s in zip(final_states, state):
+                final_state[active_runs[alive]] = s[alive]
+        final_states = {str(v): s for v, s in zip(self.variables, final_states)}
+        return SimulationResult(runs, max_iterations, iterations, final_states)
+
+    def __compile_initialization(self, variable: Symbol):
+        """
+        Returns a function which samples the initial values of the given variable. Variables without initial value
+        are only supported if they get assigned in the loop body before their value is read.
+        """
+        initialization = self.program.initial_values[variable]
+        if initialization.is_random_var and initialization.random_var.distribution == "unknown":
+            if self.__is_read_before_assigned(variable):
+                raise Exception(f"Initial value of {variable} has to be given for the simulation")
+            return lambda rng, state, size: np.full(size, np.nan)
+        return self.__compile_update(initialization)
+
+    def __is_read_before_assigned(self, variable: Symbol) -> bool:
+        names = {str(s) for s in sympify(self.program.loop_guard).free_symbols} if self.program.loop_guard else set()
+        for v in self.variables:
+            update = self.program.updates[v]
+            if update.is_random_var:
+                names |= {str(s) for p in update.random_var.parameters for s in sympify(p).free_symbols}
+            else:
+                names |= {str(s) for b, p in update.branches for s in (b.free_symbols | sympify(p).free_symbols)}
+            if v == variable:
+                break
+        return str(variable) in names
+
+    def __compile_update(self, update: Update):
+        """
+        Returns a function which samples new values of the updated variable for all runs at once
+        """
+        if update.is_random_var:
+            return self.__compile_random_var(update.random_var)
+
+        branches = [(self.__compile_expression(b), self.__to_float(p)) for b, p in update.branches]
+        if len(branches) == 1:
+            expression = branches[0][0]
+            return lambda rng, state, size: np.broadcast_to(expression(*state), size)
+
+        expressions = [b for b, _ in branches]
+        cumulative = np.cumsum([p for _, p in branches])
+
+        def sample(rng, state, size):
+            choice = rng.random(size)
+            result = np.broadcast_to(expressions[-1](*state), size)
+            for k in reversed(range(len(expressions) - 1)):
+                result = np.where(choice < cumulative[k], expressions[k](*state), result)
+            return result
+
+        return sample
+
+    def __compile_random_var(self, random_var: RandomVar):
+        """
+        Returns a function sampling the given random variable for all runs at once
+        """
+        distribution = random_var.distribution
+        if distribution == "finite":
+            values = np.array([self.__to_float(v) for v, _ in random_var.parameters])
+            probabilities = np.array([self.__to_float(p) for _, p in random_var.parameters])
+            return lambda rng, state, size: rng.choice(values, size=size, p=probabilities / probabilities.sum())
+
+        ps = [self.__to_float(p) for p in random_var.parameters]
+        samplers = {
+            "bernoulli": lambda rng, size: rng.binomial(1, ps[0], size),
+            # The moments of geometric random variables are the ones of the number of failures before a success
+            "geometric": lambda rng, size: rng.geometric(ps[0], size) - 1,
+            "exponential": lambda rng, size: rng.exponential(1 / ps[0], size),
+            "beta": lambda rng, size: rng.beta(ps[0], ps[1], size),
+            "uniform": lambda rng, size: rng.uniform(ps[0], ps[1], size),
+            "chi-squared": lambda rng, size: rng.chisquare(ps[0], size),
+            "rayleigh": lambda rng, size: rng.rayleigh(ps[0], size),
+            "gauss": lambda rng, size: rng.normal(ps[0], np.sqrt(ps[1]), size),
+            "normal": lambda rng, size: rng.normal(ps[0], np.sqrt(ps[1]), size),
+            "laplace": lambda rng, size: rng.laplace(ps[0], ps[1], size),
+            "binomial": lambda rng, size: rng.binomial(int(ps[0]), ps[1], size),
+            "hypergeometric": lambda rng, size: rng.hypergeometric(int(ps[1]), int(ps[0] - ps[1]), int(ps[2]), size),
+        }
+        if distribution not in samplers:
+            raise Exception(f"Distribution {distribution} is not supported by the simulation")
+        sampler = samplers[distribution]
+        return lambda rng, state, size: sampler(rng, size).astype(np.float64)
+
+    def __compile_expression(self, expression: Expr):
+        """
+        Returns a NumPy function evaluating the given expression over the states of all runs
+        """
+        expression = self.__substitute_parameters(sympify(expression))
+        return lambdify(tuple(self.variables), expression, "numpy")
+
+    def __to_float(self, expression) -> float:
+        expression = self.__substitute_parameters(sympify(expression))
+        if not expression.is_number:
+            raise Exception(f"{expression} has to be a number for the simulation")
+        return float(expression)
+
+    def __substitute_parameters(self, expression: Expr) -> Expr:
+        """
+        Replaces all symbolic constants by their given values and all symbols with the name of a program variable by
+        the variable itself (the loop guard gets parsed without any assumptions on the symbols)
+        """
+        variables = {str(v): v for v in self.variables}
+        substitutions = {}
+        for s in expression.free_symbols:
+            if str(s) in variables:
+                substitutions[s] = variables[str(s)]
+            elif str(s) in self.parameters:
+                substitutions[s] = sympify(self.parameters[str(s)])
+            else:
+                raise Exception(f"A value for the constant {s} has to be given for the simulation")
+        return expression.xreplace(substitutions)
+
+
+def simulate(program: Program, runs: int = 100000, max_iterations: int = 1000, seed: int = None,
+             parameters: Dict[str, float] = None) -> SimulationResult:
+    """
+    Simulates the given number of runs of a program
+    """
+    return Simulator(program, parameters).run(runs, max_iterations, seed)
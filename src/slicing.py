@@ -0,0 +1,76 @@
+"""
+This module slices programs to the dependency cone of their loop guard. Variables which can never influence the
+loop guard are irrelevant for the termination behavior, but would still widen all polynomials over the program
+variables and get split on while computing cases and recurrences. Therefore the analysis runs on a reduced program
+only containing the loop guard and its ancestors.
+"""
+
+from typing import List
+
+from diofant import symbols
+
+from mora.core import Program
+from mora.input import LOOP_GUARD_VAR
+from mora.utils import get_dependency_cone
+from .utils import log, LOG_ESSENTIAL
+
+
+class SliceStatistics:
+    """
+    Describes how much of a program was removed by slicing it to the dependency cone of the loop guard
+    """
+
+    def __init__(self, variables: int, removed: List[str]):
+        self.variables = variables
+        self.removed = removed
+
+    @property
+    def kept(self) -> int:
+        return self.variables - len(self.removed)
+
+    def as_dict(self):
+        return {
+            "variables": self.variables,
+            "kept": self.kept,
+            "removed": self.removed
+        }
+
+    def print(self):
+        log(f"Program slice: kept {self.kept} of {self.variables} variables", LOG_ESSENTIAL)
+        if self.removed:
+            log(f"Removed variables: {', '.join(self.removed)}", LOG_ESSENTIAL)
+
+
+class ProgramSlice:
+
+    def __init__(self, program: Program, statistics: SliceStatistics):
+        self.program = program
+        self.statistics = statistics
+
+
+def slice_program(program: Program) -> ProgramSlice:
+    """
+    Returns the program reduced to the variables the loop guard depends on. If no variable can be removed, the
+    program itself is part of the slice, such that slicing a sliced program again does not create a new program.
+    """
+    loop_guard = symbols(LOOP_GUARD_VAR)
+    variables = [v for v in program.variables if v != loop_guard]
+    if not program.loop_guard or loop_guard not in program.updates:
+        return ProgramSlice(program, SliceStatistics(len(variables), []))
+
+    cone = get_dependency_cone(program, loop_guard)
+    removed = [v for v in variables if v not in cone]
+    if not removed:
+        return ProgramSlice(program, SliceStatistics(len(variables), []))
+
+    sliced = Program()
+    sliced.name = program.name
+    sliced.source = program.source
+    sliced.loop_guard = program.loop_guard
+    sliced.variables = [v for v in program.variables if v in cone]
+    sliced.initial_values = {v: u for v, u in program.initial_values.items() if v in cone}
+    sliced.updates = {v: program.updates[v] for v in sliced.variables}
+    sliced.ancestors = {v: a for v, a in program.ancestors.items() if v in cone}
+    sliced.dependencies = {v: d & cone for v, d in program.dependencies.items() if v in cone}
+    sliced.contains_rvs = any(u.random_var for u in sliced.updates.values())
+    return ProgramSlice(sliced, SliceStatistics(len(variables), [str(v) for v in removed]))
@@ -2,50 +2,66 @@
 This module implements the general proof rule for AST
 """
 
-from diofant import symbols, sympify
+from diofant import symbols, sympify, simplify
 
 from . import bound_store
 from .asymptotics import is_dominating_or_same, Direction, Answer
-from .expression import get_cases_for_expression, split_expressions_on_rvs
-from .invariance import is_invariant
 from .rule import Rule, Result, Witness
-from .utils import amber_limit
 
 
 class SupermartingaleRule(Rule):
     def is_applicable(self):
-        n = symbols("n", integer=True, positive=True)
-        lim = amber_limit(self.loop_guard_change, n)
-        return lim <= 0
+        return self.facts.loop_guard_change_limit <= 0
+
+    def revalidate(self, result: Result, data):
+        """
+        Only checks the bounds of the decreasing branch claimed by the witness
+        """
+        martingale_expression = self.facts.martingale_expression
+        if result.AST.is_known() or not self.claims_martingale_expression(martingale_expression, data):
+            return result
+        if not self.facts.is_invariant(martingale_expression):
+            return result
+
+        for branch, prob in self.facts.guard_cases:
+            if simplify(branch.as_expr() - data["Decreasing branch"]) == 0 and prob == data["Probability"]:
+                return self.__check_branch(result, branch, prob)
+        return result
 
     def run(self, result: Result):
         if result.AST.is_known():
             return result
 
         # Martingale expression has to be <= 0 eventually
-        if not is_invariant(self.martingale_expression, self.program):
+        martingale_expression = self.facts.martingale_expression
+        if not self.facts.is_invariant(martingale_expression):
             return result
 
         # Eventually one branch of LG_{i+1} - LG_i has to decrease more or equal than constant
-        branches = get_cases_for_expression(sympify(self.program.loop_guard), self.program)
-        if self.program.contains_rvs:
-            branches = split_expressions_on_rvs(branches, self.program)
-        for branch, prob in branches:
-            bounds = bound_store.get_bounds_of_expr(branch - sympify(self.program.loop_guard))
-            n = symbols("n", integer=True, positive=True)
-            if is_dominating_or_same(bounds.upper, sympify(-1), n, direction=Direction.NegInf):
-                result.AST = Answer.TRUE
-                result.add_witness(ASTWitness(
-                    self.program.loop_guard,
-                    self.martingale_expression,
-                    branch,
-                    bounds.upper,
-                    prob
-                ))
+        for branch, prob in self.facts.guard_cases:
+            result = self.__check_branch(result, branch, prob)
+            if result.AST.is_known():
                 return result
 
         return result
 
+    def __check_branch(self, result: Result, branch, prob) -> Result:
+        """
+        Proves AST if the given branch of LG_{i+1} - LG_i eventually decreases more or equal than constant
+        """
+        bounds = bound_store.get_bounds_of_expr(branch - self.facts.loop_guard)
+        n = symbols("n", integer=True, positive=True)
+        if is_dominating_or_same(bounds.upper, sympify(-1), n, direction=Direction.NegInf):
+            result.AST = Answer.TRUE
+            result.add_witness(ASTWitness(
+                self.program.loop_guard,
+                self.facts.martingale_expression,
+                branch,
+                bounds.upper,
+                prob
+            ))
+        return result
+
 
 class ASTWitness(Witness):
 
@@ -0,0 +1,189 @@
+"""
+This module analyzes families of programs which only differ in the values of their symbolic constants, e.g. the bias
+of a random walk. MORA treats constants as arbitrary positive values, hence the moments and bounds computed once for
+the program with symbolic constants hold for every positive value. Every instance of the family starts with these
+moments and bounds with the values substituted, such that only the decisions of the proof rules (signs, limits,
+domination) get recomputed for the instance. An instance only gets analyzed from scratch if a substituted moment
+degenerates (e.g. divides by zero for the given values) or if the proof rules stay inconclusive.
+Every fallback caused by a failing symbolic operation gets logged and counted.
+"""
+
+import copy
+import itertools
+from typing import Dict, List
+
+from diofant import Expr, Poly, PolynomialError, nan, oo, sympify, zoo
+
+import mora.core
+from mora.budget import BudgetExceeded, fallback
+from mora.core import Program
+from mora.utils import RandomVar, Update
+from . import branch_store, bound_store
+from .bound_store import Bounds
+from .decission import decide_termination
+from .expression import get_split_overlay
+from .facts import Facts
+from .result import Result
+from .slicing import slice_program
+from .utils import get_monoms, log, LOG_ESSENTIAL
+
+# Failures expected from symbolic operations: giving up or not being able to decide a relation of the constants
+SYMBOLIC_FAILURES = (BudgetExceeded, PolynomialError, NotImplementedError, TypeError)
+
+
+class Sweep:
+    """
+    Analyzes instances of a program with symbolic constants, reusing the analysis of the symbolic program
+    """
+
+    def __init__(self, program: Program):
+        self.program = slice_program(program).program
+        self.symbolic_result: Result = None
+        self.solutions: Dict = {}
+        self.recurrences: Dict = {}
+        self.bounds: Dict = {}
+        # Number of instances answered from the symbolic analysis and number of instances analyzed from scratch
+        self.instantiated = 0
+        self.reanalyzed = 0
+
+    def analyze(self, assignment: Dict[str, str]) -> Result:
+        """
+        Decides termination of the program with the constants replaced by the values of the assignment
+        """
+        values = {name: sympify(value) for name, value in assignment.items()}
+        instance = instantiate(self.program, values)
+        if all(v.is_positive for v in values.values()):
+            if self.symbolic_result is None:
+                self.__analyze_symbolically()
+            # The symbolic result holds for all positive values of the constants
+            if self.symbolic_result.all_known():
+                self.instantiated += 1
+                return self.symbolic_result
+            result = self.__analyze_with_symbolic_stores(instance, values)
+            if result is not None and result.all_known():
+                self.instantiated += 1
+                return result
+
+        self.reanalyzed += 1
+        return decide_termination(instance)
+
+    def __analyze_symbolically(self):
+        try:
+            self.symbolic_result = decide_termination(self.program)
+        except SYMBOLIC_FAILURES as e:
+            # Some decision depends on the values of the constants. Still, the bounds of the monomials the rules need
+            # are computed as far as they do not depend on such a decision.
+            self.__fall_back("the symbolic analysis", e)
+            self.symbolic_result = Result()
+            self.__compute_symbolic_bounds()
+        self.solutions = dict(mora.core.solution_store)
+        self.recurrences = dict(mora.core.recurrence_store)
+        self.bounds = dict(bound_store.store)
+
+    def __compute_symbolic_bounds(self):
+        facts = Facts(self.program)
+        expressions = [facts.loop_guard]
+        try:
+            expressions.append(facts.martingale_expression)
+        except SYMBOLIC_FAILURES as e:
+            self.__fall_back("the martingale expression", e)
+        for expression in expressions:
+            for monomial in get_monoms(sympify(expression).as_poly(self.program.variables)):
+                try:
+                    bound_store.get_bounds_of_expr(monomial)
+                except SYMBOLIC_FAILURES as e:
+                    self.__fall_back(f"the bounds of {monomial}", e)
+
+    def __analyze_with_symbolic_stores(self, instance: Program, values: Dict[str, Expr]):
+        mora.core.reset_mora()
+        for monomial, solution in self.solutions.items():
+            solution = substitute(solution, values)
+            if solution.has(nan, zoo, oo, -oo):
+                return None
+            mora.core.solution_store[monomial] = solution
+        for monomial, recurrence in self.recurrences.items():
+            mora.core.recurrence_store[monomial] = substitute(recurrence.as_expr(), values).as_poly(instance.variables)
+
+        branch_store.set_program(instance)
+        bound_store.set_program(instance)
+        # Bounds involving split variables are not reused, as the split variables are unique per split overlay
+        variables = set(instance.variables)
+        overlay_variables = get_split_overlay(instance).variables
+        for monomial, bounds in self.bounds.items():
+            if not bounds.expression.as_expr().free_symbols <= variables:
+                continue
+            instance_bounds = Bounds()
+            instance_bounds.lower = substitute(bounds.lower, values)
+            instance_bounds.upper = substitute(bounds.upper, values)
+            instance_bounds.maybe_positive = bounds.maybe_positive
+            instance_bounds.maybe_negative = bounds.maybe_negative
+            if instance_bounds.lower.has(nan, zoo) or instance_bounds.upper.has(nan, zoo):
+                continue
+            if isinstance(monomial, Poly):
+                monomial = monomial.as_expr().as_poly(overlay_variables)
+            instance_bounds.expression = monomial
+            bound_store.store[monomial] = instance_bounds
+
+        try:
+            return decide_termination(instance, reset_stores=False)
+        except SYMBOLIC_FAILURES as e:
+            self.__fall_back("the instance with the symbolic moments", e)
+            return None
+
+    @staticmethod
+    def __fall_back(place: str, error: Exception):
+        """
+        Counts and logs a fallback. Only type errors of undecidable relations are expected, others get raised again.
+        """
+        if isinstance(error, TypeError) and "Relational" not in str(error):
+            raise error
+        fallback("sweep")
+        log(f"Sweep: {place} failed ({error}), falling back", LOG_ESSENTIAL)
+
+
+def get_assignments(values: Dict[str, List[str]]) -> List[Dict[str, str]]:
+    """
+    Returns all combinations of the given values of the constants
+    """
+    names = list(values.keys())
+    return [dict(zip(names, combination)) for combination in itertools.product(*values.values())]
+
+
+def instantiate(program: Program, values: Dict[str, Expr]) -> Program:
+    """
+    Returns a copy of the program in which the constants are replaced by the given values
+    """
+    instance = Program()
+    instance.name = program.name
+    instance.source = program.source
+    instance.loop_guard = str(substitute(program.loop_guard, values)) if program.loop_guard else program.loop_guard
+    instance.variables = list(program.variables)
+    instance.initial_values = {v: __instantiate_update(u, values) for v, u in program.initial_values.items()}
+    instance.updates = {v: __instantiate_update(u, values) for v, u in program.updates.items()}
+    instance.ancestors = program.ancestors
+    instance.dependencies = program.dependencies
+    instance.contains_rvs = program.contains_rvs
+    return instance
+
+
+def substitute(expression, values: Dict[str, Expr]) -> Expr:
+    """
+    Replaces all symbols in the expression which have a value by their value, independent of their assumptions
+    """
+    expression = sympify(expression)
+    return expression.xreplace({s: values[str(s)] for s in expression.free_symbols if str(s) in values})
+
+
+def __instantiate_update(update: Update, values: Dict[str, Expr]) -> Update:
+    instance = copy.copy(update)
+    if update.random_var:
+        parameters = [tuple(substitute(p, values) for p in ps) if isinstance(ps, tuple) else substitute(ps, values)
+                      for ps in update.random_var.parameters]
+        instance.random_var = RandomVar(update.random_var.distribution, parameters, var_name=update.random_var.var_name)
+    if hasattr(update, "branches"):
+        branches = [(substitute(e, values), substitute(p, values)) for e, p in update.branches]
+        instance.branches = [(e, p) for e, p in branches if not p.is_zero]
+        probabilities = [p for _, p in instance.branches]
+        if any(p.is_number and not 0 <= p <= 1 for p in probabilities):
+            raise Exception(f"Branch probabilities for {update.var} are not within [0, 1]. Terminating.")
+    return instance
@@ -1,8 +1,11 @@
 import math
 from enum import Enum, auto
+from functools import lru_cache
 from diofant import *
 
+from mora.budget import budget, fallback, BudgetExceeded, LIMIT, SOLVE
 from mora.core import Program, get_solution as get_expected
+from mora.metrics import register_cache, timed
 from mora.input import LOOP_GUARD_VAR
 
 LOG_NOTHING = 0
@@ -10,6 +13,9 @@ LOG_ESSENTIAL = 10
 LOG_VERBOSE = 20
 LOG_LEVEL = LOG_ESSENTIAL
 
+# Limits do not depend on the program, so they are cached across programs up to the given number of entries
+LIMIT_CACHE_SIZE = 4096
+
 
 class Answer(Enum):
     FALSE = auto()
@@ -50,7 +56,8 @@ def get_max_0(expression: Expr, n: Symbol):
     """
     n_real = symbols("n", real=True)
     try:
-        exp_zeros = solve(expression.xreplace({n: n_real}), n_real)
+        with budget(SOLVE, expression):
+            exp_zeros = solve(expression.xreplace({n: n_real}), n_real)
         if exp_zeros == [{}]:
             return 0
         exp_zeros = [z[n_real] for z in exp_zeros if z[n_real].is_real]
@@ -72,6 +79,7 @@ def get_monoms(poly: Poly):
     return monoms
 
 
+@timed("polarity")
 def get_polarity(expression: Expr, n: Symbol):
     """
     Given an expression in n, returns whether or not the expression is positive and negative for some values of n
@@ -80,7 +88,11 @@ def get_polarity(expression: Expr, n: Symbol):
     if expression.is_number:
         return expression > 0, expression < 0
 
-    max_0 = get_max_0(expression, n)
+    try:
+        max_0 = get_max_0(expression, n)
+    except BudgetExceeded:
+        fallback("polarity")
+        return True, True
     if max_0 > 0:
         pos = True
         neg = True
@@ -169,11 +181,16 @@ def log(message, level):
         print(message)
 
 
+@lru_cache(maxsize=LIMIT_CACHE_SIZE)
 def amber_limit(expr, n):
     if n not in expr.free_symbols:
         return expr
 
-    return limit(expr, n, oo)
+    with budget(LIMIT, expr):
+        return limit(expr, n, oo)
+
+
+register_cache("limits", amber_limit.cache_info)
 
 
 def flatten_substitution_choices(subs_choices):
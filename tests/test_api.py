@@ -0,0 +1,59 @@
+import io
+import unittest
+from contextlib import redirect_stdout
+
+from src import analyze, analyze_many
+from src.utils import Answer
+
+PAST_SOURCE = """
+x = 10
+while x > 0:
+    x = x - 1 @ 3/4; x + 1
+"""
+
+NONAST_SOURCE = """
+x = 10
+while x > 0:
+    x = x + 1 @ 3/4; x - 1
+"""
+
+
+class TestApi(unittest.TestCase):
+
+    def test_analyze_source(self):
+        output = io.StringIO()
+        with redirect_stdout(output):
+            analysis = analyze(PAST_SOURCE, "past")
+        self.assertEqual(output.getvalue(), "")
+        self.assertEqual(analysis.name, "past")
+        self.assertEqual(analysis.result.PAST, Answer.TRUE)
+        self.assertIn("parse", analysis.times)
+        self.assertIn("moments", analysis.times)
+
+    def test_analyze_many(self):
+        analyses = analyze_many([PAST_SOURCE, NONAST_SOURCE, "not a program", PAST_SOURCE])
+        self.assertEqual(analyses[0].result.PAST, Answer.TRUE)
+        self.assertEqual(analyses[1].result.AST, Answer.FALSE)
+        self.assertIsNone(analyses[2].result)
+        self.assertIsNotNone(analyses[2].error)
+        self.assertIs(analyses[3].result, analyses[0].result)
+
+    def test_analyze_many_shares_equal_programs(self):
+        analyses = analyze_many([NONAST_SOURCE, NONAST_SOURCE.replace("x", "y")])
+        self.assertEqual(analyses[1].result.AST, Answer.FALSE)
+        self.assertEqual(str(analyses[1].result.witnesses[0].data["Repulsing SM"]), "-y")
+        self.assertEqual(analyses[1].metrics["stores"]["solutions"]["misses"], 0)
+
+    def test_metrics(self):
+        metrics = analyze(NONAST_SOURCE).as_dict()["metrics"]
+        self.assertGreater(metrics["stores"]["solutions"]["misses"], 0)
+        self.assertGreaterEqual(metrics["stores"]["solutions"]["seconds"], 0)
+        self.assertIn("limits", metrics["stores"])
+        self.assertGreater(metrics["primitives"]["simplify_asymptotically"]["calls"], 0)
+        # The metrics only cover the analysis itself, not the ones before
+        again = analyze(NONAST_SOURCE).metrics
+        self.assertEqual(again["stores"]["solutions"]["misses"], metrics["stores"]["solutions"]["misses"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+
+from diofant import symbols, sympify, limit, oo
+
+from src.asymptotics import screen_dominating_or_same, Direction
+
+n = symbols("n", integer=True, positive=True)
+c = symbols("c", positive=True)
+d = symbols("d", positive=True)
+
+
+def expr(s):
+    return sympify(s, locals={"n": n, "c": c, "d": d})
+
+
+class TestAsymptotics(unittest.TestCase):
+
+    def test_screening_decides_obvious_comparisons(self):
+        self.assertTrue(screen_dominating_or_same(expr("n**3"), expr("-1"), n))
+        self.assertFalse(screen_dominating_or_same(expr("n**3"), expr("-1"), n, Direction.NegInf))
+        self.assertTrue(screen_dominating_or_same(expr("2**n"), expr("n**100"), n))
+        self.assertFalse(screen_dominating_or_same(expr("n**100"), expr("2**n"), n))
+        self.assertTrue(screen_dominating_or_same(expr("c*n**3"), expr("d*n**2 - 2*d*n + d"), n))
+        self.assertTrue(screen_dominating_or_same(expr("-c*n"), expr("1"), n, Direction.NegInf))
+
+    def test_screening_agrees_with_limits(self):
+        for f in ["c*n**2 - c*n", "-c*(1/2)**n", "3**n - 2**n"]:
+            f = expr(f)
+            screened = screen_dominating_or_same(f, sympify(0), n)
+            self.assertIsNotNone(screened, f)
+            self.assertEqual(screened, limit(f, n, oo) >= 0, f)
+
+    def test_screening_falls_back(self):
+        self.assertIsNone(screen_dominating_or_same(expr("n"), expr("log(n)"), n))
+        self.assertIsNone(screen_dominating_or_same(expr("c*n**2 - d*n**3"), expr("1"), n))
+        self.assertIsNone(screen_dominating_or_same(expr("c*n"), oo, n))
+        self.assertIsNone(screen_dominating_or_same(expr("(-2)**n"), expr("1"), n))
+        # Functions seemingly approaching a constant are left to the limits
+        self.assertIsNone(screen_dominating_or_same(expr("d*n/(n + 1)"), expr("0"), n))
+        self.assertIsNone(screen_dominating_or_same(expr("c*(n - 1)**2"), expr("d*n**2 - 2*d*n + d"), n))
+
+    def test_screening_rejects_slow_growth_and_large_numbers(self):
+        self.assertIsNone(screen_dominating_or_same(expr("2"), expr("n**(1/100000)"), n))
+        self.assertIsNone(screen_dominating_or_same(expr("10**70 - n"), expr("1"), n))
+        self.assertIsNone(screen_dominating_or_same(expr("n**2/10**70 - n"), expr("0"), n))
+
+
+if __name__ == '__main__':
+    unittest.main()
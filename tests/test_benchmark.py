@@ -0,0 +1,46 @@
+import io
+import unittest
+from contextlib import redirect_stdout
+
+from benchmark import compare
+
+
+def measurements(**totals):
+    return {"programs": {name: {"error": t} if isinstance(t, str) else {"total": t} for name, t in totals.items()}}
+
+
+def regressions(current, baseline, threshold=0.25, aggregate_threshold=0.1, min_time=0.05):
+    with redirect_stdout(io.StringIO()):
+        return compare(current, baseline, threshold, aggregate_threshold, min_time)
+
+
+class TestCompare(unittest.TestCase):
+
+    def test_thresholds(self):
+        baseline = measurements(a=1.0, b=1.0)
+        self.assertEqual(regressions(measurements(a=1.15, b=1.0), baseline), [])
+        self.assertEqual(len(regressions(measurements(a=1.3, b=1.0), baseline, aggregate_threshold=10)), 1)
+        # Both programs stay below the single threshold, but together exceed the aggregate threshold
+        result = regressions(measurements(a=1.2, b=1.2), baseline)
+        self.assertEqual(len(result), 1)
+        self.assertIn("All programs", result[0])
+
+    def test_min_time(self):
+        self.assertEqual(regressions(measurements(a=0.02), measurements(a=0.01), aggregate_threshold=10), [])
+        self.assertEqual(len(regressions(measurements(a=0.1), measurements(a=0.01), aggregate_threshold=10)), 1)
+
+    def test_baseline_time_zero(self):
+        self.assertEqual(regressions(measurements(a=0.0), measurements(a=0.0)), [])
+        self.assertEqual(len(regressions(measurements(a=0.1), measurements(a=0.0))), 1)
+
+    def test_missing_and_failing_programs(self):
+        baseline = measurements(a=1.0, b=1.0, c="error")
+        # A program missing in the baseline and a program failing in the baseline are only reported
+        self.assertEqual(regressions(measurements(a=1.0, c=5.0, d=5.0), baseline), [])
+        # A program failing now counts as regression and not for the aggregate
+        result = regressions(measurements(a=1.0, b="error", c="error"), baseline)
+        self.assertEqual(result, ["b failed: error"])
+
+
+if __name__ == '__main__':
+    unittest.main()
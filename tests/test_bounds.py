@@ -0,0 +1,24 @@
+import unittest
+
+from src import bound_store
+from src.api import parse, silenced
+from src.bounds import bounds_of_expressions
+
+PROGRAM_SOURCE = """
+x = 0
+while x < 10:
+    x = x + 1 @ 3/4; x - 1
+"""
+
+
+class TestBatchBounds(unittest.TestCase):
+
+    def test_expressions_share_the_store(self):
+        with silenced():
+            results = bounds_of_expressions(parse(PROGRAM_SOURCE), ["x", "x**2", "2*x**2 + x", "x +"])
+        self.assertTrue(results[0]["maybe_positive"])
+        self.assertFalse(results[1]["maybe_negative"])
+        self.assertNotIn("error", results[2])
+        self.assertIn("error", results[3])
+        stored = {str(e) for e in bound_store.store.keys()}
+        self.assertTrue({"x", "x**2"} <= stored)
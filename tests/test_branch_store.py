@@ -0,0 +1,56 @@
+import unittest
+
+from diofant import symbols
+
+from src import branch_store
+from src.api import parse
+from src.expression import get_cases_for_expression
+
+PROGRAM_SOURCE = """
+x = 0
+y = 0
+z = 0
+while x + y < 10:
+    x = x + 1 @ 1/2; x - 1
+    y = y + 2 @ 1/3; y - 1
+    z = z + x @ 1/4; z - 2*y
+"""
+
+
+def normalize(branches):
+    """
+    Maps every (recurrence constant, inhomogeneous part) of the branches to its total probability
+    """
+    result = {}
+    for branch in branches:
+        key = (branch.recurrence_constant, branch.inhom_part.as_expr())
+        result[key] = result.get(key, 0) + branch.probability
+    return result
+
+
+def enumerate_branches(monom, program):
+    branches = []
+    for case, probability in get_cases_for_expression(monom, program):
+        branch = branch_store.Branch()
+        branch.recurrence_constant = case.coeff_monomial(monom)
+        branch.inhom_part = case - branch.recurrence_constant * monom
+        branch.probability = probability
+        branches.append(branch)
+    return branches
+
+
+class TestBranchStore(unittest.TestCase):
+
+    def test_derived_branches_equal_enumerated_ones(self):
+        program = parse(PROGRAM_SOURCE)
+        branch_store.set_program(program)
+        x, y, z = symbols("x y z")
+        # x*y has independent factors, x*z and y*z do not, the others are powers of single variables
+        for monom in [x * y, x ** 3, z ** 2, x * z, y * z ** 2, x ** 2 * y]:
+            derived = normalize(branch_store.get_branches_of_monom(monom))
+            enumerated = normalize(enumerate_branches(monom, program))
+            self.assertEqual(derived, enumerated, monom)
+
+
+if __name__ == '__main__':
+    unittest.main()
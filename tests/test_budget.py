@@ -0,0 +1,51 @@
+import time
+import unittest
+
+from diofant import symbols, exp
+
+from mora.budget import budget, set_budgets, reset_counts, exceeded, fallbacks, BudgetExceeded, LIMIT, SOLVE
+from src.api import parse, silenced
+from src.decission import decide_termination
+from src.utils import Answer, amber_limit, get_polarity
+
+
+class TestBudget(unittest.TestCase):
+
+    def setUp(self):
+        reset_counts()
+
+    def tearDown(self):
+        set_budgets()
+        reset_counts()
+
+    def test_time_budget(self):
+        set_budgets(seconds=0.05)
+        with self.assertRaises(BudgetExceeded):
+            with budget(LIMIT):
+                time.sleep(1)
+        with budget(LIMIT):
+            time.sleep(0.01)
+        self.assertEqual(exceeded[LIMIT], 1)
+
+    def test_size_budget(self):
+        n = symbols("n", integer=True, positive=True)
+        set_budgets(max_operations=3, operation=LIMIT)
+        with self.assertRaises(BudgetExceeded):
+            amber_limit(exp(-n) * n ** 3 + 7 * n ** 2 + 1, n)
+        # Operations without a budget of their own stay unbounded
+        self.assertEqual(get_polarity(n ** 2 - 10 * n, n), (True, True))
+        set_budgets(max_operations=3, operation=SOLVE)
+        self.assertEqual(get_polarity(n ** 3 - 10 * n + 1 - n ** 2, n), (True, True))
+        self.assertEqual(fallbacks["polarity"], 1)
+
+    def test_fallbacks_are_sound(self):
+        program = parse("x = 10\nwhile x > 0:\n    x = x - 1 @ 3/4; x + 1\n")
+        set_budgets(max_operations=1)
+        with silenced():
+            result = decide_termination(program)
+        self.assertEqual((result.PAST, result.AST), (Answer.UNKNOWN, Answer.UNKNOWN))
+        self.assertGreater(sum(fallbacks.values()), 0)
+        set_budgets()
+        with silenced():
+            result = decide_termination(program)
+        self.assertEqual((result.PAST, result.AST), (Answer.TRUE, Answer.TRUE))
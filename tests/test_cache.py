@@ -0,0 +1,50 @@
+import pickle
+import unittest
+
+from diofant import expand, symbols, sympify
+
+from mora.cache import BoundedStore, link, estimate_size
+
+
+class TestBoundedStore(unittest.TestCase):
+
+    def test_least_recently_used_entries_get_evicted(self):
+        x, y, z = symbols("x y z")
+        store = BoundedStore("test", max_entries=2)
+        store[x] = 1
+        store[y] = 2
+        self.assertEqual(store[x], 1)
+        store[z] = 3
+        self.assertEqual(set(store.keys()), {x, z})
+        self.assertEqual(store.evictions, 1)
+
+    def test_byte_limit_and_links(self):
+        x, y = symbols("x y")
+        solutions = BoundedStore("solutions")
+        exp_polys = BoundedStore("exp_polys", max_bytes=estimate_size(x) + estimate_size(x**2 + 1) + 1)
+        link(solutions, exp_polys)
+        solutions[x] = exp_polys[x] = x**2 + 1
+        solutions[y] = exp_polys[y] = y**2 + 1
+        self.assertEqual(set(exp_polys.keys()), {y})
+        self.assertEqual(set(solutions.keys()), {y})
+        self.assertEqual(exp_polys.bytes, estimate_size(y) + estimate_size(y**2 + 1))
+
+    def test_pickling_keeps_limits(self):
+        store = BoundedStore("test", max_entries=2)
+        store.update({1: "a", 2: "b"})
+        copy = pickle.loads(pickle.dumps(store))
+        self.assertEqual(copy, store)
+        self.assertEqual(copy.max_entries, 2)
+
+    def test_interning_shares_equal_subexpressions(self):
+        x, y, z, n = symbols("x y z n")
+        store = BoundedStore("test", interning=True)
+        store[y] = expand((x + 1) ** 3) * y ** n
+        expression = sympify("x**3 + 3*x**2 + 3*x + 1") * z ** n
+        args = expression.args
+        store[z] = expression
+        # The stored expressions are rebuilt, the given ones stay unchanged
+        self.assertIs(expression.args, args)
+        polynomial = store[y].as_independent(y)[0]
+        self.assertEqual(polynomial, store[z].as_independent(z)[0])
+        self.assertTrue(any(polynomial is a for a in store[z].args))
@@ -0,0 +1,108 @@
+import json
+import os
+import tempfile
+import unittest
+
+from src.api import parse, silenced
+from src.certificates import CertificateStore
+from src.decission import decide_termination
+from mora.metrics import get_metrics, get_metrics_since
+from src.utils import Answer
+
+PROGRAM_SOURCE = """
+x = 10
+while x > 0:
+    x = x - 1 @ 3/4; x + 1
+"""
+
+RENAMED_SOURCE = """
+y = 10
+while y > 0:
+    y = y - 1 @ 3/4; y + 1
+"""
+
+AST_SOURCE = """
+x = 10
+while x > 0:
+    x = x - 1 @ 1/2; x + 1
+"""
+
+COUPON_SOURCE = """
+coupon1 = 0
+c1 = 0
+coupon2 = 0
+c2 = 0
+while coupon1*coupon2 < 1:
+    c1 = 1 @ 1/2; 0
+    c2 = 1 - c1
+    coupon1 = coupon1 + c1
+    coupon2 = coupon2 + c2
+"""
+
+NON_AST_SOURCE = """
+x = RV(uniform, 0, 10)
+while x > 0:
+    s = RV(uniform, -1, 2)
+    x = x + s
+"""
+
+
+class TestCertificates(unittest.TestCase):
+
+    def test_revalidation(self):
+        with tempfile.TemporaryDirectory() as directory, silenced():
+            store = CertificateStore(directory)
+            for source in [PROGRAM_SOURCE, AST_SOURCE]:
+                program = parse(source)
+                store.put(program, decide_termination(program))
+            result = store.revalidate(parse(RENAMED_SOURCE))
+            ast_result = store.revalidate(parse(AST_SOURCE))
+        self.assertEqual(store.revalidated, 2)
+        self.assertEqual((result.PAST, result.AST), (Answer.TRUE, Answer.TRUE))
+        self.assertEqual(result.witnesses[0].kind, "PAST")
+        self.assertEqual((ast_result.PAST, ast_result.AST), (Answer.FALSE, Answer.TRUE))
+
+    def test_revalidation_reuses_the_bounds(self):
+        with tempfile.TemporaryDirectory() as directory, silenced():
+            store = CertificateStore(directory)
+            for source in [COUPON_SOURCE, NON_AST_SOURCE]:
+                program = parse(source)
+                store.put(program, decide_termination(program))
+            metrics = get_metrics()
+            result = store.revalidate(parse(COUPON_SOURCE.replace("coupon", "collected")))
+            non_ast_result = store.revalidate(parse(NON_AST_SOURCE))
+            bounds = get_metrics_since(metrics)["stores"].get("bounds", {})
+        self.assertEqual((result.PAST, result.AST), (Answer.TRUE, Answer.TRUE))
+        self.assertEqual((non_ast_result.PAST, non_ast_result.AST), (Answer.FALSE, Answer.FALSE))
+        self.assertEqual(non_ast_result.witnesses[0].kind, "Not AST")
+        # The bounds of the monomials come from the certificates, none has been computed again
+        self.assertEqual(bounds.get("misses", 0), 0)
+
+    def test_failing_bound(self):
+        with tempfile.TemporaryDirectory() as directory, silenced():
+            store = CertificateStore(directory)
+            program = parse(PROGRAM_SOURCE)
+            store.put(program, decide_termination(program))
+            path = os.path.join(directory, os.listdir(directory)[0])
+            with open(path) as file:
+                certificate = json.load(file)
+            certificate["witnesses"][0]["data"]["SM expression bound"] = "-1/n"
+            with open(path, "w") as file:
+                json.dump(certificate, file)
+            self.assertIsNone(store.revalidate(program))
+        self.assertEqual(store.failed, 1)
+
+    def test_failing_witness(self):
+        with tempfile.TemporaryDirectory() as directory, silenced():
+            store = CertificateStore(directory)
+            program = parse(PROGRAM_SOURCE)
+            store.put(program, decide_termination(program))
+            path = os.path.join(directory, os.listdir(directory)[0])
+            with open(path) as file:
+                certificate = json.load(file)
+            certificate["witnesses"][0]["data"]["SM expression"] = "-1"
+            with open(path, "w") as file:
+                json.dump(certificate, file)
+            self.assertIsNone(store.revalidate(program))
+            self.assertEqual(store.decide_termination(program).PAST, Answer.TRUE)
+        self.assertEqual(store.failed, 2)
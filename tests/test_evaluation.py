@@ -0,0 +1,33 @@
+import unittest
+
+import mpmath
+import numpy
+from diofant import symbols
+
+from mora.evaluation import compile_moment, evaluate_moments
+
+n = symbols("n", integer=True, positive=True)
+c = symbols("c", positive=True)
+
+
+class TestEvaluation(unittest.TestCase):
+
+    def test_numpy_backend(self):
+        expression = c * n**2 + 3**n
+        moment = compile_moment(expression)
+        self.assertIs(moment, compile_moment(expression))
+        values = moment(numpy.arange(5), c=2)
+        self.assertTrue(numpy.allclose(values, [float(expression.subs({n: i, c: 2})) for i in range(5)]))
+        # Integer arrays would overflow for large exponentials
+        self.assertGreater(moment([100], c=0)[0], 1e47)
+        with self.assertRaises(Exception):
+            moment([1])
+
+    def test_mpmath_backend(self):
+        values = evaluate_moments([1, 10**20], {n: 2**(-n)}, backend="mpmath")[n]
+        self.assertEqual(values[0], mpmath.mpf(1) / 2)
+        self.assertGreater(values[1], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
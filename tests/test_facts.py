@@ -0,0 +1,40 @@
+import unittest
+from unittest import mock
+
+from mora.core import reset_mora
+from src import branch_store, bound_store
+from src import facts as facts_module
+from src.api import parse, silenced
+from src.facts import Facts
+from src.initial_state_rule import InitialStateRule
+from src.ranking_sm_rule import RankingSMRule
+from src.result import Result
+from src.utils import Answer
+
+
+def prepare(source):
+    program = parse(source)
+    reset_mora()
+    branch_store.set_program(program)
+    bound_store.set_program(program)
+    return Facts(program)
+
+
+class TestFacts(unittest.TestCase):
+
+    def test_facts_are_only_computed_when_needed(self):
+        facts = prepare("x = -1\nwhile x > 0:\n    x = x + 1 @ 1/2; x - 1\n")
+        result = InitialStateRule(facts).run(Result())
+        self.assertEqual(result.PAST, Answer.TRUE)
+        self.assertNotIn("loop_guard_change", vars(facts))
+        self.assertNotIn("martingale_expression", vars(facts))
+
+    def test_facts_are_computed_once(self):
+        facts = prepare("x = 10\nwhile x > 0:\n    x = x - 1 @ 3/4; x + 1\n")
+        with silenced(), mock.patch.object(facts_module, "is_invariant", wraps=facts_module.is_invariant) as spy:
+            rule = RankingSMRule(facts)
+            self.assertTrue(rule.is_applicable())
+            result = rule.run(Result())
+            rule.run(Result())
+        self.assertEqual(result.PAST, Answer.TRUE)
+        self.assertEqual(spy.call_count, 1)
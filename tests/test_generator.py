@@ -0,0 +1,28 @@
+import unittest
+
+from mora.input import LOOP_GUARD_VAR
+from src.api import parse, silenced
+from src.decission import decide_termination
+from src.generator import generate_program
+from src.phases import PhaseMemory, MOMENTS
+
+
+class TestGenerator(unittest.TestCase):
+
+    def test_generated_programs_are_prob_solvable(self):
+        for seed in range(10):
+            source = generate_program(variables=3, degree=2, branches=3, rvs=1, guard_degree=2, seed=seed)
+            program = parse(source)
+            self.assertEqual([str(v) for v in program.variables], ["r1", "x1", "x2", "x3", LOOP_GUARD_VAR])
+            self.assertEqual(len(program.updates[program.variables[-2]].branches), 3)
+            self.assertTrue(program.contains_rvs)
+
+    def test_seeds(self):
+        self.assertEqual(generate_program(seed=1), generate_program(seed=1))
+        self.assertNotEqual(generate_program(seed=1), generate_program(seed=2))
+
+    def test_memory_per_phase(self):
+        program = parse(generate_program(variables=2, seed=0))
+        with PhaseMemory() as memory, silenced():
+            decide_termination(program)
+        self.assertGreater(memory.grouped_peaks()[MOMENTS], 0)
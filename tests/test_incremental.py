@@ -0,0 +1,43 @@
+import unittest
+
+import mora.core
+from src.api import parse, silenced
+from src.decission import decide_termination
+from src.incremental import Session, get_changed_variables
+
+PROGRAM_SOURCE = """
+x = 0
+y = 0
+while x + y < 10:
+    x = x + 1 @ 3/4; x - 1
+    y = y + 1 @ 1/2; y
+"""
+
+EDITED_SOURCE = """
+x = 0
+y = 0
+while x + y < 10:
+    x = x + 1 @ 3/4; x - 1
+    y = y + 2 @ 1/2; y
+"""
+
+
+class TestIncremental(unittest.TestCase):
+
+    def test_changed_variables(self):
+        changed_updates, changed_initial_values = get_changed_variables(parse(PROGRAM_SOURCE), parse(EDITED_SOURCE))
+        self.assertEqual(changed_updates, {"y"})
+        self.assertEqual(changed_initial_values, set())
+
+    def test_edit_matches_fresh_analysis(self):
+        session = Session()
+        with silenced():
+            session.analyze(parse(PROGRAM_SOURCE))
+            old_solution = mora.core.solution_store[parse(PROGRAM_SOURCE).variables[0]]
+            result = session.analyze(parse(EDITED_SOURCE))
+            reused_solution = mora.core.solution_store[parse(PROGRAM_SOURCE).variables[0]]
+            fresh = decide_termination(parse(EDITED_SOURCE))
+        self.assertGreater(session.reused, 0)
+        self.assertGreater(session.dropped, 0)
+        self.assertIs(reused_solution, old_solution)
+        self.assertEqual((result.PAST, result.AST), (fresh.PAST, fresh.AST))
@@ -0,0 +1,42 @@
+import unittest
+
+from diofant import simplify, symbols
+
+import mora.core
+from mora.core import core
+from src.api import parse
+
+PROGRAM_SOURCE = """
+x = 1
+y = 0
+z = 3
+while x < 10:
+    x = 2*x + 1 @ 1/2; x - 1
+    y = 2*y + x + c
+    z = z/2 + y
+"""
+
+class TestLinear(unittest.TestCase):
+
+    def test_closure_solutions_agree_with_summation(self):
+        program = parse(PROGRAM_SOURCE)
+        solutions = dict(core(program, goal_power=1))
+        self.assertEqual(len(mora.core.exp_poly_store), len(solutions))
+
+        compute_solutions_of_closure = mora.core.compute_solutions_of_closure
+        mora.core.compute_solutions_of_closure = lambda program, monomial: False
+        try:
+            summation_solutions = dict(core(program, goal_power=1))
+        finally:
+            mora.core.compute_solutions_of_closure = compute_solutions_of_closure
+
+        n = symbols("n", integer=True, positive=True)
+        self.assertEqual(solutions.keys(), summation_solutions.keys())
+        for monomial, solution in solutions.items():
+            for i in range(6):
+                expected = summation_solutions[monomial].xreplace({n: i})
+                self.assertEqual(simplify(solution.xreplace({n: i}) - expected), 0, monomial)
+
+
+if __name__ == '__main__':
+    unittest.main()
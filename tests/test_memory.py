@@ -0,0 +1,34 @@
+import unittest
+
+from diofant import symbols
+
+import mora.intern
+
+from src.api import analyze
+from src.memory import get_node_count_histogram, node_count
+
+PROGRAM_SOURCE = """
+x = 10
+while x > 0:
+    x = x - 1 @ 3/4; x + 1
+"""
+
+
+class TestMemory(unittest.TestCase):
+
+    def test_node_count_histogram(self):
+        x, n = symbols("x n")
+        self.assertEqual(node_count(x + 1), 3)
+        self.assertEqual(get_node_count_histogram([x, x + 1, 2 ** n + x * n]), {1: 1, 4: 1, 8: 1})
+
+    def test_memory_report(self):
+        analysis = analyze(PROGRAM_SOURCE, memory=True).as_dict()
+        self.assertIn("moments", analysis["memory"]["phases"])
+        self.assertIn("rules.RankingSMRule", analysis["memory"]["phases"])
+        self.assertGreater(analysis["memory"]["stores"]["solutions"]["entries"], 0)
+        self.assertNotIn("memory", analyze(PROGRAM_SOURCE).as_dict())
+
+    def test_shared_expressions_are_counted_per_analysis(self):
+        mora.intern.shared = 10 ** 6
+        analysis = analyze(PROGRAM_SOURCE, memory=True)
+        self.assertLess(analysis.memory.interned["shared"], 10 ** 6)
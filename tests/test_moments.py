@@ -0,0 +1,72 @@
+import unittest
+
+from diofant import simplify, symbols
+
+import mora.core
+from mora.core import core, moments, reset_mora
+from src.api import parse
+
+WALK_SOURCE = """
+x = 0
+y = 1
+while x < 10:
+    x = x + 1 @ 1/2; x - 1
+    y = 2*y + x
+"""
+
+INDEPENDENT_SOURCE = """
+x = 1
+y = 2
+z = 0
+while x < 10:
+    x = 2*x + 1 @ 1/2; x - 1
+    y = y + 1 @ 1/3; y - 2
+    w = RV(uniform, 0, 1)
+    z = z + w*y
+"""
+
+
+class TestMoments(unittest.TestCase):
+
+    def test_parallel_moments_agree(self):
+        program = parse(WALK_SOURCE)
+        x, y = program.variables[:2]
+        reset_mora()
+        serial = dict(moments(program, [x, y], max_power=2))
+        self.assertEqual(set(serial.keys()), {x, y, x**2, y**2})
+        store_size = len(mora.core.solution_store)
+
+        reset_mora()
+        parallel = dict(moments(program, [x, y], max_power=2, processes=2))
+        self.assertEqual(parallel, serial)
+        self.assertEqual(len(mora.core.solution_store), store_size)
+        self.assertEqual(serial[x**2], symbols("n", integer=True, positive=True))
+
+    def test_independent_factors(self):
+        program = parse(INDEPENDENT_SOURCE)
+        x, y, z = symbols("x y z")
+        goals = [x * y, x ** 2 * y ** 2, x * z]
+        solutions = dict(core(program, goals))
+        # The products of independent factors are solved from their factors without a recurrence of their own
+        self.assertNotIn(x * y, mora.core.recurrence_store)
+        self.assertNotIn(x * z, mora.core.recurrence_store)
+
+        get_independent_factors = mora.core.get_independent_factors
+        mora.core.get_independent_factors = lambda program, monomial: [monomial.monic()]
+        try:
+            joint_solutions = dict(core(program, goals))
+        finally:
+            mora.core.get_independent_factors = get_independent_factors
+        # Without factoring, the products are solved from their own recurrences
+        self.assertIn(x * y, mora.core.recurrence_store)
+
+        n = symbols("n", integer=True, positive=True)
+        for monomial in goals:
+            self.assertEqual(simplify(solutions[monomial] - joint_solutions[monomial]), 0, monomial)
+            for i in range(6):
+                expected = joint_solutions[monomial].xreplace({n: i})
+                self.assertEqual(simplify(solutions[monomial].xreplace({n: i}) - expected), 0, monomial)
+
+
+if __name__ == '__main__':
+    unittest.main()
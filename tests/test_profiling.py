@@ -0,0 +1,37 @@
+import unittest
+
+from src import decide_termination
+from src.api import parse, silenced
+from src.phases import add_listener, remove_listener
+from src.profiling import PhaseProfiler
+from src.utils import amber_limit
+
+# The exponential moments of x need limits, which polynomial ones are decided without
+PROGRAM_SOURCE = """
+x = 1
+while x < 100:
+    x = 2*x @ 1/2; x
+"""
+
+
+class TestPhaseProfiler(unittest.TestCase):
+
+    def test_primitive_summary(self):
+        # Limits computed by earlier tests would otherwise be answered from the cache
+        amber_limit.cache_clear()
+        profiler = PhaseProfiler()
+        add_listener(profiler)
+        try:
+            with silenced():
+                decide_termination(parse(PROGRAM_SOURCE))
+        finally:
+            remove_listener(profiler)
+        summary = profiler.primitive_summary()
+        self.assertGreater(summary["limit"][0], 0)
+        self.assertGreater(summary["amber_limit"][0], 0)
+        self.assertGreater(summary["get_solution"][0], 0)
+        self.assertIn("moments", profiler.profiles)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import tempfile
+import unittest
+
+from src.api import parse, silenced
+from src.canonical import canonical_form
+from src.result_cache import ResultCache
+
+PROGRAM_SOURCE = """
+x = 0
+y = 5
+while x + y < 10:
+    x = x + 1 @ 3/4; x - 1
+    y = y + 2*c @ 1/3; y
+"""
+
+RENAMED_SOURCE = """
+# the same program with renamed variables and reordered updates
+b = 5
+a = 0
+while 10 > a + b:
+    b = b @ 2/3; b + 2*c
+    a = a - 1 @ 1/4; a + 1
+"""
+
+CHANGED_SOURCE = """
+x = 0
+y = 5
+while x + y < 10:
+    x = x + 1 @ 3/4; x - 1
+    y = y + 2*c @ 1/3; y + 1
+"""
+
+
+class TestResultCache(unittest.TestCase):
+
+    def test_canonical_hash(self):
+        program = canonical_form(parse(PROGRAM_SOURCE))
+        renamed = canonical_form(parse(RENAMED_SOURCE))
+        self.assertEqual(program.hash, renamed.hash)
+        self.assertEqual(program.renaming_to(renamed), {"x": "a", "y": "b"})
+        self.assertNotEqual(program.hash, canonical_form(parse(CHANGED_SOURCE)).hash)
+
+    def test_results_are_reused_and_renamed(self):
+        with tempfile.TemporaryDirectory() as directory, silenced():
+            result = ResultCache(directory).decide_termination(parse(PROGRAM_SOURCE))
+            cache = ResultCache(directory)
+            renamed = cache.decide_termination(parse(RENAMED_SOURCE))
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(renamed.PAST, result.PAST)
+        witness = renamed.witnesses[0]
+        self.assertEqual({str(s) for s in witness.data["Ranking SM"].free_symbols}, {"a", "b"})
+        self.assertIn("'-a - b + 10'", witness.explanation)
+
+
+if __name__ == '__main__':
+    unittest.main()
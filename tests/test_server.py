@@ -0,0 +1,83 @@
+import io
+import json
+import unittest
+
+from src.server import Server, ResultCache, serve_stdio, PARSE_ERROR, METHOD_NOT_FOUND, INVALID_PARAMS
+
+PAST_SOURCE = "x = 10\nwhile x > 0:\n    x = x - 1 @ 3/4; x + 1\n"
+
+
+def request(request_id, method, params=None):
+    message = {"jsonrpc": "2.0", "id": request_id, "method": method}
+    if params is not None:
+        message["params"] = params
+    return json.dumps(message)
+
+
+class TestServer(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = Server(workers=1)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+
+    def serve(self, *lines):
+        output = io.StringIO()
+        serve_stdio(self.server, io.StringIO("\n".join(lines) + "\n"), output)
+        responses = [json.loads(line) for line in output.getvalue().splitlines()]
+        return {r["id"]: r for r in responses}
+
+    def test_identical_sources_share_the_analysis_and_get_cached(self):
+        hits = self.server.cache_hits
+        responses = self.serve(
+            request(1, "decide_termination", {"source": PAST_SOURCE, "name": "first"}),
+            request(2, "decide_termination", {"source": PAST_SOURCE, "name": "second"}),
+        )
+        self.assertEqual(responses[1]["result"]["PAST"], "Yes")
+        self.assertEqual(responses[2]["result"]["name"], "second")
+        self.assertFalse(responses[2]["result"]["cached"])
+        self.assertEqual(self.server.cache_hits, hits + 1)
+
+        responses = self.serve(request(3, "decide_termination", {"source": PAST_SOURCE}))
+        self.assertTrue(responses[3]["result"]["cached"])
+        self.assertEqual(responses[3]["result"]["PAST"], "Yes")
+
+    def test_renamed_programs_reuse_the_moments_of_the_worker(self):
+        source = PAST_SOURCE.replace("x", "renamed")
+        responses = self.serve(request(1, "decide_termination", {"source": PAST_SOURCE}))
+        self.assertEqual(responses[1]["result"]["PAST"], "Yes")
+        responses = self.serve(request(2, "decide_termination", {"source": source}))
+        result = responses[2]["result"]
+        self.assertFalse(result["cached"])
+        self.assertEqual(result["witnesses"][0]["data"]["Ranking SM"], "renamed")
+        self.assertEqual(result["metrics"]["stores"]["solutions"]["misses"], 0)
+
+    def test_errors(self):
+        responses = self.serve(
+            "not json",
+            request(1, "unknown"),
+            request(2, "decide_termination", {"name": "without source"}),
+        )
+        self.assertEqual(responses[None]["error"]["code"], PARSE_ERROR)
+        self.assertEqual(responses[1]["error"]["code"], METHOD_NOT_FOUND)
+        self.assertEqual(responses[2]["error"]["code"], INVALID_PARAMS)
+
+
+class TestResultCache(unittest.TestCase):
+
+    def test_least_recently_used_results_get_evicted(self):
+        cache = ResultCache(max_size=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        self.assertEqual(cache.get("a"), 1)
+        cache.put("c", 3)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.get("c"), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
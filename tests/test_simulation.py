@@ -0,0 +1,40 @@
+import unittest
+
+from src.api import parse
+from src.simulation import simulate
+
+BIASED_WALK_SOURCE = """
+x = 10
+while x > 0:
+    x = x - 1 @ 3/4; x + 1
+"""
+
+SYMBOLIC_WALK_SOURCE = """
+x = 5
+while x > 0:
+    s = RV(uniform, 0 - c, 1)
+    x = x + s
+"""
+
+
+class TestSimulation(unittest.TestCase):
+
+    def test_biased_walk(self):
+        result = simulate(parse(BIASED_WALK_SOURCE), runs=20000, max_iterations=500, seed=0)
+        self.assertEqual(result.termination_rate, 1)
+        # The expected number of iterations is 10 / (3/4 - 1/4) = 20
+        self.assertAlmostEqual(result.mean_iterations, 20, delta=0.5)
+        self.assertEqual(result.moments(1)["x"], 0)
+
+    def test_seed_and_parameters(self):
+        program = parse(SYMBOLIC_WALK_SOURCE)
+        first = simulate(program, runs=1000, max_iterations=100, seed=1, parameters={"c": 2})
+        second = simulate(program, runs=1000, max_iterations=100, seed=1, parameters={"c": 2})
+        self.assertTrue((first.iterations == second.iterations).all())
+        self.assertLess(first.moments(1)["x"], 0)
+        with self.assertRaises(Exception):
+            simulate(program, runs=10, max_iterations=10)
+
+
+if __name__ == '__main__':
+    unittest.main()
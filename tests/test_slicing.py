@@ -0,0 +1,32 @@
+import unittest
+
+from src.api import parse, silenced
+from src.decission import decide_termination
+from src.slicing import slice_program
+
+PROGRAM_SOURCE = """
+x = 10
+y = 0
+c = 0
+d = 0
+while x + y > 0:
+    w = RV(uniform, -1, 2)
+    y = y + w
+    x = x - 1 @ 3/4; x + 1
+    c = c + 1
+    d = d + c**2 @ 1/2; d + x
+"""
+
+
+class TestSlicing(unittest.TestCase):
+
+    def test_slice_keeps_guard_ancestors(self):
+        program_slice = slice_program(parse(PROGRAM_SOURCE))
+        self.assertEqual([str(v) for v in program_slice.program.variables], ["w", "y", "x", "loop_guard"])
+        self.assertEqual(program_slice.statistics.removed, ["c", "d"])
+        self.assertIs(slice_program(program_slice.program).program, program_slice.program)
+
+    def test_slice_statistics_in_result(self):
+        with silenced():
+            result = decide_termination(parse(PROGRAM_SOURCE))
+        self.assertEqual(result.as_dict()["slice"], {"variables": 5, "kept": 3, "removed": ["c", "d"]})
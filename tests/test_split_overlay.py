@@ -0,0 +1,46 @@
+import unittest
+
+from mora.core import reset_mora
+from src import branch_store, bound_store
+from src.api import parse, silenced
+from src.expression import get_split_overlay
+from src.facts import Facts
+from src.repulsing_sm_rule import RepulsingSMRule
+from src.result import Result
+from src.supermartingale_rule import SupermartingaleRule
+
+PROGRAM_SOURCE = """
+x = 5
+while x > 0:
+    s = RV(uniform, -1, 1)
+    x = x + s
+"""
+
+
+class TestSplitOverlay(unittest.TestCase):
+
+    def test_repeated_rule_runs_keep_the_program(self):
+        program = parse(PROGRAM_SOURCE)
+        variables = list(program.variables)
+        reset_mora()
+        branch_store.set_program(program)
+        bound_store.set_program(program)
+        facts = Facts(program)
+
+        overlays = []
+        with silenced():
+            for _ in range(2):
+                for rule in [SupermartingaleRule(facts), RepulsingSMRule(facts)]:
+                    if rule.is_applicable():
+                        rule.run(Result())
+                    overlays.append(get_split_overlay(program))
+
+        self.assertEqual(program.variables, variables)
+        self.assertTrue(all(overlay is overlays[0] for overlay in overlays))
+        # The random variable got split once, into three variables kept by the overlay only
+        self.assertEqual(len(overlays[0].split_updates), 3)
+        self.assertEqual(len(overlays[0].variables), len(variables) + 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+
+from diofant import sympify
+
+import src.sweep
+from mora.budget import fallbacks, reset_counts
+
+from src.api import parse, silenced
+from src.decission import decide_termination
+from src.sweep import Sweep, get_assignments, instantiate
+from src.utils import Answer
+
+WALK_SOURCE = """
+x = 10
+while x > 0:
+    x = x - 1 @ p; x + 1
+"""
+
+
+class TestSweep(unittest.TestCase):
+
+    def test_assignments(self):
+        assignments = get_assignments({"p": ["1/4", "1/2"], "c": ["1"]})
+        self.assertEqual(assignments, [{"p": "1/4", "c": "1"}, {"p": "1/2", "c": "1"}])
+
+    def test_instances_agree_with_full_analysis(self):
+        program = parse(WALK_SOURCE)
+        sweep = Sweep(program)
+        for p in ["1/4", "1/2", "3/4", "0"]:
+            with silenced():
+                result = sweep.analyze({"p": p})
+                expected = decide_termination(instantiate(program, {"p": sympify(p)}))
+            self.assertEqual((result.PAST, result.AST), (expected.PAST, expected.AST))
+        self.assertEqual(result.PAST, Answer.FALSE)
+        # The value 0 is not positive, hence the symbolic analysis does not apply to it
+        self.assertEqual((sweep.instantiated, sweep.reanalyzed), (3, 1))
+
+    def test_fallbacks_are_counted_and_bugs_raised(self):
+        reset_counts()
+        with silenced():
+            Sweep(parse(WALK_SOURCE)).analyze({"p": "1/4"})
+        # The symbolic analysis cannot decide relations of p
+        self.assertGreater(fallbacks["sweep"], 0)
+
+        def broken(program, reset_stores=True):
+            raise KeyError("bug")
+
+        decide_termination = src.sweep.decide_termination
+        src.sweep.decide_termination = broken
+        try:
+            with silenced(), self.assertRaises(KeyError):
+                Sweep(parse(WALK_SOURCE)).analyze({"p": "1/4"})
+        finally:
+            src.sweep.decide_termination = decide_termination